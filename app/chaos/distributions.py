@@ -0,0 +1,63 @@
+import math
+import random
+
+
+# Parameters each distribution requires
+DISTRIBUTIONS = {
+    "constant": ("delay_ms",),
+    "uniform": ("min_ms", "max_ms"),
+    "lognormal": ("median_ms", "sigma"),
+    "pareto": ("scale_ms", "alpha"),
+}
+
+
+def validate(spec: dict):
+
+    kind = spec.get("type", "constant")
+
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown latency distribution: {kind}")
+
+    for param in DISTRIBUTIONS[kind]:
+
+        value = spec.get(param)
+
+        if not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"{kind}: {param} must be a number >= 0")
+
+    if kind == "uniform" and spec["min_ms"] > spec["max_ms"]:
+        raise ValueError("uniform: min_ms > max_ms")
+
+    if kind == "pareto" and spec["alpha"] <= 0:
+        raise ValueError("pareto: alpha must be > 0")
+
+
+def sample_ms(spec: dict, rng=random) -> float:
+    """
+    Draw one delay in milliseconds, capped at cap_ms if set
+    """
+
+    kind = spec.get("type", "constant")
+
+    if kind == "constant":
+        delay = spec["delay_ms"]
+
+    elif kind == "uniform":
+        delay = rng.uniform(spec["min_ms"], spec["max_ms"])
+
+    elif kind == "lognormal":
+        delay = rng.lognormvariate(
+            math.log(max(spec["median_ms"], 1e-9)),
+            spec["sigma"]
+        )
+
+    else:
+        # Heavy tail: scale_ms is the minimum delay
+        delay = spec["scale_ms"] * rng.paretovariate(spec["alpha"])
+
+    cap = spec.get("cap_ms")
+
+    if cap is not None:
+        delay = min(delay, cap)
+
+    return float(delay)
@@ -1,9 +1,18 @@
+import asyncio
+import itertools
 import random
 import time
+import uuid
 import yaml
 import threading
 
-from app.observability.metrics import CHAOS_EVENTS
+from app.config import settings
+from app.chaos import distributions
+from app.chaos.schedule import FaultRecorder, Timeline
+from app.models.ollama_client import connection_pool
+
+from app.observability.metrics import CHAOS_EVENTS, CHAOS_INJECTED_DELAY
+from app.observability import context as request_context
 
 
 class FaultInjector:
@@ -11,33 +20,133 @@ class FaultInjector:
     Chaos Engineering Fault Injection Engine
     """
 
-    def __init__(self, config_path: str):
+    # Latency fault per injection point
+    LATENCY_FAULTS = {
+        "retrieval": "inject_latency",
+        "llm": "llm_latency",
+        "evaluation": "evaluation_latency",
+    }
+
+    # Host resource faults -> default injection stage
+    RESOURCE_FAULTS = {
+        "cpu_burn": "retrieval",
+        "memory_pressure": "retrieval",
+        "pool_exhaustion": "llm",
+    }
+
+    def __init__(self, config_path: str, metrics=True):
 
         self.config_path = config_path
 
+        # False for replay sandboxes: keep live dashboards clean
+        self.metrics = metrics
+
         self._lock = threading.Lock()
 
-        self._load()
+        self.config = {}
+        self.enabled = False
+        self.faults = {}
+        self.timeline = Timeline()
+
+        # Seeded runs: per-request RNG = Random(f"{seed}:{request_id}")
+        self.seed = None
+
+        self.recorder = None
+
+        # request_id -> recorded events (exact replay)
+        self.replay = None
+
+        self.run_started = time.time()
+
+        self._sequence = itertools.count()
+
+        # Buffers held by memory_pressure until their timer fires
+        self._pressure = {}
+
+        self.apply_config(self._read())
+
+        self.start_run(
+            seed=self.config.get("seed"),
+            record=self.config.get("record", False)
+        )
 
     # ----------------------------------
     # Config Handling
     # ----------------------------------
 
-    def _load(self):
+    def _read(self) -> dict:
 
         try:
             with open(self.config_path, "r") as f:
-                self.config = yaml.safe_load(f) or {}
+                return yaml.safe_load(f) or {}
 
         except Exception as e:
 
             print(f"[CHAOS] Config load failed: {e}")
 
-            self.config = {}
+            return {}
+
+    @staticmethod
+    def validate_config(config: dict):
+
+        faults = config.get("faults", {})
+
+        if not isinstance(faults, dict):
+            raise ValueError("faults must be a mapping")
+
+        for name, fault in faults.items():
+
+            if not isinstance(fault, dict):
+                raise ValueError(f"{name}: fault must be a mapping")
+
+            probability = fault.get("probability", 0.0)
 
-        self.enabled = self.config.get("enabled", False)
+            if not 0.0 <= probability <= 1.0:
+                raise ValueError(f"{name}: probability must be in [0, 1]")
 
-        self.faults = self.config.get("faults", {})
+            for param in (
+                "delay_ms", "duration_ms", "size_mb",
+                "hold_ms", "connections"
+            ):
+
+                if fault.get(param, 0) < 0:
+                    raise ValueError(f"{name}: {param} must be >= 0")
+
+            if fault.get("tokens_per_second", 1) <= 0:
+                raise ValueError(f"{name}: tokens_per_second must be > 0")
+
+            if fault.get("stage", "retrieval") not in ("retrieval", "llm"):
+                raise ValueError(f"{name}: stage must be retrieval or llm")
+
+            if "distribution" in fault:
+
+                try:
+                    distributions.validate(fault["distribution"])
+                except (TypeError, AttributeError) as e:
+                    raise ValueError(f"{name}: invalid distribution ({e})")
+                except ValueError as e:
+                    raise ValueError(f"{name}: {e}")
+
+    def apply_config(self, config: dict):
+        """
+        Validate and swap in a parsed config; the fault table is
+        replaced in one assignment so hooks never see a mix
+        """
+
+        self.validate_config(config)
+
+        timeline = Timeline(config.get("timeline"))
+
+        # Keep runtime (policy / replay) toggles unless the
+        # file itself changed the switch
+        if config.get("enabled", False) != self.config.get("enabled", False):
+            self.enabled = config.get("enabled", False)
+
+        self.faults = dict(config.get("faults", {}))
+
+        self.timeline = timeline
+
+        self.config = config
 
     def reload(self):
         """
@@ -45,50 +154,315 @@ class FaultInjector:
         """
 
         with self._lock:
-            self._load()
+            self.apply_config(self._read())
+
+    # ----------------------------------
+    # Runs / Reproducibility
+    # ----------------------------------
+
+    def start_run(self, seed=None, record=False, replay=None):
+        """
+        Start a chaos run: resets the timeline clock and request
+        sequence, optionally seeding, recording or replaying a
+        recorded fault sequence ({request_id: [events]})
+        """
+
+        self.seed = seed
+
+        self.recorder = (
+            FaultRecorder(self.config.get("record_max_requests", 100000))
+            if record else None
+        )
+
+        self.replay = replay
+
+        self._sequence = itertools.count()
+
+        self.run_started = time.time()
+
+        return self.run_info()
+
+    def run_info(self) -> dict:
+
+        return {
+            "seed": self.seed,
+            "recording": self.recorder is not None,
+            "replaying": self.replay is not None,
+            "started_at": self.run_started
+        }
+
+    def recording(self) -> dict:
+
+        return self.recorder.export() if self.recorder else {}
+
+    def begin_request(self, request_id=None) -> str:
+        """
+        Per-request chaos state (RNG, recorded / replayed faults)
+        """
+
+        if request_id is None:
+
+            # Sequential IDs keep seeded runs reproducible and
+            # let a replay match recorded requests by arrival order
+            reproducible = (
+                self.seed is not None
+                or self.recorder is not None
+                or self.replay is not None
+            )
+
+            request_id = (
+                f"req-{next(self._sequence)}"
+                if reproducible else uuid.uuid4().hex
+            )
+
+        state = {
+            "request_id": request_id,
+            "rng": (
+                random.Random(f"{self.seed}:{request_id}")
+                if self.seed is not None else None
+            ),
+            "events": (
+                self.recorder.track(request_id)
+                if self.recorder is not None else None
+            ),
+            "replay": (
+                self.replay.get(request_id, [])
+                if self.replay is not None else None
+            )
+        }
+
+        request_context.set_label("chaos", state)
+
+        return request_id
+
+    @staticmethod
+    def _state(state=None):
+
+        return state or request_context.get("chaos")
+
+    def _rng(self, state=None):
+
+        state = self._state(state)
+
+        if state is not None and state["rng"] is not None:
+            return state["rng"]
+
+        return random
 
     # ----------------------------------
     # Internal Helpers
     # ----------------------------------
 
-    def _should_inject(self, name: str) -> bool:
+    def _should_inject(self, name: str, state=None) -> bool:
+
+        if not settings.ENABLE_CHAOS:
+            return False
+
+        state = self._state(state)
+
+        # Exact replay of a recorded run
+        if state is not None and state["replay"] is not None:
+            return any(e["fault"] == name for e in state["replay"])
 
         if not self.enabled:
             return False
 
         fault = self.faults.get(name, {})
 
-        if not fault.get("enabled", False):
-            return False
+        prob = self.timeline.probability(
+            name,
+            time.time() - self.run_started
+        )
+
+        if prob is None:
 
-        prob = fault.get("probability", 0.0)
+            if not fault.get("enabled", False):
+                return False
 
-        return random.random() < prob
+            prob = fault.get("probability", 0.0)
 
-    def _record(self, name: str):
+        return self._rng(state).random() < prob
+
+    def _record(self, name: str, state=None, **detail):
+
+        request_context.add_fault(name)
+
+        state = self._state(state)
+
+        if state is not None and state["events"] is not None:
+            state["events"].append({"fault": name, **detail})
+
+        if not self.metrics:
+            return
 
         try:
             CHAOS_EVENTS.labels(name).inc()
         except Exception:
             pass
 
+    def _replayed(self, name, state=None):
+
+        state = self._state(state)
+
+        for event in state["replay"]:
+
+            if event["fault"] == name:
+                return event
+
+        return {}
+
     # ----------------------------------
     # Hooks
     # ----------------------------------
 
-    def before_retrieval(self, query: str) -> str:
+    def stage_delay(self, stage: str, state=None) -> float:
+        """
+        Seconds of injected latency for this stage (0 if none)
+        """
+
+        name = self.LATENCY_FAULTS[stage]
+
+        state = self._state(state)
+
+        if not self._should_inject(name, state):
+            return 0.0
+
+        if state is not None and state["replay"] is not None:
+
+            delay_ms = self._replayed(name, state).get("delay_ms", 0.0)
+
+        else:
+
+            fault = self.faults.get(name, {})
+
+            # Legacy shorthand: fixed delay_ms
+            spec = fault.get("distribution") or {
+                "type": "constant",
+                "delay_ms": fault.get("delay_ms", 1000)
+            }
+
+            delay_ms = distributions.sample_ms(spec, self._rng(state))
+
+        delay = delay_ms / 1000
+
+        self._record(name, state, delay_ms=delay_ms)
+
+        if self.metrics:
+            CHAOS_INJECTED_DELAY.labels(stage).observe(delay)
+
+        return delay
+
+    async def delay(self, stage: str):
+        """
+        Non-blocking latency injection (yields the event loop,
+        holds no worker thread)
+        """
+
+        seconds = self.stage_delay(stage)
+
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def sleep(self, stage: str, state=None):
+        """
+        Blocking variant for background worker threads
+        (state: the originating request's chaos state)
+        """
+
+        seconds = self.stage_delay(stage, state)
+
+        if seconds > 0:
+            time.sleep(seconds)
 
-        # Latency
-        if self._should_inject("inject_latency"):
+    # ----------------------------------
+    # Resource Faults (run on the worker thread they stress)
+    # ----------------------------------
+
+    def resource_faults(self, stage: str, state=None):
+
+        state = self._state(state)
+
+        for name, default_stage in self.RESOURCE_FAULTS.items():
+
+            fault = self.faults.get(name, {})
+
+            if fault.get("stage", default_stage) != stage:
+                continue
+
+            if not self._should_inject(name, state):
+                continue
+
+            self._record(name, state)
 
-            delay = self.faults["inject_latency"].get(
-                "delay_ms", 1000
+            getattr(self, f"_{name}")(fault)
+
+        if stage == "retrieval" and self._should_inject("slow_encoder", state):
+
+            fault = self.faults.get("slow_encoder", {})
+
+            spec = fault.get("distribution") or {
+                "type": "constant",
+                "delay_ms": fault.get("delay_ms", 500)
+            }
+
+            delay_ms = distributions.sample_ms(spec, self._rng(state))
+
+            self._record("slow_encoder", state, delay_ms=delay_ms)
+
+            # Encoding is CPU-bound work on this thread: block it
+            time.sleep(delay_ms / 1000)
+
+        if stage == "llm" and self._should_inject("slow_tokens", state):
+
+            rate = self.faults.get("slow_tokens", {}).get(
+                "tokens_per_second", 5
             )
 
-            self._record("inject_latency")
+            self._record("slow_tokens", state)
+
+            # Picked up by OllamaClient (streams + drips chunks)
+            request_context.set_label("token_delay", 1.0 / max(rate, 0.01))
 
-            time.sleep(delay / 1000)
+    @staticmethod
+    def _cpu_burn(fault):
 
+        deadline = time.perf_counter() + fault.get("duration_ms", 200) / 1000
+
+        # Pure-Python loop: holds the GIL like real CPU-bound work
+        n = 0
+
+        while time.perf_counter() < deadline:
+
+            for _ in range(1000):
+                n += 1
+
+    def _memory_pressure(self, fault):
+
+        # Written (not calloc'd) so the pages are actually committed
+        block = b"\x01" * (int(fault.get("size_mb", 128)) * 1024 * 1024)
+
+        self._pressure[id(block)] = block
+
+        timer = threading.Timer(
+            fault.get("hold_ms", 5000) / 1000,
+            self._pressure.pop,
+            args=(id(block), None)
+        )
+
+        timer.daemon = True
+        timer.start()
+
+    @staticmethod
+    def _pool_exhaustion(fault):
+
+        connection_pool.exhaust(
+            fault.get("connections", connection_pool.size),
+            fault.get("hold_ms", 10000) / 1000
+        )
+
+    def before_retrieval(self, query: str) -> str:
+
+        # Latency is injected separately via delay("retrieval")
         return query
 
     def after_retrieval(self, chunks):
@@ -103,11 +477,24 @@ class FaultInjector:
         # Corrupt context
         if self._should_inject("corrupt_context") and chunks:
 
-            self._record("corrupt_context")
+            state = self._state()
+
+            order = None
+
+            if state is not None and state["replay"] is not None:
+                order = self._replayed("corrupt_context", state).get("order")
+
+            # Recorded permutation, unless retrieval returned
+            # a different number of chunks this time
+            if order is None or sorted(order) != list(range(len(chunks))):
+
+                order = list(range(len(chunks)))
+
+                self._rng(state).shuffle(order)
 
-            corrupted = list(chunks)
+            self._record("corrupt_context", state, order=order)
 
-            random.shuffle(corrupted)
+            corrupted = [chunks[i] for i in order]
 
             corrupted[0] = "### CORRUPTED CONTEXT ###"
 
@@ -120,7 +507,7 @@ class FaultInjector:
         # Overflow
         if self._should_inject("overflow_prompt"):
 
-            max_tokens = self.faults["overflow_prompt"].get(
+            max_tokens = self.faults.get("overflow_prompt", {}).get(
                 "max_tokens", 200
             )
 
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+from app.governance.error_budget import parse_duration
+
+
+class Timeline:
+    """
+    Scripted fault windows, e.g.
+    {"fault": "kill_model", "probability": 0.3, "start": "60s", "end": "120s"}
+    (offsets are relative to the start of the chaos run)
+    """
+
+    def __init__(self, entries=None):
+
+        self.entries = []
+
+        for entry in entries or []:
+
+            if not isinstance(entry, dict) or "fault" not in entry:
+                raise ValueError(f"Invalid timeline entry: {entry!r}")
+
+            probability = entry.get("probability", 1.0)
+
+            if not 0.0 <= probability <= 1.0:
+                raise ValueError(
+                    f"timeline {entry['fault']}: probability must be in [0, 1]"
+                )
+
+            start = parse_duration(entry.get("start", 0))
+
+            end = (
+                parse_duration(entry["end"])
+                if entry.get("end") is not None else float("inf")
+            )
+
+            if end <= start:
+                raise ValueError(f"timeline {entry['fault']}: end <= start")
+
+            self.entries.append((entry["fault"], probability, start, end))
+
+    def probability(self, fault, elapsed):
+        """
+        Scheduled probability at this offset, None if unscheduled
+        """
+
+        for name, probability, start, end in self.entries:
+
+            if name == fault and start <= elapsed < end:
+                return probability
+
+        return None
+
+
+class FaultRecorder:
+    """
+    Bounded per-request fault log: request_id -> injected faults
+    (in injection order), replayable as an exact schedule
+    """
+
+    def __init__(self, max_requests=100000):
+
+        self.max_requests = max_requests
+
+        self.requests = OrderedDict()
+
+        self._lock = threading.Lock()
+
+    def track(self, request_id) -> list:
+        """
+        Event list for this request (filled in as faults fire)
+        """
+
+        events = []
+
+        with self._lock:
+
+            self.requests[request_id] = events
+
+            while len(self.requests) > self.max_requests:
+                self.requests.popitem(last=False)
+
+        return events
+
+    def export(self) -> dict:
+
+        with self._lock:
+
+            return {
+                request_id: list(events)
+                for request_id, events in self.requests.items()
+            }
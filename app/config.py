@@ -29,6 +29,16 @@ class Settings:
         "http://localhost:11434"
     )
 
+    # Process-wide HTTP connection pool to Ollama
+    OLLAMA_MAX_CONNECTIONS = int(
+        os.getenv("OLLAMA_MAX_CONNECTIONS", "16")
+    )
+
+    # Seconds to wait for a free connection
+    OLLAMA_POOL_TIMEOUT = float(
+        os.getenv("OLLAMA_POOL_TIMEOUT", "30")
+    )
+
     PRIMARY_MODEL = os.getenv(
         "PRIMARY_MODEL",
         "llama3"
@@ -61,6 +71,12 @@ class Settings:
         "all-MiniLM-L6-v2"
     )
 
+    # sentence-transformers | stub (hashing, offline benchmarks)
+    EMBEDDING_BACKEND = os.getenv(
+        "EMBEDDING_BACKEND",
+        "sentence-transformers"
+    )
+
     CHROMA_PATH = os.getenv(
         "CHROMA_PATH",
         "./chroma_db"
@@ -70,10 +86,26 @@ class Settings:
         os.getenv("TOP_K", "3")
     )
 
+    # Prompt context budget (characters)
+    CONTEXT_CHARS = int(
+        os.getenv("CONTEXT_CHARS", "6000")
+    )
+
+    # Policy-controlled: over-fetch and rerank candidates
+    RERANK_RETRIEVAL = (
+        os.getenv("RERANK_RETRIEVAL", "false").lower() == "true"
+    )
+
+    RERANK_CANDIDATES = int(
+        os.getenv("RERANK_CANDIDATES", "3")
+    )
+
     # --------------------------------
     # Chaos Engineering
     # --------------------------------
 
+    # Process-wide kill switch: false blocks every fault,
+    # whatever chaos_config.yaml or the policies enable
     ENABLE_CHAOS = (
         os.getenv("ENABLE_CHAOS", "true").lower() == "true"
     )
@@ -107,6 +139,184 @@ class Settings:
         os.getenv("CACHE_MAX_SIZE", "200")
     )
 
+    # --------------------------------
+    # Quality Evaluation
+    # --------------------------------
+
+    EVAL_WORKERS = int(
+        os.getenv("EVAL_WORKERS", "2")
+    )
+
+    EVAL_QUEUE_SIZE = int(
+        os.getenv("EVAL_QUEUE_SIZE", "256")
+    )
+
+    # "drop" rejects new work once the queue is full,
+    # "sample" starts shedding early above the high watermark
+    EVAL_OVERFLOW_POLICY = os.getenv(
+        "EVAL_OVERFLOW_POLICY",
+        "sample"
+    )
+
+    EVAL_HIGH_WATERMARK = float(
+        os.getenv("EVAL_HIGH_WATERMARK", "0.75")
+    )
+
+    EVAL_OVERLOAD_SAMPLE_RATE = float(
+        os.getenv("EVAL_OVERLOAD_SAMPLE_RATE", "0.25")
+    )
+
+    # "always" judges every answer, "tiered" only judges
+    # groundedness scores inside the uncertainty band
+    JUDGE_MODE = os.getenv(
+        "JUDGE_MODE",
+        "tiered"
+    )
+
+    JUDGE_BAND_LOW = float(
+        os.getenv("JUDGE_BAND_LOW", "0.3")
+    )
+
+    JUDGE_BAND_HIGH = float(
+        os.getenv("JUDGE_BAND_HIGH", "0.55")
+    )
+
+    # Calibration sample judged even when groundedness is confident
+    JUDGE_SAMPLE_RATE = float(
+        os.getenv("JUDGE_SAMPLE_RATE", "0.05")
+    )
+
+    # Offline evaluate_many: items packed per judge request
+    JUDGE_BATCH_SIZE = int(
+        os.getenv("JUDGE_BATCH_SIZE", "8")
+    )
+
+    JUDGE_MAX_CONCURRENCY = int(
+        os.getenv("JUDGE_MAX_CONCURRENCY", "4")
+    )
+
+    JUDGE_CACHE_ENABLED = (
+        os.getenv("JUDGE_CACHE_ENABLED", "true").lower() == "true"
+    )
+
+    JUDGE_CACHE_PATH = os.getenv(
+        "JUDGE_CACHE_PATH",
+        "data/judge_cache.db"
+    )
+
+    JUDGE_CACHE_TTL = int(
+        os.getenv("JUDGE_CACHE_TTL", "86400")
+    )
+
+    JUDGE_CACHE_MAX_SIZE = int(
+        os.getenv("JUDGE_CACHE_MAX_SIZE", "50000")
+    )
+
+    # --------------------------------
+    # Governance Loop
+    # --------------------------------
+
+    GOVERNANCE_INTERVAL = float(
+        os.getenv("GOVERNANCE_INTERVAL", "5")
+    )
+
+    # Floor between early (change-triggered) ticks
+    GOVERNANCE_MIN_INTERVAL = float(
+        os.getenv("GOVERNANCE_MIN_INTERVAL", "1")
+    )
+
+    GOVERNANCE_WAKE_AFTER = int(
+        os.getenv("GOVERNANCE_WAKE_AFTER", "100")
+    )
+
+    # Overrides persistence.path in slo_config.yaml when set
+    SLO_DB_PATH = os.getenv("SLO_DB_PATH", "")
+
+    # --------------------------------
+    # Config Hot Reload
+    # --------------------------------
+
+    CONFIG_WATCH_ENABLED = (
+        os.getenv("CONFIG_WATCH_ENABLED", "true").lower() == "true"
+    )
+
+    CONFIG_RELOAD_INTERVAL = float(
+        os.getenv("CONFIG_RELOAD_INTERVAL", "2")
+    )
+
+    # --------------------------------
+    # Incidents
+    # --------------------------------
+
+    INCIDENT_DB_PATH = os.getenv(
+        "INCIDENT_DB_PATH",
+        "data/incidents.db"
+    )
+
+    # A closed incident re-firing within this window is reopened
+    INCIDENT_REOPEN_WINDOW = float(
+        os.getenv("INCIDENT_REOPEN_WINDOW", "300")
+    )
+
+    # Closed incidents lose their SLO snapshots after this...
+    INCIDENT_COMPACT_AFTER = float(
+        os.getenv("INCIDENT_COMPACT_AFTER", "86400")
+    )
+
+    # ...and are deleted after this
+    INCIDENT_RETENTION_DAYS = int(
+        os.getenv("INCIDENT_RETENTION_DAYS", "30")
+    )
+
+    # Floor between postmortem LLM calls
+    POSTMORTEM_MIN_INTERVAL = float(
+        os.getenv("POSTMORTEM_MIN_INTERVAL", "60")
+    )
+
+    POSTMORTEM_QUEUE_SIZE = int(
+        os.getenv("POSTMORTEM_QUEUE_SIZE", "32")
+    )
+
+    POSTMORTEM_MAX_TOKENS = int(
+        os.getenv("POSTMORTEM_MAX_TOKENS", "512")
+    )
+
+    # --------------------------------
+    # Replay
+    # --------------------------------
+
+    SHADOW_LOG_PATH = os.getenv(
+        "SHADOW_LOG_PATH",
+        "data/shadow_logs.jsonl"
+    )
+
+    # Concurrent replay queries (each holds an Ollama connection
+    # shared with live traffic while it generates)
+    REPLAY_WORKERS = int(
+        os.getenv("REPLAY_WORKERS", "4")
+    )
+
+    # Upper bound for a per-request workers override
+    REPLAY_MAX_WORKERS = int(
+        os.getenv("REPLAY_MAX_WORKERS", "32")
+    )
+
+    # Max replayed queries per second (0 = unlimited)
+    REPLAY_RATE = float(
+        os.getenv("REPLAY_RATE", "0")
+    )
+
+    # Background replay jobs: checkpoints + NDJSON results
+    REPLAY_JOBS_DIR = os.getenv(
+        "REPLAY_JOBS_DIR",
+        "data/replay_jobs"
+    )
+
+    # Results written between checkpoints
+    REPLAY_CHECKPOINT_EVERY = int(
+        os.getenv("REPLAY_CHECKPOINT_EVERY", "50")
+    )
+
     # --------------------------------
     # Degradation / Safe Mode
     # --------------------------------
@@ -123,6 +333,29 @@ class Settings:
         os.getenv("SAFE_MODE_TEMPERATURE", "0.1")
     )
 
+    # Empty = keep the primary model
+    SAFE_MODE_MODEL = os.getenv(
+        "SAFE_MODE_MODEL",
+        ""
+    )
+
+    SAFE_MODE_TOP_K = int(
+        os.getenv("SAFE_MODE_TOP_K", "2")
+    )
+
+    SAFE_MODE_CONTEXT_CHARS = int(
+        os.getenv("SAFE_MODE_CONTEXT_CHARS", "1500")
+    )
+
+    SAFE_MODE_JUDGE = (
+        os.getenv("SAFE_MODE_JUDGE", "false").lower() == "true"
+    )
+
+    # Policy-controlled: cap temperature at SAFE_MODE_TEMPERATURE
+    REDUCED_TEMPERATURE = (
+        os.getenv("REDUCED_TEMPERATURE", "false").lower() == "true"
+    )
+
     # --------------------------------
     # Observability
     # --------------------------------
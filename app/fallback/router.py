@@ -1,16 +1,20 @@
 import time
+import random
 import hashlib
 
 from app.config import settings
 from app.models.ollama_client import OllamaClient
+from app.models import profiles
 
 from app.fallback.cache import ResponseCache
 from app.fallback.circuit_breaker import CircuitBreaker
 
 from app.observability.metrics import (
     FALLBACK_COUNT,
+    GENERATION_LATENCY,
     LLM_LATENCY
 )
+from app.observability import context as request_context
 
 
 class FallbackRouter:
@@ -22,10 +26,13 @@ class FallbackRouter:
     - Policy control hooks
     """
 
-    def __init__(self):
+    def __init__(self, metrics=True):
 
         self.client = OllamaClient()
 
+        # False for replay sandboxes: keep live dashboards clean
+        self.metrics = metrics
+
         # Models
         self.primary = settings.PRIMARY_MODEL
         self.secondary = settings.SECONDARY_MODEL
@@ -47,26 +54,58 @@ class FallbackRouter:
         self.force_cache_only = False
         self.primary_disabled = False
 
+        # Recovery probes: share of traffic given back to the
+        # primary model / to uncached generation (1.0 = all)
+        self.primary_traffic = 1.0
+        self.uncached_traffic = 1.0
+
     # --------------------------------
     # Policy Control Hooks
     # --------------------------------
 
     def disable_primary(self):
         self.primary_disabled = True
+        self.primary_traffic = 1.0
         print("[ROUTER] Primary model disabled")
 
     def enable_primary(self):
         self.primary_disabled = False
+        self.primary_traffic = 1.0
         print("[ROUTER] Primary model enabled")
 
     def prefer_cache(self):
         self.force_cache_only = True
+        self.uncached_traffic = 1.0
         print("[ROUTER] Cache-only mode enabled")
 
     def normal_mode(self):
         self.force_cache_only = False
+        self.uncached_traffic = 1.0
         print("[ROUTER] Normal routing restored")
 
+    def probe_primary(self, fraction: float):
+        self.primary_disabled = False
+        self.primary_traffic = fraction
+        print(f"[ROUTER] Primary model probe at {fraction:.0%}")
+
+    def probe_uncached(self, fraction: float):
+        self.force_cache_only = False
+        self.uncached_traffic = fraction
+        print(f"[ROUTER] Uncached traffic probe at {fraction:.0%}")
+
+    def fast_fallback(self):
+        self.max_retries = 0
+        print("[ROUTER] Fast fallback enabled")
+
+    def normal_fallback(self):
+        self.max_retries = settings.MAX_RETRIES
+        print("[ROUTER] Normal fallback restored")
+
+    @staticmethod
+    def _sampled(fraction: float) -> bool:
+
+        return fraction >= 1.0 or random.random() < fraction
+
     # --------------------------------
 
     def _hash_prompt(self, prompt: str) -> str:
@@ -77,18 +116,23 @@ class FallbackRouter:
 
     # --------------------------------
 
-    def _call_model(self, model: str, prompt: str) -> str:
+    def _call_model(self, model: str, prompt: str, profile) -> str:
 
         start = time.time()
 
         result = self.client.generate(
             model,
-            prompt
+            prompt,
+            options=profile.options()
         )
 
         latency = time.time() - start
 
-        LLM_LATENCY.observe(latency)
+        if self.metrics:
+
+            LLM_LATENCY.observe(latency)
+
+            GENERATION_LATENCY.labels(profile.name).observe(latency)
 
         return result
 
@@ -98,7 +142,8 @@ class FallbackRouter:
         self,
         model: str,
         breaker: CircuitBreaker,
-        prompt: str
+        prompt: str,
+        profile
     ):
 
         if not breaker.can_execute():
@@ -110,7 +155,8 @@ class FallbackRouter:
 
             result = self._call_model(
                 model,
-                prompt
+                prompt,
+                profile
             )
 
             breaker.record_success()
@@ -125,7 +171,34 @@ class FallbackRouter:
 
     # --------------------------------
 
-    def generate(self, prompt: str) -> str:
+    def _fallback(self):
+
+        if self.metrics:
+            FALLBACK_COUNT.inc()
+
+    def _served(
+        self,
+        route: str,
+        cache_hit=False,
+        fallback=False,
+        model=None
+    ):
+
+        request_context.set_label("model", route)
+        request_context.set_label("model_name", model or route)
+        request_context.set_label("cache_hit", cache_hit)
+
+        if fallback:
+            request_context.set_label("fallback", True)
+
+    # --------------------------------
+
+    def generate(self, prompt: str, profile=None) -> str:
+
+        profile = profile or profiles.current()
+
+        # Safe mode may swap in a smaller primary model
+        primary = profile.model or self.primary
 
         key = self._hash_prompt(prompt)
 
@@ -133,11 +206,15 @@ class FallbackRouter:
         # Cache-first mode
         # ----------------------------
 
-        if self.force_cache_only:
+        if (
+            self.force_cache_only
+            or not self._sampled(self.uncached_traffic)
+        ):
 
             cached = self.cache.get(key)
 
             if cached:
+                self._served("cache", cache_hit=True, fallback=True)
                 return cached
 
             raise RuntimeError("Cache-only mode: no entry")
@@ -149,6 +226,7 @@ class FallbackRouter:
         cached = self.cache.get(key)
 
         if cached:
+            self._served("cache", cache_hit=True)
             return cached
 
         last_error = None
@@ -157,27 +235,33 @@ class FallbackRouter:
         # Primary model
         # ----------------------------
 
-        if not self.primary_disabled:
+        if (
+            not self.primary_disabled
+            and self._sampled(self.primary_traffic)
+        ):
 
             for _ in range(self.max_retries + 1):
 
                 try:
 
                     result = self._try_model(
-                        self.primary,
+                        primary,
                         self.primary_cb,
-                        prompt
+                        prompt,
+                        profile
                     )
 
                     self.cache.set(key, result)
 
+                    self._served("primary", model=primary)
+
                     return result
 
                 except Exception as e:
 
                     last_error = e
 
-                    FALLBACK_COUNT.inc()
+                    self._fallback()
 
         # ----------------------------
         # Secondary model
@@ -188,18 +272,21 @@ class FallbackRouter:
             result = self._try_model(
                 self.secondary,
                 self.secondary_cb,
-                prompt
+                prompt,
+                profile
             )
 
             self.cache.set(key, result)
 
+            self._served("secondary", fallback=True, model=self.secondary)
+
             return result
 
         except Exception as e:
 
             last_error = e
 
-            FALLBACK_COUNT.inc()
+            self._fallback()
 
         # ----------------------------
         # Final cache fallback
@@ -208,8 +295,11 @@ class FallbackRouter:
         cached = self.cache.get(key)
 
         if cached:
+            self._served("cache", cache_hit=True, fallback=True)
             return cached
 
+        request_context.set_label("fallback", True)
+
         raise RuntimeError(
             f"All models failed: {last_error}"
         )
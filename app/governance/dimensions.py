@@ -0,0 +1,214 @@
+import threading
+
+from app.governance.store import BucketStore
+from app.governance.sketch import DDSketch, SketchStore
+
+
+class LabeledStore:
+    """
+    Per-label-set bucketed series with an inverted label index
+    """
+
+    OVERFLOW = (("overflow", "true"),)
+
+    # Multi-valued label ("kill_model+corrupt_context"). Every value
+    # gets its own series next to a base series without the label,
+    # so fault combinations don't multiply the series count and each
+    # request is counted once per query.
+    SPLIT = "fault"
+
+    def __init__(
+        self,
+        retention_seconds,
+        bucket_seconds=300,
+        sketch_bucket_seconds=3600,
+        relative_accuracy=0.01,
+        max_series=256
+    ):
+
+        self.retention_seconds = retention_seconds
+        self.bucket_seconds = bucket_seconds
+        self.sketch_bucket_seconds = sketch_bucket_seconds
+        self.relative_accuracy = relative_accuracy
+        self.max_series = max_series
+
+        # label set -> (counters, latency sketches)
+        self.series = {}
+
+        # (label, value) -> label sets carrying it
+        self.index = {}
+
+        # Label sets with / without the split label
+        self.split_keys = set()
+        self.base_keys = set()
+
+        self._lock = threading.Lock()
+
+    # --------------------------------
+    # Series
+    # --------------------------------
+
+    @staticmethod
+    def key(labels: dict) -> tuple:
+
+        return tuple(sorted(
+            (k, str(v)) for k, v in labels.items()
+        ))
+
+    def _overflow(self, split: bool) -> tuple:
+
+        if split:
+            return ((self.SPLIT, "*"),) + self.OVERFLOW
+
+        return self.OVERFLOW
+
+    def _series(self, labels: dict):
+
+        key = self.key(labels)
+
+        series = self.series.get(key)
+
+        if series is not None:
+            return series
+
+        with self._lock:
+
+            if key in self.series:
+                return self.series[key]
+
+            # Bound memory against label cardinality blowups
+            if len(self.series) >= self.max_series:
+                key = self._overflow(self.SPLIT in labels)
+
+                if key in self.series:
+                    return self.series[key]
+
+            series = (
+                BucketStore(self.retention_seconds, self.bucket_seconds),
+                SketchStore(
+                    self.retention_seconds,
+                    self.sketch_bucket_seconds,
+                    self.relative_accuracy
+                )
+            )
+
+            for name, value in key:
+                self.index.setdefault((name, value), set()).add(key)
+
+            if any(name == self.SPLIT for name, _ in key):
+                self.split_keys.add(key)
+            else:
+                self.base_keys.add(key)
+
+            self.series[key] = series
+
+        return series
+
+    def _targets(self, labels: dict) -> list:
+        """
+        Base label set plus one per split value
+        """
+
+        if self.SPLIT not in labels:
+            return [labels]
+
+        base = {k: v for k, v in labels.items() if k != self.SPLIT}
+
+        values = str(labels[self.SPLIT]).split("+")
+
+        return [base] + [{**base, self.SPLIT: value} for value in values]
+
+    def _keys(self, filters: dict) -> set:
+
+        keys = set(
+            self.split_keys if self.SPLIT in filters else self.base_keys
+        )
+
+        for name, value in filters.items():
+            keys &= self.index.get((name, str(value)), set())
+
+        return keys
+
+    def _match(self, filters: dict) -> list:
+
+        with self._lock:
+            return [self.series[k] for k in self._keys(filters)]
+
+    # --------------------------------
+    # Recording
+    # --------------------------------
+
+    def add_many(self, labels: dict, amounts: dict, ts=None):
+
+        for target in self._targets(labels):
+            self._series(target)[0].add_many(amounts, ts)
+
+    def add_latency(self, labels: dict, value, ts=None):
+
+        for target in self._targets(labels):
+            self._series(target)[1].add(value, ts)
+
+    # --------------------------------
+    # Queries
+    # --------------------------------
+
+    def window(self, seconds, filters: dict, now=None) -> dict:
+
+        seconds = min(seconds, self.retention_seconds)
+
+        totals = dict.fromkeys(BucketStore.FIELDS, 0.0)
+
+        for counters, _ in self._match(filters):
+
+            for name, value in counters.window(seconds, now).items():
+                totals[name] += value
+
+        return totals
+
+    def sketch(self, seconds, filters: dict, now=None) -> DDSketch:
+
+        seconds = min(seconds, self.retention_seconds)
+
+        merged = DDSketch(self.relative_accuracy)
+
+        for _, sketches in self._match(filters):
+            merged.merge(sketches.window(seconds, now))
+
+        return merged
+
+    def overflowed(self, seconds, filters: dict, now=None) -> float:
+        """
+        Requests in the window that went to the overflow series
+        filtered queries skip (their labels are lost, so any of
+        them may have belonged to the filter)
+        """
+
+        key = self._overflow(self.SPLIT in filters)
+
+        with self._lock:
+            series = self.series.get(key)
+
+        if series is None:
+            return 0.0
+
+        seconds = min(seconds, self.retention_seconds)
+
+        return series[0].window(seconds, now)["requests"]
+
+    def labels(self) -> dict:
+        """
+        Known values per label
+        """
+
+        with self._lock:
+
+            known = {}
+
+            for name, value in self.index:
+
+                if (name, value) in self.OVERFLOW or value == "*":
+                    continue
+
+                known.setdefault(name, set()).add(value)
+
+        return {name: sorted(values) for name, values in known.items()}
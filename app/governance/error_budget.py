@@ -0,0 +1,264 @@
+import math
+import re
+import threading
+import time
+
+import numpy as np
+
+from app.observability.metrics import (
+    SLO_BURN_RATE,
+    SLO_ERROR_BUDGET_REMAINING,
+)
+
+
+def parse_duration(value) -> float:
+    """
+    "5m" / "1h" / "3d" / 90 -> seconds
+    """
+
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", str(value))
+
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r}")
+
+    unit = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+    return float(match.group(1)) * unit[match.group(2)]
+
+
+class RollingWindow:
+    """
+    Incrementally maintained field totals for one trailing window
+    """
+
+    def __init__(self, store, seconds):
+
+        self.store = store
+
+        self.seconds = seconds
+
+        self.buckets = max(
+            1, math.ceil(seconds / store.bucket_seconds)
+        )
+
+        self.rebuild()
+
+    def rebuild(self, now=None):
+
+        now = time.time() if now is None else now
+
+        window = self.store.window(self.seconds, now)
+
+        self.totals = np.array([
+            window[name] for name in self.store.FIELDS
+        ])
+
+        # Totals now end at this bucket: advance() must not expire
+        # buckets the rebuilt window never contained
+        self.head = self.store.bucket_index(now)
+
+    def advance(self, current):
+
+        if current <= self.head:
+            return
+
+        if current - self.head >= self.buckets:
+
+            # Everything in the window has expired
+            self.totals[:] = 0.0
+
+        else:
+
+            for index in range(
+                self.head - self.buckets + 1,
+                current - self.buckets + 1
+            ):
+
+                row = self.store.row(index)
+
+                if row is not None:
+                    self.totals -= row
+
+        self.head = current
+
+    def observe(self, index, vector):
+
+        if index > self.head:
+            self.advance(index)
+
+        if index > self.head - self.buckets:
+            self.totals += vector
+
+    def get(self, field) -> float:
+
+        return float(self.totals[self.store.columns[field]])
+
+
+class ErrorBudgetEngine:
+    """
+    Multi-window, multi-burn-rate error budget tracking
+    """
+
+    # slo -> (bad events field, total events field)
+    SLIS = {
+        "availability": ("failures", "requests"),
+        "latency": ("latency_over", "latency_count"),
+        "hallucination_rate": ("hallucinations", "groundedness_count"),
+        "fallback_rate": ("fallbacks", "requests"),
+    }
+
+    def __init__(self, store, slo_config: dict, config: dict = None):
+
+        config = config or {}
+
+        self.store = store
+
+        self.budgets = {
+            slo: self._budget(slo, slo_config[slo])
+            for slo in self.SLIS if slo in slo_config
+        }
+
+        windows = {
+            name: parse_duration(value)
+            for name, value in config.get("windows", {
+                "5m": "5m", "1h": "1h", "6h": "6h", "3d": "3d"
+            }).items()
+        }
+
+        # Each SLO's compliance window backs its budget remaining
+        self.budget_windows = {}
+
+        for slo in self.budgets:
+
+            days = slo_config[slo]["window_days"]
+
+            name = f"{days}d"
+
+            windows.setdefault(name, days * 86400)
+
+            self.budget_windows[slo] = name
+
+        self.windows = {
+            name: RollingWindow(store, seconds)
+            for name, seconds in windows.items()
+        }
+
+        self.alerts = config.get("alerts", [
+            {"name": "fast_burn", "long": "1h",
+             "short": "5m", "burn_rate": 14.4},
+            {"name": "slow_burn", "long": "3d",
+             "short": "6h", "burn_rate": 1.0},
+        ])
+
+        self._lock = threading.Lock()
+
+    # --------------------------------
+
+    @staticmethod
+    def _budget(slo, cfg) -> float:
+
+        if slo == "availability":
+            return 1 - cfg["target"]
+
+        if slo == "latency":
+            # p95 objective: 5% of requests may exceed the limit
+            return 0.05
+
+        return cfg["max_rate"]
+
+    # --------------------------------
+    # Recording
+    # --------------------------------
+
+    def observe(self, amounts: dict, ts=None):
+
+        index = self.store.bucket_index(
+            time.time() if ts is None else ts
+        )
+
+        vector = np.zeros(len(self.store.FIELDS))
+
+        for field, amount in amounts.items():
+            vector[self.store.columns[field]] = amount
+
+        with self._lock:
+
+            for window in self.windows.values():
+                window.observe(index, vector)
+
+    def rebuild(self, now=None):
+        """
+        Resync every window after the store changed underneath
+        """
+
+        now = time.time() if now is None else now
+
+        with self._lock:
+
+            for window in self.windows.values():
+                window.rebuild(now)
+
+    # --------------------------------
+    # Evaluation
+    # --------------------------------
+
+    def _burn_rate(self, slo, window) -> float:
+
+        bad, total = self.SLIS[slo]
+
+        total = window.get(total)
+
+        if not total:
+            return 0.0
+
+        return (window.get(bad) / total) / self.budgets[slo]
+
+    def evaluate(self, now=None) -> dict:
+
+        current = self.store.bucket_index(
+            time.time() if now is None else now
+        )
+
+        with self._lock:
+
+            for window in self.windows.values():
+                window.advance(current)
+
+            report = {}
+
+            for slo in self.budgets:
+
+                burn = {
+                    name: self._burn_rate(slo, window)
+                    for name, window in self.windows.items()
+                }
+
+                remaining = 1 - burn[self.budget_windows[slo]]
+
+                alerts = {
+                    alert["name"]: (
+                        burn[alert["long"]] >= alert["burn_rate"]
+                        and burn[alert["short"]] >= alert["burn_rate"]
+                    )
+                    for alert in self.alerts
+                }
+
+                report[slo] = {
+                    "budget_remaining": remaining,
+                    "burn_rates": burn,
+                    "alerts": alerts
+                }
+
+        for slo, data in report.items():
+
+            SLO_ERROR_BUDGET_REMAINING.labels(slo).set(
+                data["budget_remaining"]
+            )
+
+            for name, rate in data["burn_rates"].items():
+                SLO_BURN_RATE.labels(slo, name).set(rate)
+
+        return report
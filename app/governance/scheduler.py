@@ -0,0 +1,161 @@
+import threading
+import time
+
+from app.config import settings
+
+from app.observability.metrics import (
+    GOVERNANCE_EVAL_LATENCY,
+    GOVERNANCE_TICKS,
+)
+
+
+class GovernanceScheduler:
+    """
+    Background SLO / policy / incident evaluation loop
+    (request handlers only bump a counter)
+    """
+
+    def __init__(
+        self,
+        slo_evaluator,
+        policy_engine,
+        incident_manager,
+        interval=None,
+        min_interval=None,
+        wake_after=None
+    ):
+
+        self.slo = slo_evaluator
+        self.policies = policy_engine
+        self.incidents = incident_manager
+
+        self.interval = interval or settings.GOVERNANCE_INTERVAL
+
+        self.min_interval = (
+            settings.GOVERNANCE_MIN_INTERVAL
+            if min_interval is None else min_interval
+        )
+
+        self.wake_after = wake_after or settings.GOVERNANCE_WAKE_AFTER
+
+        # Immutable snapshot, replaced wholesale on every tick so
+        # readers never need a lock
+        self.snapshot = {
+            "slo": {},
+            "applied_policies": [],
+            "active_policies": [],
+            "evaluated_at": None,
+            "duration_seconds": None,
+            "trigger": None
+        }
+
+        self._since_tick = 0
+        self._changed = False
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self._thread = None
+
+    # --------------------------------
+    # Lifecycle
+    # --------------------------------
+
+    def start(self):
+
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._loop,
+            name="governance",
+            daemon=True
+        )
+
+        self._thread.start()
+
+    def stop(self):
+
+        self._stop.set()
+        self._wake.set()
+
+    # --------------------------------
+    # Request Path
+    # --------------------------------
+
+    def notify(self, failure=False):
+        """
+        Cheap per-request hook; failures or traffic bursts
+        wake the loop before the next interval
+        """
+
+        self._since_tick += 1
+
+        if failure or self._since_tick >= self.wake_after:
+            self._changed = True
+            self._wake.set()
+
+    # --------------------------------
+    # Loop
+    # --------------------------------
+
+    def _loop(self):
+
+        while not self._stop.is_set():
+
+            self._wake.wait(self.interval)
+
+            if self._stop.is_set():
+                return
+
+            trigger = "change" if self._changed else "interval"
+
+            self._wake.clear()
+            self._changed = False
+            self._since_tick = 0
+
+            self.tick(trigger)
+
+            # Rate-limit change-triggered ticks
+            self._stop.wait(self.min_interval)
+
+    def tick(self, trigger="manual"):
+
+        start = time.perf_counter()
+
+        try:
+
+            self.slo.maybe_sync()
+
+            slo_state = self.slo.evaluate()
+
+            applied = self.policies.evaluate(slo_state)
+
+            # Opens, updates or closes the current incident
+            self.incidents.observe(
+                slo_state,
+                applied,
+                self.policies.active()
+            )
+
+        except Exception as e:
+
+            print(f"[GOVERNANCE] Evaluation failed: {e}")
+
+            return self.snapshot
+
+        duration = time.perf_counter() - start
+
+        GOVERNANCE_EVAL_LATENCY.observe(duration)
+        GOVERNANCE_TICKS.labels(trigger).inc()
+
+        self.snapshot = {
+            "slo": slo_state,
+            "applied_policies": applied,
+            "active_policies": self.policies.active(),
+            "evaluated_at": time.time(),
+            "duration_seconds": duration,
+            "trigger": trigger
+        }
+
+        return self.snapshot
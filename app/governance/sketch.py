@@ -0,0 +1,239 @@
+import math
+import threading
+import time
+
+
+class DDSketch:
+    """
+    Mergeable quantile sketch with bounded relative error
+    (log-bucketed, DDSketch style)
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+
+        self.relative_accuracy = relative_accuracy
+
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+
+        self._log_gamma = math.log(self.gamma)
+
+        self.bins = {}
+
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+
+        self.min = math.inf
+        self.max = -math.inf
+
+    # --------------------------------
+    # Recording
+    # --------------------------------
+
+    def add(self, value, n=1):
+
+        if value <= 0:
+            self.zero_count += n
+
+        else:
+            i = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[i] = self.bins.get(i, 0) + n
+
+        self.count += n
+        self.sum += value * n
+
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches of different accuracy")
+
+        for i, n in other.bins.items():
+            self.bins[i] = self.bins.get(i, 0) + n
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        return self
+
+    def copy(self):
+
+        return DDSketch(self.relative_accuracy).merge(self)
+
+    # --------------------------------
+    # Queries
+    # --------------------------------
+
+    def quantile(self, q):
+
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+
+        seen = self.zero_count
+
+        if rank < seen:
+            return max(self.min, 0.0)
+
+        for i in sorted(self.bins):
+
+            seen += self.bins[i]
+
+            if seen > rank:
+
+                value = 2 * self.gamma ** i / (self.gamma + 1)
+
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    # --------------------------------
+    # Serialization (cross-process merge)
+    # --------------------------------
+
+    def to_dict(self) -> dict:
+
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(i): n for i, n in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+
+        sketch = cls(data["relative_accuracy"])
+
+        sketch.bins = {int(i): n for i, n in data["bins"].items()}
+
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+
+        return sketch
+
+
+class SketchStore:
+    """
+    Ring of per-time-bucket quantile sketches
+    """
+
+    def __init__(
+        self,
+        retention_seconds,
+        bucket_seconds=3600,
+        relative_accuracy=0.01
+    ):
+
+        self.bucket_seconds = bucket_seconds
+        self.relative_accuracy = relative_accuracy
+
+        self.size = max(
+            1, math.ceil(retention_seconds / bucket_seconds)
+        )
+
+        self.epochs = [-1] * self.size
+        self.sketches = [None] * self.size
+
+        # Merged closed buckets per window, rebuilt once per bucket
+        self._closed = {}
+
+        self._lock = threading.Lock()
+
+    # --------------------------------
+
+    def bucket_index(self, ts) -> int:
+
+        return int(ts // self.bucket_seconds)
+
+    def add(self, value, ts=None):
+
+        now = time.time()
+
+        index = self.bucket_index(now if ts is None else ts)
+
+        with self._lock:
+
+            slot = index % self.size
+
+            if self.epochs[slot] != index:
+                self.epochs[slot] = index
+                self.sketches[slot] = DDSketch(self.relative_accuracy)
+
+            self.sketches[slot].add(value)
+
+            # Late write into an already merged bucket
+            if index != self.bucket_index(now):
+                self._closed.clear()
+
+    def merge_from(self, index, sketch, replace=False):
+        """
+        Fold a sketch from another worker (or disk) into a bucket
+        """
+
+        with self._lock:
+
+            slot = index % self.size
+
+            if replace or self.epochs[slot] != index:
+                self.epochs[slot] = index
+                self.sketches[slot] = DDSketch(self.relative_accuracy)
+
+            self.sketches[slot].merge(sketch)
+
+            self._closed.clear()
+
+    def window(self, seconds, now=None) -> DDSketch:
+        """
+        Merged sketch over the trailing window; closed buckets are
+        merged once per bucket so repeated queries cost O(bins)
+        """
+
+        now = time.time() if now is None else now
+
+        current = self.bucket_index(now)
+
+        buckets = max(1, math.ceil(seconds / self.bucket_seconds))
+
+        with self._lock:
+
+            cached = self._closed.get(buckets)
+
+            if cached is None or cached[0] != current:
+
+                closed = DDSketch(self.relative_accuracy)
+
+                for slot in range(self.size):
+
+                    epoch = self.epochs[slot]
+
+                    if current - buckets < epoch < current:
+                        closed.merge(self.sketches[slot])
+
+                cached = (current, closed)
+
+                self._closed[buckets] = cached
+
+            merged = cached[1].copy()
+
+            slot = current % self.size
+
+            if self.epochs[slot] == current:
+                merged.merge(self.sketches[slot])
+
+        return merged
@@ -1,27 +1,75 @@
-import yaml
+import atexit
+import threading
 import time
 
+import yaml
+
+from app.config import settings
+from app.governance.store import BucketStore
+from app.governance.sketch import DDSketch, SketchStore
+from app.governance.error_budget import ErrorBudgetEngine, parse_duration
+from app.governance.timeseries import TimeSeriesStore, HOUR
+from app.governance.dimensions import LabeledStore
+
 
 class SLOEvaluator:
     """
     Evaluates SLO compliance and error budgets
     """
 
-    def __init__(self, config_path="policies/slo_config.yaml"):
+    def __init__(
+        self,
+        config_path="policies/slo_config.yaml",
+        persist=True
+    ):
 
         self.config_path = config_path
 
         self.config = self._load()
 
-        # In-memory metrics history (Phase 6 → DB)
-        self.history = {
-            "requests": [],
-            "failures": [],
-            "latency": [],
-            "groundedness": [],
-            "hallucinations": [],
-            "fallbacks": []
-        }
+        storage = self.config.get("storage", {})
+
+        retention_days = max(
+            cfg.get("window_days", 1)
+            for cfg in self.config["slo"].values()
+        )
+
+        self.retention_seconds = retention_days * 86400
+
+        # Fixed-memory bucketed aggregates
+        self.store = BucketStore(
+            retention_days * 86400,
+            bucket_seconds=storage.get("bucket_seconds", 60)
+        )
+
+        # Per-bucket latency quantile sketches
+        self.latency_sketches = SketchStore(
+            retention_days * 86400,
+            bucket_seconds=storage.get("sketch_bucket_seconds", 3600),
+            relative_accuracy=storage.get("sketch_relative_accuracy", 0.01)
+        )
+
+        # Per model / cache / fault / endpoint series
+        self.dimensions = LabeledStore(
+            storage.get("label_retention_days", 7) * 86400,
+            bucket_seconds=storage.get("label_bucket_seconds", 300),
+            sketch_bucket_seconds=storage.get("sketch_bucket_seconds", 3600),
+            relative_accuracy=storage.get("sketch_relative_accuracy", 0.01),
+            max_series=storage.get("max_label_series", 256)
+        )
+
+        # Thresholds and error budgets (hot-reloadable)
+        self.validate_config(self.config)
+
+        self._apply(self.config)
+
+        # On-disk time series shared by every worker
+        self.timeseries = None
+
+        persistence = self.config.get("persistence", {})
+
+        if persist and persistence.get("enabled", False):
+            self._open_timeseries(persistence)
 
     # --------------------------------
 
@@ -31,151 +79,459 @@ class SLOEvaluator:
             return yaml.safe_load(f)
 
     # --------------------------------
-    # Recording
+    # Hot Reload
     # --------------------------------
 
-    def record_request(self, success=True):
+    REQUIRED = {
+        "availability": "target",
+        "latency": "p95_ms",
+        "groundedness": "min_score",
+        "hallucination_rate": "max_rate",
+        "fallback_rate": "max_rate",
+    }
 
-        self.history["requests"].append(time.time())
+    # Sized at startup; changing these needs a restart
+    RESTART_SECTIONS = ("storage", "persistence")
 
-        if not success:
-            self.history["failures"].append(time.time())
+    def validate_config(self, config: dict):
 
-    def record_latency(self, value):
+        slos = (config or {}).get("slo")
 
-        self.history["latency"].append(
-            (time.time(), value)
-        )
+        if not isinstance(slos, dict):
+            raise ValueError("slo section missing")
 
-    def record_groundedness(self, value):
+        for name, field in self.REQUIRED.items():
 
-        self.history["groundedness"].append(
-            (time.time(), value)
-        )
+            cfg = slos.get(name)
+
+            if not isinstance(cfg, dict) or field not in cfg:
+                raise ValueError(f"slo.{name}.{field} missing")
+
+            if not isinstance(cfg[field], (int, float)) or cfg[field] < 0:
+                raise ValueError(f"slo.{name}.{field} must be >= 0")
+
+            days = cfg.get("window_days")
+
+            if not isinstance(days, int) or days <= 0:
+                raise ValueError(f"slo.{name}.window_days must be > 0")
+
+            if (
+                hasattr(self, "retention_seconds")
+                and days * 86400 > self.retention_seconds
+            ):
+                raise ValueError(
+                    f"slo.{name}.window_days exceeds retention "
+                    "(restart required)"
+                )
+
+        budget = config.get("error_budget") or {}
+
+        windows = set(budget.get("windows", {}))
 
-    def record_hallucination(self):
+        for alert in budget.get("alerts", []):
 
-        self.history["hallucinations"].append(
-            time.time()
+            for key in ("long", "short"):
+
+                if windows and alert.get(key) not in windows:
+                    raise ValueError(
+                        f"alert {alert.get('name')}: unknown window "
+                        f"{alert.get(key)}"
+                    )
+
+    def _apply(self, config: dict):
+
+        budget = ErrorBudgetEngine(
+            self.store,
+            config["slo"],
+            config.get("error_budget")
         )
 
-    def record_fallback(self):
+        latency_limit = config["slo"]["latency"]["p95_ms"] / 1000
+
+        # Reference swaps only; readers never take a lock
+        self.budget = budget
+        self.latency_limit = latency_limit
+        self.config = config
+
+    def apply_config(self, config: dict):
+        """
+        Validate and swap in new thresholds / error budget windows
+        """
+
+        self.validate_config(config)
+
+        for section in self.RESTART_SECTIONS:
+
+            if config.get(section) != self.config.get(section):
+                print(f"[SLO] {section} changes apply after restart")
+
+        self._apply(config)
 
-        self.history["fallbacks"].append(
-            time.time()
+        # Catch observations recorded against the old engine
+        self.budget.rebuild()
+
+    # --------------------------------
+    # Persistence
+    # --------------------------------
+
+    def _open_timeseries(self, cfg):
+
+        retention = {
+            name: parse_duration(value)
+            for name, value in cfg.get("retention", {}).items()
+        }
+
+        self.timeseries = TimeSeriesStore(
+            settings.SLO_DB_PATH or cfg.get("path", "data/slo_timeseries.db"),
+            BucketStore.FIELDS,
+            bucket_seconds=self.store.bucket_seconds,
+            retention=retention
         )
 
+        self.flush_seconds = cfg.get("flush_seconds", 10)
+        self.rollup_seconds = cfg.get("rollup_seconds", 300)
+
+        self._pending = {}
+        self._pending_sketches = {}
+
+        self._pending_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+        self._hydrate()
+
+        atexit.register(self.sync)
+
+    def _hydrate(self):
+        """
+        Load on-disk rollups covering the longest SLO window
+        """
+
+        now = time.time()
+
+        since = now - self.retention_seconds
+
+        for _, bucket, values in self.timeseries.rows(since):
+            self.store.add_many(values, ts=bucket)
+
+        for _, bucket, sketch in self.timeseries.sketches(since):
+
+            self.latency_sketches.merge_from(
+                self.latency_sketches.bucket_index(bucket),
+                sketch
+            )
+
+        self.budget.rebuild()
+
+        self._last_sync = now
+        self._last_rollup = now
+
+    def _queue(self, amounts, ts, latency=None):
+
+        ts = time.time() if ts is None else ts
+
+        width = self.store.bucket_seconds
+
+        bucket = int(ts // width) * width
+
+        with self._pending_lock:
+
+            pending = self._pending.setdefault(bucket, {})
+
+            for field, amount in amounts.items():
+                pending[field] = pending.get(field, 0.0) + amount
+
+            if latency is not None:
+
+                hour = int(ts // HOUR) * HOUR
+
+                if hour not in self._pending_sketches:
+                    self._pending_sketches[hour] = DDSketch(
+                        self.latency_sketches.relative_accuracy
+                    )
+
+                self._pending_sketches[hour].add(latency)
+
+    def maybe_sync(self):
+        """
+        Sync when flush_seconds elapsed (called off the request path)
+        """
+
+        if self.timeseries is None:
+            return
+
+        if time.time() - self._last_sync >= self.flush_seconds:
+            self.sync()
+
+    def sync(self):
+        """
+        Flush local deltas and pull other workers' recent buckets
+        """
+
+        if self.timeseries is None:
+            return
+
+        with self._sync_lock:
+            self._sync()
+
+    def _sync(self):
+
+        now = time.time()
+
+        with self._pending_lock:
+
+            counters, self._pending = self._pending, {}
+            sketches, self._pending_sketches = self._pending_sketches, {}
+
+        try:
+
+            if counters or sketches:
+                self.timeseries.write(counters, sketches)
+
+            since = self._last_sync - self.store.bucket_seconds
+
+            for _, bucket, values in self.timeseries.rows(
+                since,
+                resolution=self.store.bucket_seconds
+            ):
+                self.store.overwrite(bucket, values)
+
+            for resolution, bucket, sketch in self.timeseries.sketches(
+                int(since // HOUR) * HOUR
+            ):
+
+                if resolution == HOUR:
+
+                    self.latency_sketches.merge_from(
+                        self.latency_sketches.bucket_index(bucket),
+                        sketch,
+                        replace=True
+                    )
+
+            self.budget.rebuild()
+
+            if now - self._last_rollup >= self.rollup_seconds:
+
+                self.timeseries.rollup(now)
+
+                self._last_rollup = now
+
+        except Exception as e:
+
+            print(f"[SLO] Time series sync failed: {e}")
+
+            # Keep the deltas for the next attempt
+            with self._pending_lock:
+
+                for bucket, deltas in counters.items():
+
+                    pending = self._pending.setdefault(bucket, {})
+
+                    for field, amount in deltas.items():
+                        pending[field] = pending.get(field, 0.0) + amount
+
+                for hour, sketch in sketches.items():
+
+                    if hour in self._pending_sketches:
+                        self._pending_sketches[hour].merge(sketch)
+                    else:
+                        self._pending_sketches[hour] = sketch
+
+            return
+
+        self._last_sync = now
+
+    # --------------------------------
+    # Recording
+    # --------------------------------
+
+    def _add(self, amounts, ts=None, latency=None, labels=None):
+
+        # Budget windows advance before the store reuses a slot
+        self.budget.observe(amounts, ts)
+
+        self.store.add_many(amounts, ts)
+
+        if labels:
+
+            self.dimensions.add_many(labels, amounts, ts)
+
+            if latency is not None:
+                self.dimensions.add_latency(labels, latency, ts)
+
+        if self.timeseries is not None:
+            self._queue(amounts, ts, latency)
+
+    def record_request(self, success=True, ts=None, labels=None):
+
+        amounts = {"requests": 1}
+
+        if not success:
+            amounts["failures"] = 1
+
+        self._add(amounts, ts, labels=labels)
+
+    def record_latency(self, value, ts=None, labels=None):
+
+        self._add({
+            "latency_count": 1,
+            "latency_sum": value,
+            "latency_over": 1 if value > self.latency_limit else 0
+        }, ts, latency=value, labels=labels)
+
+        self.latency_sketches.add(value, ts)
+
+    def record_groundedness(self, value, ts=None, labels=None):
+
+        self._add({
+            "groundedness_count": 1,
+            "groundedness_sum": value
+        }, ts, labels=labels)
+
+    def record_hallucination(self, ts=None, labels=None):
+
+        self._add({"hallucinations": 1}, ts, labels=labels)
+
+    def record_fallback(self, ts=None, labels=None):
+
+        self._add({"fallbacks": 1}, ts, labels=labels)
+
     # --------------------------------
     # Helpers
     # --------------------------------
 
-    def _window(self, data, days):
+    def _window(self, days, labels=None):
 
-        cutoff = time.time() - days * 86400
+        if labels:
+            return self.dimensions.window(days * 86400, labels)
 
-        return [
-            x for x in data
-            if (x if isinstance(x, float) else x[0]) >= cutoff
-        ]
+        return self.store.window(days * 86400)
 
     # --------------------------------
     # SLO Evaluation
     # --------------------------------
 
-    def availability_slo(self):
+    def availability_slo(self, labels=None):
 
         cfg = self.config["slo"]["availability"]
 
-        window = cfg["window_days"]
+        data = self._window(cfg["window_days"], labels)
 
-        req = self._window(self.history["requests"], window)
-        fail = self._window(self.history["failures"], window)
-
-        total = len(req)
+        total = data["requests"]
 
         if total == 0:
             return 1.0
 
-        return (total - len(fail)) / total
+        return (total - data["failures"]) / total
 
-    def latency_slo(self):
+    PERCENTILES = {
+        "p50": 0.50,
+        "p95": 0.95,
+        "p99": 0.99,
+        "p999": 0.999,
+    }
 
-        cfg = self.config["slo"]["latency"]
+    def latency_percentiles(self, days=None, labels=None):
+        """
+        Latency percentiles in ms from the merged window sketch
+        """
 
-        window = cfg["window_days"]
+        days = days or self.config["slo"]["latency"]["window_days"]
 
-        limit = cfg["p95_ms"] / 1000
+        if labels:
+            sketch = self.dimensions.sketch(days * 86400, labels)
+        else:
+            sketch = self.latency_sketches.window(days * 86400)
 
-        data = self._window(
-            self.history["latency"],
-            window
-        )
+        return {
+            name: (
+                None if sketch.count == 0
+                else sketch.quantile(q) * 1000
+            )
+            for name, q in self.PERCENTILES.items()
+        }
+
+    def latency_slo(self, percentiles=None):
 
-        if not data:
+        percentiles = percentiles or self.latency_percentiles()
+
+        p95 = percentiles["p95"]
+
+        if p95 is None:
             return True
 
-        values = sorted([x[1] for x in data])
+        return p95 / 1000 <= self.latency_limit
 
-        p95 = values[int(0.95 * len(values))]
+    def groundedness_score(self, labels=None):
+        """
+        Mean groundedness over the window (None without samples)
+        """
 
-        return p95 <= limit
+        cfg = self.config["slo"]["groundedness"]
 
-    def hallucination_rate(self):
+        data = self._window(cfg["window_days"], labels)
 
-        cfg = self.config["slo"]["hallucination_rate"]
+        if not data["groundedness_count"]:
+            return None
 
-        window = cfg["window_days"]
+        return data["groundedness_sum"] / data["groundedness_count"]
 
-        req = self._window(self.history["requests"], window)
+    def hallucination_rate(self, labels=None):
 
-        hall = self._window(
-            self.history["hallucinations"],
-            window
-        )
+        cfg = self.config["slo"]["hallucination_rate"]
+
+        data = self._window(cfg["window_days"], labels)
 
-        if not req:
+        # Only evaluated answers can be judged hallucinated; the pool
+        # may shed or sample evaluations under load
+        if not data["groundedness_count"]:
             return 0.0
 
-        return len(hall) / len(req)
+        return data["hallucinations"] / data["groundedness_count"]
 
-    def fallback_rate(self):
+    def fallback_rate(self, labels=None):
 
         cfg = self.config["slo"]["fallback_rate"]
 
-        window = cfg["window_days"]
-
-        req = self._window(self.history["requests"], window)
-
-        fb = self._window(
-            self.history["fallbacks"],
-            window
-        )
+        data = self._window(cfg["window_days"], labels)
 
-        if not req:
+        if not data["requests"]:
             return 0.0
 
-        return len(fb) / len(req)
+        return data["fallbacks"] / data["requests"]
 
     # --------------------------------
     # Summary
     # --------------------------------
 
-    def evaluate(self):
+    def evaluate(self, labels=None):
+        """
+        SLO summary, globally or for one label filter
+        (e.g. {"model": "secondary", "fault": "kill_model"})
+        """
 
-        availability = self.availability_slo()
+        availability = self.availability_slo(labels)
 
-        hallucination = self.hallucination_rate()
+        hallucination = self.hallucination_rate(labels)
 
-        fallback = self.fallback_rate()
+        fallback = self.fallback_rate(labels)
 
-        latency_ok = self.latency_slo()
+        groundedness = self.groundedness_score(labels)
 
-        return {
+        percentiles = self.latency_percentiles(labels=labels)
+
+        latency_ok = self.latency_slo(percentiles)
+
+        summary = {
             "availability": availability,
             "availability_ok": availability >=
             self.config["slo"]["availability"]["target"],
 
             "latency_ok": latency_ok,
+            "latency_ms": percentiles,
+
+            "groundedness": groundedness,
+            "groundedness_ok": groundedness is None or groundedness >=
+            self.config["slo"]["groundedness"]["min_score"],
 
             "hallucination_rate": hallucination,
             "hallucination_ok": hallucination <=
@@ -185,3 +541,32 @@ class SLOEvaluator:
             "fallback_ok": fallback <=
             self.config["slo"]["fallback_rate"]["max_rate"],
         }
+
+        if labels:
+
+            # Error budgets are tracked for global traffic only
+            summary["labels"] = labels
+
+            # Samples past max_label_series no filter can see
+            summary["overflow_requests"] = self.dimensions.overflowed(
+                self.config["slo"]["availability"]["window_days"] * 86400,
+                labels
+            )
+
+            return summary
+
+        budgets = self.budget.evaluate()
+
+        # Flat burn alert flags (e.g. availability_fast_burn)
+        # so policy conditions can match on them directly
+        burn_alerts = {
+            f"{slo}_{name}": firing
+            for slo, data in budgets.items()
+            for name, firing in data["alerts"].items()
+        }
+
+        return {
+            **summary,
+            "error_budget": budgets,
+            **burn_alerts,
+        }
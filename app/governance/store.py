@@ -0,0 +1,151 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+
+class BucketStore:
+    """
+    Fixed-memory time-bucketed counters (ring buffer)
+    """
+
+    FIELDS = (
+        "requests",
+        "failures",
+        "latency_count",
+        "latency_sum",
+        "latency_over",
+        "groundedness_count",
+        "groundedness_sum",
+        "hallucinations",
+        "fallbacks",
+    )
+
+    def __init__(self, retention_seconds, bucket_seconds=60):
+
+        self.bucket_seconds = bucket_seconds
+
+        # One spare slot so a bucket leaving the longest window is
+        # still readable before its slot is reused
+        self.size = math.ceil(retention_seconds / bucket_seconds) + 1
+
+        self.columns = {
+            name: i for i, name in enumerate(self.FIELDS)
+        }
+
+        # Absolute bucket index held by each slot (-1 = empty)
+        self.epochs = np.full(self.size, -1, dtype=np.int64)
+
+        self.values = np.zeros(
+            (self.size, len(self.FIELDS)),
+            dtype=np.float64
+        )
+
+        self._lock = threading.Lock()
+
+    # --------------------------------
+    # Buckets
+    # --------------------------------
+
+    def bucket_index(self, ts) -> int:
+
+        return int(ts // self.bucket_seconds)
+
+    def _slot(self, index) -> int:
+
+        slot = index % self.size
+
+        # Slot still holds an expired bucket: compact in place
+        if self.epochs[slot] != index:
+            self.values[slot] = 0.0
+            self.epochs[slot] = index
+
+        return slot
+
+    # --------------------------------
+    # Recording (O(1))
+    # --------------------------------
+
+    def add(self, field, amount=1.0, ts=None):
+
+        self.add_many({field: amount}, ts)
+
+    def add_many(self, amounts: dict, ts=None):
+
+        index = self.bucket_index(
+            time.time() if ts is None else ts
+        )
+
+        with self._lock:
+
+            slot = self._slot(index)
+
+            for field, amount in amounts.items():
+                self.values[slot, self.columns[field]] += amount
+
+    def overwrite(self, ts, amounts: dict):
+        """
+        Replace one bucket with authoritative (e.g. on-disk) totals
+        """
+
+        index = self.bucket_index(ts)
+
+        with self._lock:
+
+            slot = self._slot(index)
+
+            self.values[slot] = [
+                amounts.get(name, 0.0) for name in self.FIELDS
+            ]
+
+    # --------------------------------
+    # Queries (O(1))
+    # --------------------------------
+
+    def row(self, index):
+        """
+        Field vector of one bucket, or None once it was compacted
+        """
+
+        with self._lock:
+
+            slot = index % self.size
+
+            if self.epochs[slot] != index:
+                return None
+
+            return self.values[slot].copy()
+
+    # --------------------------------
+    # Queries (O(buckets))
+    # --------------------------------
+
+    def _mask(self, seconds, now):
+
+        current = self.bucket_index(now)
+
+        buckets = max(1, math.ceil(seconds / self.bucket_seconds))
+
+        return (
+            (self.epochs > current - buckets)
+            & (self.epochs <= current)
+        )
+
+    def window(self, seconds, now=None) -> dict:
+        """
+        Field totals over the trailing window
+        """
+
+        now = time.time() if now is None else now
+
+        with self._lock:
+
+            mask = self._mask(seconds, now)
+
+            sums = mask.astype(np.float64) @ self.values
+
+        return {
+            name: float(sums[i])
+            for name, i in self.columns.items()
+        }
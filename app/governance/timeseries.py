@@ -0,0 +1,279 @@
+import json
+import os
+import sqlite3
+import threading
+
+from app.governance.sketch import DDSketch
+
+
+HOUR = 3600
+DAY = 86400
+
+
+class TimeSeriesStore:
+    """
+    Append-only SLO time series on disk (SQLite, WAL)
+    with minute -> hour -> day rollups
+    """
+
+    def __init__(
+        self,
+        path,
+        fields,
+        bucket_seconds=60,
+        retention=None
+    ):
+
+        self.path = path
+        self.fields = tuple(fields)
+        self.bucket_seconds = bucket_seconds
+
+        # Seconds each resolution is kept before rolling up
+        retention = retention or {}
+
+        self.retention = {
+            bucket_seconds: retention.get("minute", 3 * DAY),
+            HOUR: retention.get("hour", 30 * DAY),
+            DAY: retention.get("day", 400 * DAY),
+        }
+
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=10
+        )
+
+        self.db.execute("PRAGMA journal_mode=WAL")
+
+        columns = ", ".join(
+            f"{f} REAL NOT NULL DEFAULT 0" for f in self.fields
+        )
+
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS series ("
+            " resolution INTEGER NOT NULL,"
+            " bucket INTEGER NOT NULL,"
+            f" {columns},"
+            " PRIMARY KEY (resolution, bucket))"
+        )
+
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sketches ("
+            " resolution INTEGER NOT NULL,"
+            " bucket INTEGER NOT NULL,"
+            " sketch TEXT NOT NULL,"
+            " PRIMARY KEY (resolution, bucket))"
+        )
+
+        self._upsert = (
+            f"INSERT INTO series (resolution, bucket, "
+            f"{', '.join(self.fields)}) "
+            f"VALUES (?, ?, {', '.join('?' for _ in self.fields)}) "
+            f"ON CONFLICT (resolution, bucket) DO UPDATE SET "
+            + ", ".join(f"{f} = {f} + excluded.{f}" for f in self.fields)
+        )
+
+    # --------------------------------
+    # Writing (several workers)
+    # --------------------------------
+
+    def write(self, counters: dict, sketches: dict = None):
+        """
+        counters: bucket start -> {field: delta}
+        sketches: hour start -> DDSketch delta
+        """
+
+        rows = [
+            (
+                self.bucket_seconds,
+                int(bucket),
+                *[float(deltas.get(f, 0.0)) for f in self.fields]
+            )
+            for bucket, deltas in counters.items()
+        ]
+
+        with self._lock:
+
+            self.db.execute("BEGIN IMMEDIATE")
+
+            try:
+
+                self.db.executemany(self._upsert, rows)
+
+                for bucket, sketch in (sketches or {}).items():
+                    self._merge_sketch(HOUR, int(bucket), sketch)
+
+                self.db.execute("COMMIT")
+
+            except Exception:
+
+                self.db.execute("ROLLBACK")
+
+                raise
+
+    def _merge_sketch(self, resolution, bucket, sketch):
+
+        row = self.db.execute(
+            "SELECT sketch FROM sketches"
+            " WHERE resolution = ? AND bucket = ?",
+            (resolution, bucket)
+        ).fetchone()
+
+        if row:
+            sketch = DDSketch.from_dict(json.loads(row[0])).merge(sketch)
+
+        self.db.execute(
+            "INSERT OR REPLACE INTO sketches"
+            " (resolution, bucket, sketch) VALUES (?, ?, ?)",
+            (resolution, bucket, json.dumps(sketch.to_dict()))
+        )
+
+    # --------------------------------
+    # Reading
+    # --------------------------------
+
+    def rows(self, since, resolution=None):
+        """
+        (resolution, bucket, {field: total}) newer than since.
+        Resolutions never overlap, so every row is loaded once.
+        """
+
+        query = (
+            f"SELECT resolution, bucket, {', '.join(self.fields)}"
+            " FROM series WHERE bucket >= ?"
+        )
+
+        params = [int(since)]
+
+        if resolution is not None:
+            query += " AND resolution = ?"
+            params.append(resolution)
+
+        with self._lock:
+            result = self.db.execute(query, params).fetchall()
+
+        for row in result:
+            yield row[0], row[1], dict(zip(self.fields, row[2:]))
+
+    def sketches(self, since):
+
+        with self._lock:
+
+            result = self.db.execute(
+                "SELECT resolution, bucket, sketch FROM sketches"
+                " WHERE bucket >= ?",
+                (int(since),)
+            ).fetchall()
+
+        for resolution, bucket, data in result:
+            yield resolution, bucket, DDSketch.from_dict(json.loads(data))
+
+    # --------------------------------
+    # Rollups / Downsampling
+    # --------------------------------
+
+    def rollup(self, now):
+        """
+        Fold expired minute rows into hours and hours into days
+        """
+
+        steps = (
+            (self.bucket_seconds, HOUR),
+            (HOUR, DAY),
+        )
+
+        with self._lock:
+
+            self.db.execute("BEGIN IMMEDIATE")
+
+            try:
+
+                for source, target in steps:
+
+                    if source >= target:
+                        continue
+
+                    cutoff = now - self.retention[source]
+
+                    # Only whole target buckets roll up
+                    cutoff = int(cutoff // target) * target
+
+                    self._rollup_series(source, target, cutoff)
+
+                    if source == HOUR:
+                        self._rollup_sketches(source, target, cutoff)
+
+                self.db.execute(
+                    "DELETE FROM series WHERE resolution = ? AND bucket < ?",
+                    (DAY, int(now - self.retention[DAY]))
+                )
+
+                self.db.execute(
+                    "DELETE FROM sketches WHERE resolution = ? AND bucket < ?",
+                    (DAY, int(now - self.retention[DAY]))
+                )
+
+                self.db.execute("COMMIT")
+
+            except Exception:
+
+                self.db.execute("ROLLBACK")
+
+                raise
+
+    def _rollup_series(self, source, target, cutoff):
+
+        sums = ", ".join(f"SUM({f})" for f in self.fields)
+
+        self.db.execute(
+            f"INSERT INTO series (resolution, bucket, "
+            f"{', '.join(self.fields)}) "
+            f"SELECT ?, (bucket / ?) * ?, {sums} FROM series"
+            f" WHERE resolution = ? AND bucket < ?"
+            f" GROUP BY bucket / ? "
+            f"ON CONFLICT (resolution, bucket) DO UPDATE SET "
+            + ", ".join(f"{f} = {f} + excluded.{f}" for f in self.fields),
+            (target, target, target, source, cutoff, target)
+        )
+
+        self.db.execute(
+            "DELETE FROM series WHERE resolution = ? AND bucket < ?",
+            (source, cutoff)
+        )
+
+    def _rollup_sketches(self, source, target, cutoff):
+
+        rows = self.db.execute(
+            "SELECT bucket, sketch FROM sketches"
+            " WHERE resolution = ? AND bucket < ?",
+            (source, cutoff)
+        ).fetchall()
+
+        merged = {}
+
+        for bucket, data in rows:
+
+            sketch = DDSketch.from_dict(json.loads(data))
+
+            start = bucket // target * target
+
+            if start in merged:
+                merged[start].merge(sketch)
+            else:
+                merged[start] = sketch
+
+        for start, sketch in merged.items():
+            self._merge_sketch(target, start, sketch)
+
+        self.db.execute(
+            "DELETE FROM sketches WHERE resolution = ? AND bucket < ?",
+            (source, cutoff)
+        )
@@ -1,72 +1,271 @@
+import hashlib
+import threading
 import time
 import uuid
 
 from app.models.ollama_client import OllamaClient
 from app.config import settings
 
+from app.incidents.postmortem import PostmortemWorker
+from app.incidents.store import IncidentStore
+
+from app.observability.metrics import INCIDENT_EVENTS
+
 
 class IncidentManager:
     """
-    Incident tracking and postmortem generator
+    Incident lifecycle tracking: one open incident per degradation,
+    deduplicated by policy fingerprint, persisted in an IncidentStore,
+    postmortem generated once in the background after it closes
     """
 
-    def __init__(self):
+    # Minimum seconds between retention passes
+    COMPACT_EVERY = 3600
+
+    def __init__(self, path=None, reopen_window=None, postmortems=True):
 
         self.llm = OllamaClient()
 
         self.model = settings.PRIMARY_MODEL
 
-        self.incidents = []
+        self.store = IncidentStore(path or settings.INCIDENT_DB_PATH)
+
+        self.reopen_window = (
+            settings.INCIDENT_REOPEN_WINDOW
+            if reopen_window is None else reopen_window
+        )
+
+        self.compact_after = settings.INCIDENT_COMPACT_AFTER
+        self.retention = settings.INCIDENT_RETENTION_DAYS * 86400
+
+        self._last_compact = 0.0
+
+        self.open = self._recover()
+
+        self._lock = threading.Lock()
+
+        self.postmortems = (
+            PostmortemWorker(
+                self.llm,
+                self.model,
+                self._postmortem_input,
+                self._postmortem_done,
+                busy=lambda: self.open is not None
+            )
+            if postmortems else None
+        )
 
     # -----------------------------
 
-    def create(
+    def _recover(self):
+        """
+        After a restart, resume the newest open incident; older
+        open rows can no longer be updated and are closed where
+        they stopped
+        """
+
+        incidents = self.store.open_incidents()
+
+        for stale in incidents[1:]:
+
+            closed_at = stale["updated_at"] or stale["opened_at"]
+
+            stale["status"] = "closed"
+            stale["closed_at"] = closed_at
+            stale["duration_seconds"] = closed_at - stale["opened_at"]
+
+            self.store.save(stale)
+
+        if incidents:
+            print(f"[INCIDENT] Resumed open incident {incidents[0]['id']}")
+
+        return incidents[0] if incidents else None
+
+    @staticmethod
+    def fingerprint(policies) -> str:
+
+        key = ",".join(sorted(set(policies)))
+
+        return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+
+    def observe(
         self,
         slo_state,
-        applied_policies
+        applied_policies,
+        active_policies,
+        now=None
     ):
+        """
+        Called on every governance tick; opens, updates or
+        closes the current incident
+        """
+
+        now = time.time() if now is None else now
+
+        incident = None
+
+        with self._lock:
 
-        incident = {
-            "id": str(uuid.uuid4()),
-            "timestamp": time.time(),
-            "slo_state": slo_state,
-            "policies": applied_policies
-        }
+            if active_policies:
+                incident = self._update(
+                    slo_state, applied_policies, active_policies, now
+                )
 
-        incident["postmortem"] = self._postmortem(
-            incident
+            elif self.open is not None:
+                incident = self._close(slo_state, now)
+
+        if now - self._last_compact >= self.COMPACT_EVERY:
+
+            self._last_compact = now
+
+            self.store.compact(now, self.compact_after, self.retention)
+
+        return incident
+
+    def create(self, slo_state, applied_policies):
+
+        return self.observe(
+            slo_state,
+            applied_policies,
+            applied_policies
         )
 
-        self.incidents.append(incident)
+    def _update(self, slo_state, applied, active, now):
+
+        incident = self.open
+
+        if incident is None:
+            incident = self._reopen(active, now)
+
+        if incident is None:
+
+            incident = {
+                "id": str(uuid.uuid4()),
+                "status": "open",
+                "opened_at": now,
+                "closed_at": None,
+                "duration_seconds": None,
+                "policies": [],
+                "fingerprint": None,
+                "updates": 0,
+                "opening_slo_state": slo_state,
+                "postmortem_status": None,
+                "postmortem": None
+            }
+
+            INCIDENT_EVENTS.labels("opened").inc()
+
+        elif incident is self.open:
+
+            incident["updates"] += 1
+
+            INCIDENT_EVENTS.labels("updated").inc()
+
+        incident["policies"] = sorted(
+            set(incident["policies"]) | set(active) | set(applied)
+        )
+
+        incident["fingerprint"] = self.fingerprint(incident["policies"])
+        incident["updated_at"] = now
+        incident["slo_state"] = slo_state
+
+        self.store.save(incident)
+
+        self.open = incident
+
+        return incident
+
+    def _reopen(self, active, now):
+        """
+        Flapping: a recently closed incident with the same
+        fingerprint is reopened instead of duplicated
+        """
+
+        incident = self.store.recently_closed(
+            self.fingerprint(active),
+            now - self.reopen_window
+        )
+
+        if incident is None or incident["postmortem_status"] not in (
+            None, "pending"
+        ):
+            return None
+
+        incident["status"] = "open"
+        incident["closed_at"] = None
+        incident["duration_seconds"] = None
+
+        # Written once, after the final close
+        incident["postmortem_status"] = None
+
+        INCIDENT_EVENTS.labels("reopened").inc()
+
+        return incident
+
+    def _close(self, slo_state, now):
+
+        incident = self.open
+
+        self.open = None
+
+        incident["status"] = "closed"
+        incident["closed_at"] = now
+        incident["duration_seconds"] = now - incident["opened_at"]
+        incident["slo_state"] = slo_state
+
+        INCIDENT_EVENTS.labels("closed").inc()
+
+        if self.postmortems is not None:
+            incident["postmortem_status"] = "pending"
+
+        self.store.save(incident)
+
+        if (
+            self.postmortems is not None
+            and not self.postmortems.submit(incident["id"])
+        ):
+
+            incident["postmortem_status"] = "dropped"
+
+            self.store.save(incident)
 
         return incident
 
     # -----------------------------
 
-    def _postmortem(self, incident):
+    def _postmortem_input(self, incident_id):
 
-        prompt = f"""
-You are an SRE writing an incident postmortem.
+        incident = self.store.get(incident_id)
 
-Incident:
-{incident}
+        if incident is None or incident["postmortem_status"] != "pending":
+            return None
 
-Write a concise RCA and improvement plan.
-"""
+        return incident
 
-        try:
+    def _postmortem_done(self, incident_id, text):
 
-            return self.llm.generate(
-                self.model,
-                prompt
-            )
+        with self._lock:
 
-        except Exception:
+            incident = self.store.get(incident_id)
 
-            return "Postmortem generation failed"
+            if (
+                incident is not None
+                and incident["postmortem_status"] == "pending"
+            ):
+                self.store.set_postmortem(incident_id, text)
 
     # -----------------------------
+    # Queries
+    # -----------------------------
+
+    def get(self, incident_id):
+
+        return self.store.get(incident_id)
 
-    def list(self):
+    def list(self, **filters):
 
-        return self.incidents
+        return self.store.list(**filters)
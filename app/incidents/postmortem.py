@@ -0,0 +1,141 @@
+import queue
+import threading
+import time
+
+from app.config import settings
+
+from app.observability.metrics import POSTMORTEMS
+
+
+class PostmortemWorker:
+    """
+    Low-priority background postmortem generation: one worker,
+    bounded queue, rate-limited LLM calls, deferred while the
+    system is still degraded
+    """
+
+    def __init__(
+        self,
+        llm,
+        model,
+        lookup,
+        on_done,
+        busy=None,
+        min_interval=None,
+        queue_size=None,
+        poll_seconds=5.0
+    ):
+
+        self.llm = llm
+        self.model = model
+
+        # id -> current incident snapshot, or None to skip
+        self.lookup = lookup
+        self.on_done = on_done
+
+        # Returns True while generation should wait (open incident)
+        self.busy = busy or (lambda: False)
+
+        self.min_interval = (
+            settings.POSTMORTEM_MIN_INTERVAL
+            if min_interval is None else min_interval
+        )
+
+        self.queue = queue.Queue(
+            maxsize=queue_size or settings.POSTMORTEM_QUEUE_SIZE
+        )
+
+        self.poll_seconds = poll_seconds
+
+        self._last_call = 0.0
+
+        self._stop = threading.Event()
+
+        self._thread = threading.Thread(
+            target=self._worker,
+            name="postmortem-worker",
+            daemon=True
+        )
+
+        self._thread.start()
+
+    # --------------------------------
+
+    def submit(self, incident_id: str) -> bool:
+
+        try:
+            self.queue.put_nowait(incident_id)
+
+        except queue.Full:
+
+            POSTMORTEMS.labels("dropped").inc()
+
+            return False
+
+        return True
+
+    def stop(self):
+
+        self._stop.set()
+
+    # --------------------------------
+
+    def _worker(self):
+
+        while not self._stop.is_set():
+
+            try:
+                incident_id = self.queue.get(timeout=self.poll_seconds)
+            except queue.Empty:
+                continue
+
+            # Yield to live traffic while anything is still degraded
+            while self.busy() and not self._stop.is_set():
+                self._stop.wait(self.poll_seconds)
+
+            wait = self._last_call + self.min_interval - time.time()
+
+            if wait > 0:
+                self._stop.wait(wait)
+
+            if self._stop.is_set():
+                return
+
+            # Reopened or already written since it was queued
+            incident = self.lookup(incident_id)
+
+            if incident is None:
+                continue
+
+            self._last_call = time.time()
+
+            self.on_done(incident_id, self._generate(incident))
+
+    def _generate(self, incident):
+
+        prompt = f"""
+You are an SRE writing an incident postmortem.
+
+Incident:
+{incident}
+
+Write a concise RCA and improvement plan.
+"""
+
+        try:
+
+            text = self.llm.generate(
+                self.model,
+                prompt,
+                options={"num_predict": settings.POSTMORTEM_MAX_TOKENS}
+            )
+
+            POSTMORTEMS.labels("generated").inc()
+
+            return text
+
+        except Exception:
+
+            POSTMORTEMS.labels("failed").inc()
+
+            return "Postmortem generation failed"
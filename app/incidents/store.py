@@ -0,0 +1,305 @@
+import json
+import os
+import sqlite3
+import threading
+
+
+class IncidentStore:
+    """
+    Persistent incident store (SQLite, WAL) indexed by time,
+    status and policy, with keyset pagination and compaction
+    """
+
+    # Columns returned by the summary projection
+    SUMMARY = (
+        "id", "status", "opened_at", "updated_at", "closed_at",
+        "duration_seconds", "fingerprint", "policies", "updates",
+        "postmortem_status"
+    )
+
+    # Large JSON / text columns
+    DETAIL = ("slo_state", "opening_slo_state", "postmortem")
+
+    JSON_COLUMNS = ("policies", "slo_state", "opening_slo_state")
+
+    def __init__(self, path):
+
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+
+        self.db.execute("PRAGMA journal_mode=WAL")
+
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS incidents ("
+            " id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " opened_at REAL NOT NULL,"
+            " updated_at REAL,"
+            " closed_at REAL,"
+            " duration_seconds REAL,"
+            " fingerprint TEXT,"
+            " policies TEXT NOT NULL,"
+            " updates INTEGER NOT NULL DEFAULT 0,"
+            " postmortem_status TEXT,"
+            " postmortem TEXT,"
+            " slo_state TEXT,"
+            " opening_slo_state TEXT)"
+        )
+
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS incident_policies ("
+            " policy TEXT NOT NULL,"
+            " incident_id TEXT NOT NULL,"
+            " PRIMARY KEY (policy, incident_id))"
+        )
+
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS incidents_opened"
+            " ON incidents (opened_at, id)"
+        )
+
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS incidents_status"
+            " ON incidents (status, opened_at)"
+        )
+
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS incidents_fingerprint"
+            " ON incidents (fingerprint, closed_at)"
+        )
+
+        self.db.commit()
+
+    # ----------------------------------
+    # Rows
+    # ----------------------------------
+
+    def _row(self, row, columns) -> dict:
+
+        incident = dict(zip(columns, row))
+
+        for name in self.JSON_COLUMNS:
+
+            if incident.get(name) is not None:
+                incident[name] = json.loads(incident[name])
+
+        return incident
+
+    # ----------------------------------
+    # Writing
+    # ----------------------------------
+
+    def save(self, incident: dict):
+
+        columns = self.SUMMARY + self.DETAIL
+
+        values = [
+            json.dumps(incident.get(name))
+            if name in self.JSON_COLUMNS else incident.get(name)
+            for name in columns
+        ]
+
+        with self._lock:
+
+            self.db.execute(
+                f"INSERT OR REPLACE INTO incidents ({', '.join(columns)})"
+                f" VALUES ({', '.join('?' for _ in columns)})",
+                values
+            )
+
+            self.db.executemany(
+                "INSERT OR IGNORE INTO incident_policies"
+                " (policy, incident_id) VALUES (?, ?)",
+                [(p, incident["id"]) for p in incident["policies"]]
+            )
+
+            self.db.commit()
+
+    def set_postmortem(self, incident_id, text, status="ready"):
+
+        with self._lock:
+
+            self.db.execute(
+                "UPDATE incidents SET postmortem = ?, postmortem_status = ?"
+                " WHERE id = ?",
+                (text, status, incident_id)
+            )
+
+            self.db.commit()
+
+    # ----------------------------------
+    # Reading
+    # ----------------------------------
+
+    def get(self, incident_id):
+
+        columns = self.SUMMARY + self.DETAIL
+
+        with self._lock:
+
+            row = self.db.execute(
+                f"SELECT {', '.join(columns)} FROM incidents WHERE id = ?",
+                (incident_id,)
+            ).fetchone()
+
+        return self._row(row, columns) if row else None
+
+    def open_incidents(self) -> list:
+        """
+        Incidents still marked open, newest first
+        """
+
+        with self._lock:
+
+            rows = self.db.execute(
+                "SELECT id FROM incidents WHERE status = 'open'"
+                " ORDER BY opened_at DESC, id DESC"
+            ).fetchall()
+
+        return [self.get(row[0]) for row in rows]
+
+    def recently_closed(self, fingerprint, since):
+
+        with self._lock:
+
+            row = self.db.execute(
+                "SELECT id FROM incidents"
+                " WHERE fingerprint = ? AND status = 'closed'"
+                " AND closed_at >= ?"
+                " ORDER BY closed_at DESC LIMIT 1",
+                (fingerprint, since)
+            ).fetchone()
+
+        return self.get(row[0]) if row else None
+
+    def list(
+        self,
+        limit=50,
+        cursor=None,
+        status=None,
+        policy=None,
+        since=None,
+        until=None,
+        summary=True
+    ) -> dict:
+        """
+        Newest first. cursor is the opaque next_cursor of the
+        previous page ("opened_at:id").
+        """
+
+        columns = self.SUMMARY if summary else self.SUMMARY + self.DETAIL
+
+        where = []
+        params = []
+
+        if status:
+            where.append("status = ?")
+            params.append(status)
+
+        if policy:
+            where.append(
+                "id IN (SELECT incident_id FROM incident_policies"
+                " WHERE policy = ?)"
+            )
+            params.append(policy)
+
+        if since is not None:
+            where.append("opened_at >= ?")
+            params.append(since)
+
+        if until is not None:
+            where.append("opened_at < ?")
+            params.append(until)
+
+        if cursor:
+
+            opened_at, incident_id = self._cursor(cursor)
+
+            where.append("(opened_at, id) < (?, ?)")
+            params.extend([opened_at, incident_id])
+
+        query = f"SELECT {', '.join(columns)} FROM incidents"
+
+        if where:
+            query += " WHERE " + " AND ".join(where)
+
+        query += " ORDER BY opened_at DESC, id DESC LIMIT ?"
+
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self.db.execute(query, params).fetchall()
+
+        incidents = [self._row(row, columns) for row in rows[:limit]]
+
+        next_cursor = None
+
+        if len(rows) > limit:
+
+            last = incidents[-1]
+
+            next_cursor = f"{last['opened_at']!r}:{last['id']}"
+
+        return {
+            "incidents": incidents,
+            "next_cursor": next_cursor
+        }
+
+    @staticmethod
+    def _cursor(cursor):
+        """
+        Parse "opened_at:id"; ValueError if it is not one of ours
+        """
+
+        opened_at, sep, incident_id = cursor.partition(":")
+
+        try:
+            opened_at = float(opened_at)
+        except ValueError:
+            opened_at = None
+
+        if not sep or not incident_id or opened_at is None:
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+
+        return opened_at, incident_id
+
+    # ----------------------------------
+    # Retention
+    # ----------------------------------
+
+    def compact(self, now, compact_after, retention):
+        """
+        Drop SLO snapshots from closed incidents older than
+        compact_after, delete them entirely after retention
+        """
+
+        with self._lock:
+
+            self.db.execute(
+                "UPDATE incidents SET slo_state = NULL,"
+                " opening_slo_state = NULL"
+                " WHERE status = 'closed' AND closed_at < ?"
+                " AND slo_state IS NOT NULL",
+                (now - compact_after,)
+            )
+
+            self.db.execute(
+                "DELETE FROM incidents"
+                " WHERE status = 'closed' AND closed_at < ?",
+                (now - retention,)
+            )
+
+            self.db.execute(
+                "DELETE FROM incident_policies WHERE incident_id"
+                " NOT IN (SELECT id FROM incidents)"
+            )
+
+            self.db.commit()
@@ -1,9 +1,13 @@
 import time
+from typing import Optional
 
-from fastapi import FastAPI
-from starlette.responses import Response
+from fastapi import Body, FastAPI, HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response, StreamingResponse
 from prometheus_client import generate_latest
 
+from app.config import settings
+
 
 # -----------------------------
 # Schemas
@@ -20,6 +24,7 @@ from app.schemas.response import QueryResponse
 from app.retrieval.vector_store import VectorStore
 from app.chaos.fault_injector import FaultInjector
 from app.fallback.router import FallbackRouter
+from app.models import profiles
 
 
 # -----------------------------
@@ -27,6 +32,7 @@ from app.fallback.router import FallbackRouter
 # -----------------------------
 
 from app.quality.evaluator import QualityEvaluator
+from app.quality.pool import EvaluationPool
 
 
 # -----------------------------
@@ -34,6 +40,7 @@ from app.quality.evaluator import QualityEvaluator
 # -----------------------------
 
 from app.governance.slo import SLOEvaluator
+from app.governance.scheduler import GovernanceScheduler
 
 
 # -----------------------------
@@ -51,6 +58,14 @@ from app.incidents.manager import IncidentManager
 
 from app.replay.logger import ShadowLogger
 from app.replay.runner import ReplayRunner
+from app.replay.jobs import ReplayJobManager
+
+
+# -----------------------------
+# Config Reload
+# -----------------------------
+
+from app.reload.watcher import ConfigWatcher
 
 
 # -----------------------------
@@ -60,10 +75,12 @@ from app.replay.runner import ReplayRunner
 from app.observability.metrics import (
     REQUEST_COUNT,
     REQUEST_LATENCY,
+    REQUEST_LATENCY_BY_PROFILE,
     RETRIEVAL_LATENCY,
     HALLUCINATION_COUNT,
     QUALITY_SCORE,
 )
+from app.observability import context as request_context
 
 
 # ======================================================
@@ -88,11 +105,47 @@ fault_injector = FaultInjector(
 
 fallback_router = FallbackRouter()
 
-quality_evaluator = QualityEvaluator()
+quality_evaluator = QualityEvaluator(
+    vector_store=vector_store
+)
 
 slo_evaluator = SLOEvaluator()
 
 
+# -----------------------------
+# Background Quality Evaluation
+# -----------------------------
+
+def record_quality(quality: dict, meta: dict):
+
+    QUALITY_SCORE.observe(
+        quality["groundedness"]
+    )
+
+    labels = meta.get("labels")
+
+    slo_evaluator.record_groundedness(
+        quality["groundedness"],
+        labels=labels
+    )
+
+    if quality["hallucinated"]:
+
+        HALLUCINATION_COUNT.inc()
+
+        slo_evaluator.record_hallucination(labels=labels)
+
+
+evaluation_pool = EvaluationPool(
+    quality_evaluator,
+    record_quality,
+    before_evaluate=lambda meta: fault_injector.sleep(
+        "evaluation",
+        meta.get("chaos")
+    )
+)
+
+
 # -----------------------------
 # Policy System
 # -----------------------------
@@ -106,24 +159,84 @@ policy_engine = PolicyEngine(policy_actions)
 
 incident_manager = IncidentManager()
 
+governance_scheduler = GovernanceScheduler(
+    slo_evaluator,
+    policy_engine,
+    incident_manager
+)
+
+governance_scheduler.start()
+
+
+# -----------------------------
+# Config Hot Reload
+# -----------------------------
+
+config_watcher = ConfigWatcher({
+    fault_injector.config_path: fault_injector,
+    slo_evaluator.config_path: slo_evaluator,
+    policy_engine.config_path: policy_engine
+})
+
+if settings.CONFIG_WATCH_ENABLED:
+    config_watcher.start()
+
 
 # -----------------------------
 # Replay System
 # -----------------------------
 
-shadow_logger = ShadowLogger()
+shadow_logger = ShadowLogger(settings.SHADOW_LOG_PATH)
+
+
+def replay_pipeline(query: str, router, injector=None):
+    """
+    /query pipeline against a replay sandbox's router and injector
+    (no injector on the baseline leg). Host resource faults are
+    skipped: they would stress the live process.
+    """
+
+    request_context.begin_request("replay")
+
+    profile = profiles.current()
+
+    if injector is not None:
+
+        injector.begin_request()
+
+        injector.sleep("retrieval")
+
+        query = injector.before_retrieval(query)
+
+    chunks = vector_store.search(query, profile.top_k)["documents"]
+
+    if injector is not None:
+        chunks = injector.after_retrieval(chunks)
+
+    prompt = build_prompt(query, profile.trim_context(chunks))
+
+    if injector is not None:
+
+        injector.sleep("llm")
+
+        prompt = injector.before_llm(prompt)
+
+    answer = router.generate(prompt, profile)
 
+    if injector is not None:
+        answer = injector.after_llm(answer)
 
-def replay_client(prompt: str):
-    return fallback_router.generate(prompt)
+    return answer
 
 
 replay_runner = ReplayRunner(
-    replay_client,
-    fault_injector,
-    fallback_router
+    replay_pipeline,
+    fault_injector.config_path,
+    settings.SHADOW_LOG_PATH
 )
 
+replay_jobs = ReplayJobManager(replay_runner)
+
 
 # ======================================================
 # Endpoints
@@ -161,18 +274,100 @@ def metrics():
 @app.get("/chaos")
 def chaos_status():
     return {
-        "enabled": fault_injector.enabled,
-        "faults": fault_injector.faults
+        "enabled": fault_injector.enabled and settings.ENABLE_CHAOS,
+        "faults": fault_injector.faults,
+        "run": fault_injector.run_info(),
+        "connection_pool": fallback_router.client.pool.stats()
+    }
+
+
+@app.post("/chaos/run")
+def chaos_run(seed: Optional[int] = None, record: bool = False):
+    return fault_injector.start_run(seed=seed, record=record)
+
+
+@app.get("/chaos/recording")
+def chaos_recording():
+    return {
+        "run": fault_injector.run_info(),
+        "requests": fault_injector.recording()
     }
 
 
+@app.post("/chaos/replay")
+def chaos_replay(recording: dict = Body(...)):
+    """
+    Replay a /chaos/recording payload exactly
+    """
+
+    return fault_injector.start_run(
+        seed=recording.get("run", {}).get("seed"),
+        replay=recording.get("requests", {})
+    )
+
+
 # -----------------------------
 # SLO Status
 # -----------------------------
 
 @app.get("/slo")
-def slo_status():
-    return slo_evaluator.evaluate()
+def slo_status(
+    model: Optional[str] = None,
+    cache_hit: Optional[str] = None,
+    fault: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    profile: Optional[str] = None
+):
+
+    labels = {
+        name: value
+        for name, value in {
+            "model": model,
+            "cache_hit": cache_hit,
+            "fault": fault,
+            "endpoint": endpoint,
+            "profile": profile
+        }.items()
+        if value is not None
+    }
+
+    return slo_evaluator.evaluate(labels or None)
+
+
+@app.get("/slo/labels")
+def slo_labels():
+    return slo_evaluator.dimensions.labels()
+
+
+# -----------------------------
+# Governance Snapshot
+# -----------------------------
+
+@app.get("/governance")
+def governance_status():
+    return governance_scheduler.snapshot
+
+
+@app.get("/policies")
+def policy_status():
+    return policy_engine.status()
+
+
+@app.get("/remediations")
+def remediation_status():
+    return policy_engine.remediations.status()
+
+
+# -----------------------------
+# Quality Evaluation Status
+# -----------------------------
+
+@app.get("/quality")
+def quality_status():
+    return {
+        "evaluation": evaluation_pool.stats(),
+        "judge": quality_evaluator.judge_stats()
+    }
 
 
 # -----------------------------
@@ -180,25 +375,189 @@ def slo_status():
 # -----------------------------
 
 @app.get("/incidents")
-def list_incidents():
-    return incident_manager.list()
+def list_incidents(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    policy: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    summary: bool = True
+):
+    try:
+        return incident_manager.list(
+            limit=max(1, min(limit, 500)),
+            cursor=cursor,
+            status=status,
+            policy=policy,
+            since=since,
+            until=until,
+            summary=summary
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/incidents/{incident_id}")
+def get_incident(incident_id: str):
+
+    incident = incident_manager.get(incident_id)
+
+    if incident is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
+
+    return incident
+
+
+# -----------------------------
+# Config Reload
+# -----------------------------
+
+@app.post("/config/reload")
+def reload_config():
+    return {"results": config_watcher.reload_all()}
+
+
+@app.get("/config/reload")
+def reload_status():
+    return config_watcher.last_results
 
 
 # -----------------------------
 # Replay
 # -----------------------------
 
+def _replay_options(workers, rate):
+
+    try:
+        return replay_runner.options(workers, rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/replay")
-def run_replay():
-    return replay_runner.run()
+def run_replay(
+    workers: Optional[int] = None,
+    rate: Optional[float] = None
+):
+    return replay_runner.run(*_replay_options(workers, rate))
+
+
+def _replay_job(job_id: str) -> dict:
+
+    job = replay_jobs.get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Replay job not found")
+
+    return job
+
+
+@app.post("/replay/jobs")
+def start_replay_job(
+    workers: Optional[int] = None,
+    rate: Optional[float] = None
+):
+    workers, rate = _replay_options(workers, rate)
+
+    try:
+        return replay_jobs.start(workers, rate)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.get("/replay/jobs")
+def list_replay_jobs():
+    return replay_jobs.list()
+
+
+@app.get("/replay/jobs/{job_id}")
+def replay_job_status(job_id: str):
+    return _replay_job(job_id)
+
+
+@app.post("/replay/jobs/{job_id}/cancel")
+def cancel_replay_job(job_id: str):
+
+    _replay_job(job_id)
+
+    return replay_jobs.cancel(job_id)
+
+
+@app.post("/replay/jobs/{job_id}/resume")
+def resume_replay_job(job_id: str):
+
+    _replay_job(job_id)
+
+    try:
+        return replay_jobs.resume(job_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.get("/replay/jobs/{job_id}/results")
+def replay_job_results(job_id: str):
+    """
+    NDJSON, one comparison per line in input order
+    """
+
+    _replay_job(job_id)
+
+    return StreamingResponse(
+        replay_jobs.results(job_id),
+        media_type="application/x-ndjson"
+    )
 
 
 # ======================================================
 # Main Query Pipeline
 # ======================================================
 
+def build_prompt(query: str, chunks) -> str:
+
+    context = "\n".join(chunks)
+
+    return f"""
+You are a reliable AI assistant.
+
+Answer ONLY using the provided context.
+If the answer is not in the context, say "I don't know".
+
+Question:
+{query}
+
+Context:
+{context}
+"""
+
+
+def retrieve(query: str, profile):
+    """
+    Retrieval on a worker thread (host resource faults included)
+    """
+
+    fault_injector.resource_faults("retrieval")
+
+    if profile.rerank:
+
+        return vector_store.search_reranked(
+            query,
+            profile.top_k,
+            settings.RERANK_CANDIDATES
+        )
+
+    return vector_store.search(query, profile.top_k)
+
+
+def generate(prompt: str, profile):
+
+    fault_injector.resource_faults("llm")
+
+    return fallback_router.generate(prompt, profile)
+
+
 @app.post("/query", response_model=QueryResponse)
-def query_llm(request: QueryRequest):
+async def query_llm(request: QueryRequest, response: Response):
 
     # --------------------------------
     # Request Tracking
@@ -206,7 +565,17 @@ def query_llm(request: QueryRequest):
 
     REQUEST_COUNT.inc()
 
-    slo_evaluator.record_request(success=True)
+    request_context.begin_request("query")
+
+    # Per-request chaos RNG / recording / replay
+    request_id = fault_injector.begin_request(request.request_id)
+
+    # Generation budget (safe mode sheds tokens, context, judge)
+    profile = profiles.current()
+
+    request_context.set_label("profile", profile.name)
+
+    success = True
 
     start_total = time.time()
 
@@ -216,21 +585,33 @@ def query_llm(request: QueryRequest):
 
     start_retrieval = time.time()
 
-    # Chaos before retrieval
+    # Chaos before retrieval (non-blocking latency)
+    await fault_injector.delay("retrieval")
+
     query = fault_injector.before_retrieval(
         request.query
     )
 
-    # Shadow traffic logging
-    shadow_logger.log(query)
+    # Shadow traffic logging (file append: off the event loop)
+    await run_in_threadpool(shadow_logger.log, query)
 
-    chunks = vector_store.query(query)
+    retrieved = await run_in_threadpool(
+        retrieve,
+        query,
+        profile
+    )
+
+    chunk_ids = dict(
+        zip(retrieved["documents"], retrieved["ids"])
+    )
 
     # Chaos after retrieval
     chunks = fault_injector.after_retrieval(
-        chunks
+        retrieved["documents"]
     )
 
+    chunks = profile.trim_context(chunks)
+
     retrieval_latency = time.time() - start_retrieval
 
     RETRIEVAL_LATENCY.observe(
@@ -241,20 +622,7 @@ def query_llm(request: QueryRequest):
     # Prompt Construction
     # --------------------------------
 
-    context = "\n".join(chunks)
-
-    prompt = f"""
-You are a reliable AI assistant.
-
-Answer ONLY using the provided context.
-If the answer is not in the context, say "I don't know".
-
-Question:
-{query}
-
-Context:
-{context}
-"""
+    prompt = build_prompt(query, chunks)
 
     # Chaos before LLM
     prompt = fault_injector.before_llm(
@@ -265,10 +633,16 @@ Context:
     # Generation Phase
     # --------------------------------
 
+    start_generation = time.time()
+
     try:
 
-        answer = fallback_router.generate(
-            prompt
+        await fault_injector.delay("llm")
+
+        answer = await run_in_threadpool(
+            generate,
+            prompt,
+            profile
         )
 
         # Chaos after LLM
@@ -278,10 +652,7 @@ Context:
 
     except Exception as e:
 
-        # Failure record
-        slo_evaluator.record_request(
-            success=False
-        )
+        success = False
 
         answer = (
             "System temporarily unavailable. "
@@ -290,29 +661,35 @@ Context:
 
         print(f"[PIPELINE ERROR] {e}")
 
-    # --------------------------------
-    # Quality Evaluation
-    # --------------------------------
+    generation_latency = time.time() - start_generation
 
-    quality = quality_evaluator.evaluate(
-        answer=answer,
-        context_chunks=chunks,
-        question=query
-    )
+    # Labels filled in by the router / fault injector
+    labels = request_context.labels()
 
-    QUALITY_SCORE.observe(
-        quality["groundedness"]
+    slo_evaluator.record_request(
+        success=success,
+        labels=labels
     )
 
-    slo_evaluator.record_groundedness(
-        quality["groundedness"]
-    )
+    if request_context.fallback_used():
 
-    if quality["hallucinated"]:
+        slo_evaluator.record_fallback(labels=labels)
 
-        HALLUCINATION_COUNT.inc()
+    # --------------------------------
+    # Quality Evaluation (background)
+    # --------------------------------
 
-        slo_evaluator.record_hallucination()
+    evaluation_pool.submit(
+        meta={
+            "labels": labels,
+            "chaos": request_context.get("chaos")
+        },
+        answer=answer,
+        context_chunks=chunks,
+        question=query,
+        context_ids=[chunk_ids.get(c) for c in chunks],
+        judge=profile.judge
+    )
 
     # --------------------------------
     # Latency
@@ -324,33 +701,49 @@ Context:
         total_latency
     )
 
-    slo_evaluator.record_latency(
+    REQUEST_LATENCY_BY_PROFILE.labels(profile.name).observe(
         total_latency
     )
 
+    slo_evaluator.record_latency(
+        total_latency,
+        labels=labels
+    )
+
     # --------------------------------
-    # Policy Evaluation
+    # Policy Evaluation (background)
     # --------------------------------
 
-    slo_state = slo_evaluator.evaluate()
-
-    applied_policies = policy_engine.evaluate(
-        slo_state
+    governance_scheduler.notify(
+        failure=not success
     )
 
-    if applied_policies:
-
-        incident_manager.create(
-            slo_state,
-            applied_policies
-        )
-
     # --------------------------------
     # Response
     # --------------------------------
 
+    # Per-stage timings for load tests / browser devtools
+    response.headers["Server-Timing"] = ", ".join(
+        f"{name};dur={seconds * 1000:.1f}"
+        for name, seconds in (
+            ("retrieval", retrieval_latency),
+            ("generation", generation_latency),
+            ("total", total_latency),
+        )
+    )
+
+    if not success:
+        response.headers["X-Outcome"] = "error"
+    elif request_context.fallback_used():
+        response.headers["X-Outcome"] = "fallback"
+    else:
+        response.headers["X-Outcome"] = "ok"
+
     return QueryResponse(
         answer=answer,
         retrieved_chunks=chunks,
-        model_used="primary_or_secondary"
+        model_used=request_context.get(
+            "model_name"
+        ) or labels["model"],
+        request_id=request_id
     )
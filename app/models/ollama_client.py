@@ -1,12 +1,97 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
 import requests
+from requests.adapters import HTTPAdapter
+
 from app.config import settings
+from app.observability import context as request_context
+
+
+class ConnectionPool:
+    """
+    Bounded, shared pool of HTTP connections to Ollama
+    """
+
+    def __init__(self, size, timeout):
+
+        self.size = size
+        self.timeout = timeout
+
+        self._slots = threading.BoundedSemaphore(size)
+
+        self._held = 0
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @contextmanager
+    def connection(self):
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise RuntimeError("Ollama connection pool exhausted")
+
+        try:
+            yield self.session
+        finally:
+            self._slots.release()
+
+    def exhaust(self, slots: int, seconds: float) -> int:
+        """
+        Chaos: hold up to `slots` free connections for `seconds`
+        (released by a timer, no thread is parked)
+        """
+
+        taken = 0
+
+        for _ in range(min(slots, self.size)):
+
+            if not self._slots.acquire(blocking=False):
+                break
+
+            taken += 1
+
+        with self._lock:
+            self._held += taken
+
+        def release():
+
+            with self._lock:
+                self._held -= taken
+
+            for _ in range(taken):
+                self._slots.release()
+
+        timer = threading.Timer(seconds, release)
+        timer.daemon = True
+        timer.start()
+
+        return taken
+
+    def stats(self) -> dict:
+
+        return {"size": self.size, "held_by_chaos": self._held}
+
+
+connection_pool = ConnectionPool(
+    settings.OLLAMA_MAX_CONNECTIONS,
+    settings.OLLAMA_POOL_TIMEOUT
+)
 
 
 class OllamaClient:
     def __init__(self):
         self.base_url = settings.OLLAMA_BASE_URL
+        self.pool = connection_pool
 
-    def generate(self, model: str, prompt: str) -> str:
+    def generate(self, model: str, prompt: str, options: dict = None) -> str:
         url = f"{self.base_url}/api/generate"
         payload = {
             "model": model,
@@ -14,10 +99,44 @@ class OllamaClient:
             "stream": False
         }
 
+        if options:
+            payload["options"] = options
+
+        # Chaos: slow-drip token stream (seconds per chunk)
+        token_delay = request_context.get("token_delay")
+
         try:
-            response = requests.post(url, json=payload, timeout=120)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("response", "")
+            with self.pool.connection() as session:
+
+                if token_delay:
+                    return self._stream(session, url, payload, token_delay)
+
+                response = session.post(url, json=payload, timeout=120)
+                response.raise_for_status()
+                data = response.json()
+                return data.get("response", "")
         except Exception as e:
             raise RuntimeError(f"Ollama generation failed: {e}")
+
+    def _stream(self, session, url, payload, token_delay):
+        payload = dict(payload, stream=True)
+
+        parts = []
+
+        with session.post(url, json=payload, stream=True, timeout=120) as response:
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+
+                data = json.loads(line)
+                parts.append(data.get("response", ""))
+
+                # Connection stays checked out while the stream drips
+                time.sleep(token_delay)
+
+                if data.get("done"):
+                    break
+
+        return "".join(parts)
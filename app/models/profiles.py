@@ -0,0 +1,100 @@
+from app.config import settings
+
+
+class GenerationProfile:
+    """
+    Per-request generation budget (model, tokens, context, judge)
+    """
+
+    def __init__(
+        self,
+        name,
+        num_predict,
+        temperature,
+        top_k,
+        context_chars,
+        judge=True,
+        model=None,
+        rerank=False
+    ):
+
+        self.name = name
+        self.num_predict = num_predict
+        self.temperature = temperature
+        self.top_k = top_k
+        self.context_chars = context_chars
+        self.judge = judge
+
+        # None = router default model
+        self.model = model or None
+
+        self.rerank = rerank
+
+    def options(self) -> dict:
+        """
+        Ollama generation options
+        """
+
+        return {
+            "num_predict": self.num_predict,
+            "temperature": self.temperature
+        }
+
+    def trim_context(self, chunks: list) -> list:
+        """
+        Keep whole chunks (in rank order) within the context budget;
+        a first chunk over the budget is truncated rather than dropped
+        """
+
+        kept = []
+
+        used = 0
+
+        for chunk in chunks[:self.top_k]:
+
+            if kept and used + len(chunk) > self.context_chars:
+                break
+
+            kept.append(chunk[:self.context_chars - used])
+
+            used += len(kept[-1])
+
+        return kept
+
+
+# ----------------------------------
+# Active Profile
+# ----------------------------------
+
+def current() -> GenerationProfile:
+    """
+    Profile for a new request, derived from the live
+    (policy-controlled) settings
+    """
+
+    temperature = settings.DEFAULT_TEMPERATURE
+
+    if settings.REDUCED_TEMPERATURE:
+        temperature = min(temperature, settings.SAFE_MODE_TEMPERATURE)
+
+    if not settings.DEGRADED_MODE:
+
+        return GenerationProfile(
+            "normal",
+            num_predict=settings.MAX_TOKENS,
+            temperature=temperature,
+            top_k=settings.TOP_K,
+            context_chars=settings.CONTEXT_CHARS,
+            rerank=settings.RERANK_RETRIEVAL
+        )
+
+    return GenerationProfile(
+        "safe",
+        num_predict=settings.SAFE_MODE_MAX_TOKENS,
+        temperature=min(temperature, settings.SAFE_MODE_TEMPERATURE),
+        top_k=min(settings.TOP_K, settings.SAFE_MODE_TOP_K),
+        context_chars=settings.SAFE_MODE_CONTEXT_CHARS,
+        judge=settings.SAFE_MODE_JUDGE,
+        model=settings.SAFE_MODE_MODEL,
+        rerank=settings.RERANK_RETRIEVAL
+    )
@@ -0,0 +1,358 @@
+"""
+Lightweight stand-in for Ollama's /api/generate, for benchmarks
+and CI without a GPU.
+
+    python -m app.models.stub_server --port 11434 \
+        --profiles benchmarks/stub_profiles.yaml
+
+then point the app at it with OLLAMA_BASE_URL=http://localhost:11434.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+
+from app.chaos import distributions
+
+
+DEFAULT_PROFILE = {
+    # Time to first token
+    "latency": {"type": "lognormal", "median_ms": 300, "sigma": 0.4},
+    "tokens_per_second": 50,
+    "tokens": 64,
+    "error_rate": 0.0,
+    # Requests generating at once; the rest wait in a queue
+    "max_concurrency": 4,
+    "max_queue": 64,
+    # First request per model (and after unload_after_s idle)
+    "cold_load_ms": 0,
+    "unload_after_s": 300,
+}
+
+WORDS = (
+    "chaos engineering improves reliability by testing failure "
+    "modes in controlled experiments before they reach users"
+).split()
+
+
+class ModelState:
+    """
+    Runtime state of one stub model (slots, queue, warm/cold)
+    """
+
+    def __init__(self, profile):
+
+        self.profile = profile
+
+        self.slots = threading.Semaphore(profile["max_concurrency"])
+
+        self.waiting = 0
+        self.loaded_at = None
+        self.last_used = 0.0
+
+        self.lock = threading.Lock()
+
+
+class StubOllama:
+    """
+    Per-model performance profiles and request accounting
+    """
+
+    def __init__(self, profiles: dict = None, seed=None):
+
+        profiles = profiles or {}
+
+        self.default = dict(DEFAULT_PROFILE, **profiles.get("default", {}))
+
+        self.overrides = profiles.get("models", {})
+
+        for profile in [self.default, *self.overrides.values()]:
+
+            if "latency" in profile:
+                distributions.validate(profile["latency"])
+
+        self.models = {}
+
+        self.rng = random.Random(seed)
+
+        self._lock = threading.Lock()
+
+        self.counts = {"requests": 0, "errors": 0, "rejected": 0}
+
+    def model(self, name) -> ModelState:
+
+        with self._lock:
+
+            if name not in self.models:
+
+                self.models[name] = ModelState(
+                    dict(self.default, **self.overrides.get(name, {}))
+                )
+
+            return self.models[name]
+
+    def count(self, name):
+
+        with self._lock:
+            self.counts[name] += 1
+
+    def sample(self, spec):
+
+        with self._lock:
+            return distributions.sample_ms(spec, self.rng)
+
+    def fails(self, rate) -> bool:
+
+        with self._lock:
+            return self.rng.random() < rate
+
+
+# ----------------------------------
+# HTTP Handler
+# ----------------------------------
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    stub = None
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status, body):
+
+        data = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+
+        if self.path == "/api/tags":
+
+            return self._json(200, {
+                "models": [{"name": n} for n in self.stub.models]
+            })
+
+        if self.path == "/stub/stats":
+            return self._json(200, self.stub.counts)
+
+        self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+
+        if self.path != "/api/generate":
+            return self._json(404, {"error": "not found"})
+
+        length = int(self.headers.get("Content-Length", 0))
+
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": "invalid json"})
+
+        stub = self.stub
+
+        stub.count("requests")
+
+        name = payload.get("model", "default")
+
+        model = stub.model(name)
+
+        profile = model.profile
+
+        # Queue like Ollama: bounded waiters, then 503
+        with model.lock:
+
+            if model.waiting >= profile["max_queue"]:
+
+                stub.count("rejected")
+
+                return self._json(503, {"error": "server busy"})
+
+            model.waiting += 1
+
+        model.slots.acquire()
+
+        with model.lock:
+            model.waiting -= 1
+
+        try:
+            self._generate(name, model, payload)
+        finally:
+            model.last_used = time.time()
+            model.slots.release()
+
+    def _generate(self, name, model, payload):
+
+        stub = self.stub
+        profile = model.profile
+
+        start = time.time()
+
+        # Cold load on first use / after idling
+        with model.lock:
+
+            cold = (
+                model.loaded_at is None
+                or start - model.last_used > profile["unload_after_s"]
+            )
+
+            if cold:
+                model.loaded_at = start
+
+        if cold and profile["cold_load_ms"]:
+            time.sleep(profile["cold_load_ms"] / 1000)
+
+        if stub.fails(profile["error_rate"]):
+
+            stub.count("errors")
+
+            return self._json(500, {"error": "stub: injected failure"})
+
+        time.sleep(stub.sample(profile["latency"]) / 1000)
+
+        options = payload.get("options") or {}
+
+        tokens = min(
+            profile["tokens"],
+            options.get("num_predict") or profile["tokens"]
+        )
+
+        per_token = 1.0 / profile["tokens_per_second"]
+
+        words = [WORDS[i % len(WORDS)] + " " for i in range(tokens)]
+
+        if not payload.get("stream", True):
+
+            time.sleep(per_token * tokens)
+
+            return self._json(200, {
+                "model": name,
+                "response": "".join(words),
+                "done": True,
+                "eval_count": tokens,
+                "total_duration": int((time.time() - start) * 1e9)
+            })
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        for word in words:
+
+            time.sleep(per_token)
+
+            self._chunk({"model": name, "response": word, "done": False})
+
+        self._chunk({
+            "model": name,
+            "response": "",
+            "done": True,
+            "eval_count": tokens,
+            "total_duration": int((time.time() - start) * 1e9)
+        })
+
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, body):
+
+        data = json.dumps(body).encode() + b"\n"
+
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+# ----------------------------------
+# Server
+# ----------------------------------
+
+class StubOllamaServer:
+    """
+    Threaded stub server; start() runs it in the background
+    """
+
+    def __init__(self, profiles=None, host="127.0.0.1", port=0, seed=None):
+
+        self.stub = StubOllama(profiles, seed)
+
+        handler = type("Handler", (StubHandler,), {"stub": self.stub})
+
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+
+        self.httpd.daemon_threads = True
+
+        self._thread = None
+
+    @property
+    def url(self):
+
+        host, port = self.httpd.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    def start(self):
+
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            name="stub-ollama",
+            daemon=True
+        )
+
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def load_profiles(path):
+
+    if not path:
+        return {}
+
+    with open(path, "r") as f:
+        return yaml.safe_load(f) or {}
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--profiles", default="benchmarks/stub_profiles.yaml")
+    parser.add_argument("--seed", type=int, default=None)
+
+    args = parser.parse_args(argv)
+
+    server = StubOllamaServer(
+        load_profiles(args.profiles),
+        args.host,
+        args.port,
+        args.seed
+    )
+
+    print(f"[STUB] Ollama stub listening on {server.url}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import contextvars
+
+
+# Per-request routing / chaos dimensions, filled in by the
+# router and fault injector while the request runs
+_request = contextvars.ContextVar("request_context", default=None)
+
+
+def begin_request(endpoint: str) -> dict:
+
+    state = {
+        "endpoint": endpoint,
+        "model": "none",
+        "model_name": None,
+        "profile": "normal",
+        "cache_hit": False,
+        "fallback": False,
+        "faults": []
+    }
+
+    _request.set(state)
+
+    return state
+
+
+def set_label(name: str, value):
+
+    state = _request.get()
+
+    if state is not None:
+        state[name] = value
+
+
+def add_fault(name: str):
+
+    state = _request.get()
+
+    if state is not None and name not in state["faults"]:
+        state["faults"].append(name)
+
+
+def get(name: str, default=None):
+
+    state = _request.get()
+
+    if state is None:
+        return default
+
+    return state.get(name, default)
+
+
+def fallback_used() -> bool:
+
+    state = _request.get()
+
+    return bool(state and state["fallback"])
+
+
+def labels() -> dict:
+    """
+    SLO label set for the current request
+    """
+
+    state = _request.get()
+
+    if state is None:
+        return {}
+
+    return {
+        "endpoint": state["endpoint"],
+        "model": state["model"],
+        "profile": state["profile"],
+        "cache_hit": str(state["cache_hit"]).lower(),
+        "fault": "+".join(sorted(state["faults"])) or "none"
+    }
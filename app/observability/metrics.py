@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 
 REQUEST_COUNT = Counter(
@@ -41,3 +41,118 @@ QUALITY_SCORE = Histogram(
     "llm_groundedness_score",
     "Groundedness score distribution"
 )
+
+EVALUATION_LAG = Histogram(
+    "llm_evaluation_lag_seconds",
+    "Delay between answer and completed quality evaluation"
+)
+
+EVALUATION_LATENCY = Histogram(
+    "llm_evaluation_seconds",
+    "Quality evaluation time per answer (excluding queueing)"
+)
+
+EVALUATION_QUEUE_DEPTH = Gauge(
+    "llm_evaluation_queue_depth",
+    "Pending background quality evaluations"
+)
+
+EVALUATION_DROPPED = Counter(
+    "llm_evaluation_dropped_total",
+    "Quality evaluations shed by backpressure",
+    ["reason"]
+)
+
+JUDGE_DECISIONS = Counter(
+    "llm_judge_decisions_total",
+    "LLM-as-judge routing decisions",
+    ["decision"]
+)
+
+JUDGE_AGREEMENT = Counter(
+    "llm_judge_agreement_total",
+    "Agreement between groundedness and judge verdicts",
+    ["outcome"]
+)
+
+JUDGE_CACHE_REQUESTS = Counter(
+    "llm_judge_cache_requests_total",
+    "Judge verdict cache lookups",
+    ["result"]
+)
+
+SLO_BURN_RATE = Gauge(
+    "slo_burn_rate",
+    "Error budget burn rate per SLO and window",
+    ["slo", "window"]
+)
+
+SLO_ERROR_BUDGET_REMAINING = Gauge(
+    "slo_error_budget_remaining",
+    "Fraction of the error budget left in the SLO window",
+    ["slo"]
+)
+
+GOVERNANCE_EVAL_LATENCY = Histogram(
+    "governance_evaluation_seconds",
+    "Duration of one background SLO/policy evaluation tick"
+)
+
+GOVERNANCE_TICKS = Counter(
+    "governance_ticks_total",
+    "Background governance evaluations",
+    ["trigger"]
+)
+
+POLICY_EVAL_LATENCY = Histogram(
+    "policy_evaluation_seconds",
+    "Rule evaluation time per governance tick"
+)
+
+REMEDIATION_EVENTS = Counter(
+    "remediation_events_total",
+    "Remediation lifecycle events",
+    ["action", "event"]
+)
+
+GENERATION_LATENCY = Histogram(
+    "generation_latency_seconds",
+    "LLM call latency per generation profile",
+    ["profile"]
+)
+
+REQUEST_LATENCY_BY_PROFILE = Histogram(
+    "request_latency_by_profile_seconds",
+    "End-to-end request latency per generation profile",
+    ["profile"]
+)
+
+INCIDENT_EVENTS = Counter(
+    "incident_events_total",
+    "Incident lifecycle events",
+    ["event"]
+)
+
+POSTMORTEMS = Counter(
+    "postmortems_total",
+    "Background postmortem generations",
+    ["result"]
+)
+
+CONFIG_RELOAD_LATENCY = Histogram(
+    "config_reload_seconds",
+    "Config parse + validate + swap time",
+    ["config"]
+)
+
+CONFIG_RELOADS = Counter(
+    "config_reloads_total",
+    "Config reload attempts",
+    ["config", "result"]
+)
+
+CHAOS_INJECTED_DELAY = Histogram(
+    "chaos_injected_delay_seconds",
+    "Injected latency per pipeline stage",
+    ["stage"]
+)
@@ -15,6 +15,8 @@ class PolicyActions:
         self.chaos = chaos_engine
         self.router = router
 
+        self._chaos_enabled = None
+
     # -----------------------------
 
     def enable_safe_mode(self):
@@ -31,28 +33,86 @@ class PolicyActions:
 
     def reduce_chaos(self):
 
+        if self._chaos_enabled is None:
+            self._chaos_enabled = self.chaos.enabled
+
         self.chaos.enabled = False
 
         print("[POLICY] Chaos disabled")
 
+    def restore_chaos(self):
+
+        if self._chaos_enabled is not None:
+            self.chaos.enabled = self._chaos_enabled
+
+        self._chaos_enabled = None
+
+        print("[POLICY] Chaos restored")
+
     def prefer_cache(self):
 
         self.router.prefer_cache()
 
         print("[POLICY] Prefer cache mode")
 
+    def normal_mode(self):
+
+        self.router.normal_mode()
+
+        print("[POLICY] Normal routing mode")
+
+    def probe_uncached(self, fraction):
+
+        self.router.probe_uncached(fraction)
+
+    def increase_fallback(self):
+
+        self.router.fast_fallback()
+
+        print("[POLICY] Fast fallback enabled")
+
+    def normal_fallback(self):
+
+        self.router.normal_fallback()
+
+        print("[POLICY] Normal fallback restored")
+
     def reduce_temperature(self):
 
-        # Placeholder for Phase 7
-        print("[POLICY] Reduce temperature")
+        settings.REDUCED_TEMPERATURE = True
+
+        print("[POLICY] Temperature reduced")
+
+    def restore_temperature(self):
+
+        settings.REDUCED_TEMPERATURE = False
+
+        print("[POLICY] Temperature restored")
 
     def rerank_retrieval(self):
 
-        # Placeholder for Phase 7
-        print("[POLICY] Rerank retrieval")
+        settings.RERANK_RETRIEVAL = True
+
+        print("[POLICY] Retrieval reranking enabled")
+
+    def normal_retrieval(self):
+
+        settings.RERANK_RETRIEVAL = False
+
+        print("[POLICY] Retrieval reranking disabled")
 
     def disable_primary_model(self):
 
         self.router.disable_primary()
 
         print("[POLICY] Primary model disabled")
+
+    def enable_primary_model(self):
+
+        self.router.enable_primary()
+
+        print("[POLICY] Primary model enabled")
+
+    def probe_primary_model(self, fraction):
+
+        self.router.probe_primary(fraction)
@@ -1,9 +1,17 @@
+import time
+
 import yaml
 
+from app.policy.rules import CompiledRule
+from app.policy.remediation import RemediationManager
+
+from app.observability.metrics import POLICY_EVAL_LATENCY
+
 
 class PolicyEngine:
     """
     Evaluates governance state and applies remediation
+    (rules compiled once, actions fire on state transitions)
     """
 
     def __init__(
@@ -16,51 +24,118 @@ class PolicyEngine:
 
         self.config_path = config_path
 
-        self.policies = self._load()
+        self.config = {}
+
+        self.policies = []
+
+        self.rules = []
+
+        self.remediations = RemediationManager(actions)
+
+        self.last_eval_seconds = 0.0
+
+        self.apply_config(self._load())
 
     # -----------------------------
 
     def _load(self):
 
         with open(self.config_path, "r") as f:
-            data = yaml.safe_load(f)
+            return yaml.safe_load(f) or {}
+
+    def apply_config(self, config: dict):
+        """
+        Compile and validate a parsed config, then swap it in;
+        rules keep their runtime state across reloads by name
+        """
+
+        policies = config.get("policies", [])
+
+        try:
+            rules = [CompiledRule(policy) for policy in policies]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid policy: {e}")
+
+        names = [rule.name for rule in rules]
+
+        if len(names) != len(set(names)):
+            raise ValueError("Duplicate policy names")
+
+        for rule in rules:
 
-        return data.get("policies", [])
+            for action in rule.actions + rule.on_clear:
+
+                if not hasattr(self.actions, action):
+                    raise ValueError(f"{rule.name}: unknown action {action}")
+
+        remediations = self.remediations.parse(
+            config.get("remediations", {})
+        )
+
+        previous = {rule.name: rule for rule in self.rules}
+
+        for rule in rules:
+
+            if rule.name in previous:
+                rule.restore(previous[rule.name])
+
+        self.remediations.configure(remediations)
+
+        self.rules = rules
+        self.policies = policies
+        self.config = config
 
     # -----------------------------
 
-    def evaluate(self, slo_state: dict):
+    def evaluate(self, slo_state: dict, now=None):
+        """
+        Returns the policies that fired on this evaluation
+        """
+
+        now = time.time() if now is None else now
+
+        start = time.perf_counter()
 
         applied = []
 
-        for policy in self.policies:
+        for rule in self.rules:
 
-            name = policy["name"]
+            transition = rule.step(slo_state, now)
 
-            condition = policy["condition"]
+            if transition == "fired":
 
-            actions = policy["actions"]
+                for action in rule.actions:
+                    self.remediations.apply(action, rule.name, now)
 
-            if self._match(condition, slo_state):
+                applied.append(rule.name)
 
-                for action in actions:
+            elif transition == "cleared":
 
+                for action in rule.on_clear:
                     self._execute(action)
 
-                applied.append(name)
+        self.remediations.tick(now, self.active())
 
-        return applied
+        self.last_eval_seconds = time.perf_counter() - start
 
-    # -----------------------------
+        POLICY_EVAL_LATENCY.observe(self.last_eval_seconds)
+
+        return applied
 
-    def _match(self, condition, state):
+    def active(self):
 
-        for key, val in condition.items():
+        return [
+            rule.name for rule in self.rules
+            if rule.active
+        ]
 
-            if state.get(key) != val:
-                return False
+    def status(self):
 
-        return True
+        return {
+            "rules": [rule.status() for rule in self.rules],
+            "remediations": self.remediations.status(),
+            "last_eval_seconds": self.last_eval_seconds
+        }
 
     # -----------------------------
 
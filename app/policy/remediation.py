@@ -0,0 +1,252 @@
+import threading
+import time
+
+from app.governance.error_budget import parse_duration
+
+from app.observability.metrics import REMEDIATION_EVENTS
+
+
+class RemediationManager:
+    """
+    Time-bounded remediations: every applied action carries a TTL
+    and a paired revert, optionally preceded by a recovery probe
+    that hands traffic back in steps (e.g. 10% -> 50% -> 100%).
+    max_ttl caps extensions, so a policy that never clears cannot
+    keep a remediation in place forever.
+    """
+
+    def __init__(self, actions, config: dict = None):
+
+        self.actions = actions
+
+        self.probe_steps = []
+        self.probe_interval = 60.0
+
+        self.specs = {}
+
+        # action -> live remediation entry
+        self.active = {}
+
+        self._lock = threading.Lock()
+
+        self.configure(self.parse(config or {}))
+
+    # --------------------------------
+    # Config
+    # --------------------------------
+
+    def parse(self, config: dict) -> tuple:
+        """
+        Validate a remediations section -> (steps, interval, specs)
+        """
+
+        probe = config.get("probe", {})
+
+        steps = [float(step) for step in probe.get("steps", [0.1, 0.5, 1.0])]
+
+        if any(not 0.0 < step <= 1.0 for step in steps):
+            raise ValueError("probe steps must be in (0, 1]")
+
+        interval = parse_duration(probe.get("interval", "1m"))
+
+        default_ttl = config.get("default_ttl", "5m")
+        default_max_ttl = config.get("default_max_ttl", "1h")
+
+        specs = {}
+
+        for name, spec in config.get("actions", {}).items():
+
+            specs[name] = {
+                "revert": spec.get("revert"),
+                "ttl": parse_duration(spec.get("ttl", default_ttl)),
+                "max_ttl": parse_duration(
+                    spec.get("max_ttl", default_max_ttl)
+                ),
+                "probe": spec.get("probe")
+            }
+
+            if specs[name]["max_ttl"] < specs[name]["ttl"]:
+                raise ValueError(f"{name}: max_ttl is shorter than ttl")
+
+            for method in (name, spec.get("revert"), spec.get("probe")):
+
+                if method and not hasattr(self.actions, method):
+                    raise ValueError(f"{name}: unknown action {method}")
+
+        return steps, interval, specs
+
+    def configure(self, parsed: tuple):
+
+        steps, interval, specs = parsed
+
+        with self._lock:
+
+            # Live remediations keep the spec they were applied with
+            for action in self.active:
+                specs.setdefault(action, self.specs[action])
+
+            self.probe_steps = steps
+            self.probe_interval = interval
+            self.specs = specs
+
+    # --------------------------------
+
+    def _call(self, name, *args):
+
+        method = getattr(self.actions, name, None)
+
+        if method is None:
+            print(f"[REMEDIATION] Unknown action: {name}")
+            return
+
+        method(*args)
+
+    # --------------------------------
+    # Apply
+    # --------------------------------
+
+    def apply(self, action, policy=None, now=None):
+
+        now = time.time() if now is None else now
+
+        spec = self.specs.get(action)
+
+        self._call(action)
+
+        if spec is None:
+            return
+
+        with self._lock:
+
+            entry = self.active.get(action)
+
+            if entry is None:
+
+                entry = {
+                    "action": action,
+                    "policies": set(),
+                    "applied_at": now
+                }
+
+                self.active[action] = entry
+
+            # Re-applying restarts the TTL and aborts any probe
+            entry.update({
+                "state": "active",
+                "expires_at": now + spec["ttl"],
+                "probe_step": None,
+                "next_step_at": None
+            })
+
+            if policy:
+                entry["policies"].add(policy)
+
+        REMEDIATION_EVENTS.labels(action, "applied").inc()
+
+    # --------------------------------
+    # Expiry / Recovery Probe
+    # --------------------------------
+
+    def tick(self, now=None, active_policies=()):
+        """
+        Advance TTLs and probes; remediations still backed by an
+        active policy are extended instead of reverted, up to
+        max_ttl after they were first applied
+        """
+
+        now = time.time() if now is None else now
+
+        active_policies = set(active_policies)
+
+        with self._lock:
+
+            for action, entry in list(self.active.items()):
+
+                spec = self.specs[action]
+
+                if entry["state"] == "active":
+
+                    if now < entry["expires_at"]:
+                        continue
+
+                    deadline = entry["applied_at"] + spec["max_ttl"]
+
+                    if (
+                        entry["policies"] & active_policies
+                        and now < deadline
+                    ):
+
+                        entry["expires_at"] = min(now + spec["ttl"], deadline)
+
+                        REMEDIATION_EVENTS.labels(action, "extended").inc()
+
+                        continue
+
+                    if spec["probe"] and self.probe_steps:
+
+                        entry["state"] = "probing"
+                        entry["probe_step"] = -1
+                        entry["next_step_at"] = now
+
+                    else:
+
+                        self._revert(action)
+
+                        continue
+
+                if now < entry["next_step_at"]:
+                    continue
+
+                entry["probe_step"] += 1
+
+                step = entry["probe_step"]
+
+                if (
+                    step >= len(self.probe_steps)
+                    or self.probe_steps[step] >= 1.0
+                ):
+
+                    self._revert(action)
+
+                    continue
+
+                self._call(spec["probe"], self.probe_steps[step])
+
+                entry["next_step_at"] = now + self.probe_interval
+
+                REMEDIATION_EVENTS.labels(action, "probe").inc()
+
+    def _revert(self, action):
+
+        revert = self.specs[action]["revert"]
+
+        if revert:
+            self._call(revert)
+
+        del self.active[action]
+
+        REMEDIATION_EVENTS.labels(action, "reverted").inc()
+
+    # --------------------------------
+
+    def status(self) -> list:
+
+        with self._lock:
+
+            return [
+                {
+                    "action": entry["action"],
+                    "state": entry["state"],
+                    "policies": sorted(entry["policies"]),
+                    "applied_at": entry["applied_at"],
+                    "expires_at": entry["expires_at"],
+                    "traffic": (
+                        self.probe_steps[entry["probe_step"]]
+                        if entry["state"] == "probing"
+                        and entry["probe_step"] >= 0 else 0.0
+                    ),
+                    "next_step_at": entry["next_step_at"],
+                    "revert": self.specs[entry["action"]]["revert"]
+                }
+                for entry in self.active.values()
+            ]
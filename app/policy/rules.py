@@ -0,0 +1,216 @@
+import operator
+import re
+
+import yaml
+
+from app.governance.error_budget import parse_duration
+
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+EXPRESSION = re.compile(
+    r"^\s*([\w.]+)\s*(==|!=|>=|<=|>|<)\s*(.+?)\s*$"
+)
+
+
+# ----------------------------------
+# Condition Compilation
+# ----------------------------------
+
+def _lookup(path):
+
+    keys = path.split(".")
+
+    def get(state):
+
+        for key in keys:
+
+            if not isinstance(state, dict) or key not in state:
+                return None
+
+            state = state[key]
+
+        return state
+
+    return get
+
+
+def _comparison(path, op, expected):
+
+    get = _lookup(path)
+    compare = OPERATORS[op]
+
+    def predicate(state):
+
+        value = get(state)
+
+        if value is None:
+            return False
+
+        try:
+            return compare(value, expected)
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def compile_condition(spec):
+    """
+    Compile a condition spec into a predicate(state) -> bool.
+
+    Supported forms:
+      "latency_ms.p95 > 3000"         comparison expression
+      {"latency_ok": false}           equality on every key
+      {"all": [...]} / {"any": [...]} / {"not": spec}
+      [spec, ...]                     same as all
+    """
+
+    if isinstance(spec, str):
+
+        match = EXPRESSION.match(spec)
+
+        if not match:
+            raise ValueError(f"Invalid condition: {spec!r}")
+
+        path, op, raw = match.groups()
+
+        return _comparison(path, op, yaml.safe_load(raw))
+
+    if isinstance(spec, list):
+        return compile_condition({"all": spec})
+
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError(f"Invalid condition: {spec!r}")
+
+    if set(spec) == {"all"}:
+        parts = [compile_condition(s) for s in spec["all"]]
+        return lambda state: all(p(state) for p in parts)
+
+    if set(spec) == {"any"}:
+        parts = [compile_condition(s) for s in spec["any"]]
+        return lambda state: any(p(state) for p in parts)
+
+    if set(spec) == {"not"}:
+        part = compile_condition(spec["not"])
+        return lambda state: not part(state)
+
+    # Legacy form: equality on every key
+    parts = [
+        _comparison(key, "==", value)
+        for key, value in spec.items()
+    ]
+
+    return lambda state: all(p(state) for p in parts)
+
+
+# ----------------------------------
+# Rules
+# ----------------------------------
+
+class CompiledRule:
+    """
+    Policy rule with duration, hysteresis and cooldown state
+    """
+
+    def __init__(self, spec: dict):
+
+        self.name = spec["name"]
+
+        self.condition = compile_condition(spec["condition"])
+
+        # Hysteresis: once active, only clear_condition deactivates
+        self.clear_condition = (
+            compile_condition(spec["clear_condition"])
+            if "clear_condition" in spec else None
+        )
+
+        self.for_seconds = parse_duration(spec.get("for", 0))
+        self.clear_for_seconds = parse_duration(spec.get("clear_for", 0))
+        self.cooldown = parse_duration(spec.get("cooldown", 0))
+
+        self.actions = list(spec.get("actions", []))
+        self.on_clear = list(spec.get("on_clear", []))
+
+        self.active = False
+        self.pending_since = None
+        self.clearing_since = None
+        self.last_fired = None
+
+    def restore(self, previous):
+        """
+        Carry runtime state over from the rule this one replaces
+        """
+
+        self.active = previous.active
+        self.pending_since = previous.pending_since
+        self.clearing_since = previous.clearing_since
+        self.last_fired = previous.last_fired
+
+    def _cleared(self, state) -> bool:
+
+        if self.clear_condition is not None:
+            return self.clear_condition(state)
+
+        return not self.condition(state)
+
+    def step(self, state: dict, now: float):
+        """
+        Advance the rule; returns "fired", "cleared" or None
+        """
+
+        if not self.active:
+
+            if not self.condition(state):
+                self.pending_since = None
+                return None
+
+            if self.pending_since is None:
+                self.pending_since = now
+
+            if now - self.pending_since < self.for_seconds:
+                return None
+
+            if (
+                self.last_fired is not None
+                and now - self.last_fired < self.cooldown
+            ):
+                return None
+
+            self.active = True
+            self.pending_since = None
+            self.clearing_since = None
+            self.last_fired = now
+
+            return "fired"
+
+        if not self._cleared(state):
+            self.clearing_since = None
+            return None
+
+        if self.clearing_since is None:
+            self.clearing_since = now
+
+        if now - self.clearing_since < self.clear_for_seconds:
+            return None
+
+        self.active = False
+        self.clearing_since = None
+
+        return "cleared"
+
+    def status(self) -> dict:
+
+        return {
+            "name": self.name,
+            "active": self.active,
+            "last_fired": self.last_fired,
+            "pending_since": self.pending_since
+        }
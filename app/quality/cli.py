@@ -0,0 +1,133 @@
+"""
+Offline quality audit over a JSONL regression set.
+
+    python -m app.quality.cli data/audit.jsonl -o scores.jsonl
+
+Each input line holds "question", "context" (string or list of chunks)
+and "answer". Scores are streamed out as JSONL, one line per input line.
+"""
+
+import argparse
+import json
+import sys
+
+from app.quality.evaluator import QualityEvaluator
+
+
+def _item(entry: dict) -> dict:
+
+    context = entry.get("context", [])
+
+    if isinstance(context, str):
+        context = [context]
+
+    return {
+        "question": entry.get("question", ""),
+        "context_chunks": context,
+        "answer": entry.get("answer", "")
+    }
+
+
+def _batches(lines, size):
+
+    batch = []
+
+    for line in lines:
+
+        if not line.strip():
+            continue
+
+        batch.append(json.loads(line))
+
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Batched offline quality evaluation"
+    )
+
+    parser.add_argument("input", help="JSONL input ('-' for stdin)")
+
+    parser.add_argument("-o", "--output", help="JSONL output (default stdout)")
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=64,
+        help="items per encoder pass"
+    )
+
+    parser.add_argument("--judge-batch-size", type=int)
+
+    parser.add_argument("--max-concurrency", type=int)
+
+    parser.add_argument(
+        "--judge-mode",
+        choices=["always", "tiered"],
+        help="override JUDGE_MODE"
+    )
+
+    parser.add_argument(
+        "--details",
+        action="store_true",
+        help="include per-sentence support"
+    )
+
+    args = parser.parse_args(argv)
+
+    evaluator = QualityEvaluator(judge_mode=args.judge_mode)
+
+    src = sys.stdin if args.input == "-" else open(args.input)
+    dst = open(args.output, "w") if args.output else sys.stdout
+
+    index = 0
+
+    try:
+
+        for batch in _batches(src, args.batch_size):
+
+            results = evaluator.evaluate_many(
+                [_item(entry) for entry in batch],
+                judge_batch_size=args.judge_batch_size,
+                max_concurrency=args.max_concurrency
+            )
+
+            for entry, result in zip(batch, results):
+
+                if not args.details:
+                    result.pop("sentence_support", None)
+
+                if "id" in entry:
+                    result["id"] = entry["id"]
+
+                result["index"] = index
+
+                index += 1
+
+                dst.write(json.dumps(result) + "\n")
+
+            dst.flush()
+
+    finally:
+
+        if src is not sys.stdin:
+            src.close()
+
+        if dst is not sys.stdout:
+            dst.close()
+
+    print(
+        json.dumps(evaluator.judge_stats()),
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
-import numpy as np
+import json
+import random
+import re
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
 
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from app.config import settings
 from app.models.ollama_client import OllamaClient
+from app.quality.groundedness import GroundednessEngine
+from app.quality.verdict_cache import VerdictCache
+from app.retrieval.vector_store import load_embedder
+
+from app.observability.metrics import (
+    JUDGE_DECISIONS,
+    JUDGE_AGREEMENT,
+)
 
 
 class QualityEvaluator:
@@ -12,58 +23,153 @@ class QualityEvaluator:
     Evaluates LLM outputs for hallucination and groundedness
     """
 
-    def __init__(self):
+    GROUNDEDNESS_THRESHOLD = 0.4
+    JUDGE_THRESHOLD = 0.5
+
+    # Neutral score when the judge call fails
+    JUDGE_FALLBACK = 0.5
 
-        self.embedder = SentenceTransformer(
-            settings.EMBEDDING_MODEL
+    # Free-text batch replies: decimals only, so item numbers
+    # ("1.", "Item 2:") are not taken for scores
+    SCORE = re.compile(r"(?<![\w.])\d*\.\d+(?!\.?\d)")
+
+    def __init__(
+        self,
+        judge_mode=None,
+        band=None,
+        sample_rate=None,
+        vector_store=None,
+        verdict_cache=None
+    ):
+
+        # Share the retrieval encoder so stored chunk
+        # vectors and answer vectors live in one space
+        self.embedder = (
+            vector_store.embedder if vector_store is not None
+            else load_embedder()
+        )
+
+        self.grounding = GroundednessEngine(
+            self.embedder,
+            vector_store
         )
 
         self.judge_llm = OllamaClient()
 
         self.judge_model = settings.PRIMARY_MODEL
 
-    # ----------------------------------
-    # Embedding Similarity
-    # ----------------------------------
+        if verdict_cache is None and settings.JUDGE_CACHE_ENABLED:
 
-    def _similarity(self, a: str, b: str) -> float:
+            verdict_cache = VerdictCache(
+                settings.JUDGE_CACHE_PATH,
+                ttl=settings.JUDGE_CACHE_TTL,
+                max_size=settings.JUDGE_CACHE_MAX_SIZE
+            )
 
-        vecs = self.embedder.encode([a, b])
+        self.verdict_cache = verdict_cache
 
-        score = cosine_similarity(
-            [vecs[0]],
-            [vecs[1]]
-        )[0][0]
+        # Tiered judging
+        self.judge_mode = judge_mode or settings.JUDGE_MODE
 
-        return float(score)
+        self.band = band or (
+            settings.JUDGE_BAND_LOW,
+            settings.JUDGE_BAND_HIGH
+        )
+
+        self.sample_rate = (
+            settings.JUDGE_SAMPLE_RATE
+            if sample_rate is None else sample_rate
+        )
+
+        self._stats_lock = threading.Lock()
+
+        self._stats = {
+            "evaluations": 0,
+            "judged": 0,
+            "skipped": 0,
+            "sampled": 0,
+            "disabled": 0,
+            "failed": 0,
+            "agree": 0,
+            "disagree": 0,
+            "abs_error_sum": 0.0
+        }
 
     # ----------------------------------
     # Groundedness Check
     # ----------------------------------
 
-    def groundedness_score(
+    def groundedness_detail(
         self,
         answer: str,
-        context_chunks: list
-    ) -> float:
+        context_chunks: list,
+        context_ids: list = None
+    ) -> dict:
 
-        if not context_chunks:
-            return 0.0
+        return self.grounding.score(
+            answer,
+            context_chunks,
+            context_ids
+        )
 
-        context = " ".join(context_chunks)
+    def groundedness_score(
+        self,
+        answer: str,
+        context_chunks: list,
+        context_ids: list = None
+    ) -> float:
 
-        return self._similarity(answer, context)
+        return self.groundedness_detail(
+            answer,
+            context_chunks,
+            context_ids
+        )["score"]
 
     # ----------------------------------
     # LLM-as-Judge
     # ----------------------------------
 
+    def _verdict_key(self, answer, context_chunks, question):
+
+        if self.verdict_cache is None:
+            return None
+
+        return self.verdict_cache.key(
+            question,
+            context_chunks,
+            answer,
+            self.judge_model
+        )
+
+    def _cached_verdict(self, key):
+
+        if key is None:
+            return None
+
+        return self.verdict_cache.get(key)
+
+    def _store_verdict(self, key, score):
+
+        if key is not None:
+            self.verdict_cache.set(key, score)
+
     def llm_judge(
         self,
         answer: str,
         context_chunks: list,
-        question: str
+        question: str,
+        fallback=JUDGE_FALLBACK
     ) -> float:
+        """
+        Judge score, or `fallback` if the judge call fails
+        """
+
+        key = self._verdict_key(answer, context_chunks, question)
+
+        cached = self._cached_verdict(key)
+
+        if cached is not None:
+            return cached
 
         context = "\n".join(context_chunks)
 
@@ -94,39 +200,370 @@ Only return a number.
                 response.strip().split()[0]
             )
 
-            return max(0.0, min(score, 1.0))
-
         except Exception:
-            return 0.5
+            return fallback
+
+        score = max(0.0, min(score, 1.0))
+
+        self._store_verdict(key, score)
+
+        return score
+
+    # ----------------------------------
+    # Tiered Judging
+    # ----------------------------------
+
+    def _judge_decision(self, grounding: float):
+        """
+        Returns why the judge should run, or None to skip it
+        """
+
+        if self.judge_mode != "tiered":
+            return "always"
+
+        low, high = self.band
+
+        if low <= grounding <= high:
+            return "uncertain"
+
+        if random.random() < self.sample_rate:
+            return "sampled"
+
+        return None
+
+    def _record_decision(self, decision, grounding, judge, failed):
+
+        JUDGE_DECISIONS.labels(decision or "skipped").inc()
+
+        with self._stats_lock:
+
+            self._stats["evaluations"] += 1
+
+            # Safe mode: not a tiering decision
+            if decision == "disabled":
+                self._stats["disabled"] += 1
+                return
+
+            if decision is None:
+                self._stats["skipped"] += 1
+                return
+
+            self._stats["judged"] += 1
+
+            if decision == "sampled":
+                self._stats["sampled"] += 1
+
+            # The fallback score says nothing about agreement
+            if failed:
+                self._stats["failed"] += 1
+                return
+
+            cheap = grounding < self.GROUNDEDNESS_THRESHOLD
+            expensive = judge < self.JUDGE_THRESHOLD
+
+            outcome = "agree" if cheap == expensive else "disagree"
+
+            self._stats[outcome] += 1
+
+            self._stats["abs_error_sum"] += abs(grounding - judge)
+
+        JUDGE_AGREEMENT.labels(outcome).inc()
+
+    def judge_stats(self) -> dict:
+
+        with self._stats_lock:
+            s = dict(self._stats)
+
+        cache = (
+            self.verdict_cache.stats()
+            if self.verdict_cache is not None else None
+        )
+
+        compared = s["agree"] + s["disagree"]
+
+        tiered = s["evaluations"] - s["disabled"]
+
+        return {
+            "mode": self.judge_mode,
+            "band": list(self.band),
+            "sample_rate": self.sample_rate,
+            "evaluations": s["evaluations"],
+            "judged": s["judged"],
+            "sampled": s["sampled"],
+            "disabled": s["disabled"],
+            "failed": s["failed"],
+            "skip_rate": (
+                s["skipped"] / tiered if tiered else 0.0
+            ),
+            "agreement_rate": (
+                s["agree"] / compared if compared else None
+            ),
+            "mean_abs_error": (
+                s["abs_error_sum"] / compared if compared else None
+            ),
+            "cache": cache
+        }
 
     # ----------------------------------
     # Final Evaluation
     # ----------------------------------
 
+    def _verdict(self, detail, decision, judge) -> dict:
+        """
+        judge is None for a judged item when the judge call failed
+        """
+
+        grounding = detail["score"]
+
+        failed = decision not in (None, "disabled") and judge is None
+
+        if failed:
+            judge = self.JUDGE_FALLBACK
+
+        if decision in (None, "disabled"):
+
+            # Embedding verdict only: judge skipped or disabled
+            hallucinated = (
+                grounding < self.GROUNDEDNESS_THRESHOLD
+            )
+
+        else:
+
+            hallucinated = (
+                grounding < self.GROUNDEDNESS_THRESHOLD
+                and judge < self.JUDGE_THRESHOLD
+            )
+
+        self._record_decision(decision, grounding, judge, failed)
+
+        return {
+            "groundedness": grounding,
+            "judge_score": judge,
+            "judge_decision": decision or "skipped",
+            "judge_failed": failed,
+            "hallucinated": hallucinated,
+            "sentence_support": detail["sentences"]
+        }
+
     def evaluate(
         self,
         answer: str,
         context_chunks: list,
-        question: str
+        question: str,
+        context_ids: list = None,
+        judge: bool = True
     ) -> dict:
+        """
+        judge=False (safe mode) skips the LLM judge entirely
+        """
 
-        grounding = self.groundedness_score(
+        detail = self.groundedness_detail(
             answer,
-            context_chunks
+            context_chunks,
+            context_ids
         )
 
-        judge = self.llm_judge(
-            answer,
-            context_chunks,
-            question
+        decision = (
+            self._judge_decision(detail["score"])
+            if judge else "disabled"
         )
 
-        hallucinated = (
-            grounding < 0.4 and judge < 0.5
+        judge = None
+
+        if decision not in (None, "disabled"):
+
+            judge = self.llm_judge(
+                answer,
+                context_chunks,
+                question,
+                fallback=None
+            )
+
+        return self._verdict(detail, decision, judge)
+
+    # ----------------------------------
+    # Batched (Offline) Evaluation
+    # ----------------------------------
+
+    def _judge_batch(self, batch: list) -> list:
+        """
+        Judge several items in one LLM request
+        """
+
+        blocks = []
+
+        for n, item in enumerate(batch, 1):
+
+            context = "\n".join(item["context_chunks"])
+
+            blocks.append(f"""
+### Item {n}
+Question:
+{item["question"]}
+
+Context:
+{context}
+
+Answer:
+{item["answer"]}
+""")
+
+        items = "".join(blocks)
+
+        prompt = f"""
+You are an AI evaluator.
+{items}
+Task:
+For each item, score from 0.0 to 1.0 how well the answer is
+supported by its context.
+Only return a JSON array of {len(batch)} numbers, in item order.
+"""
+
+        try:
+
+            response = self.judge_llm.generate(
+                self.judge_model,
+                prompt
+            )
+
+            scores = self._parse_scores(response, len(batch))
+
+        except Exception:
+            scores = None
+
+        if scores is None:
+
+            # Malformed batch output, judge items one by one
+            return [
+                self.llm_judge(
+                    item["answer"],
+                    item["context_chunks"],
+                    item["question"],
+                    fallback=None
+                )
+                for item in batch
+            ]
+
+        scores = [max(0.0, min(s, 1.0)) for s in scores]
+
+        for item, score in zip(batch, scores):
+
+            self._store_verdict(
+                self._verdict_key(
+                    item["answer"],
+                    item["context_chunks"],
+                    item["question"]
+                ),
+                score
+            )
+
+        return scores
+
+    @classmethod
+    def _parse_scores(cls, response: str, expected: int):
+        """
+        Scores from a batch reply, or None (judge items one by one)
+        if they cannot be matched to the items
+        """
+
+        match = re.search(r"\[[^\]]*\]", response or "")
+
+        try:
+            scores = [float(x) for x in json.loads(match.group(0))]
+
+        except Exception:
+
+            scores = [
+                float(x) for x in
+                cls.SCORE.findall(response or "")
+            ]
+
+        if len(scores) != expected:
+            return None
+
+        # Out of range means another scale, not a clampable score
+        if not all(0.0 <= s <= 1.0 for s in scores):
+            return None
+
+        return scores
+
+    def evaluate_many(
+        self,
+        items: list,
+        judge_batch_size: int = None,
+        max_concurrency: int = None
+    ) -> list:
+        """
+        Evaluate many (question, context_chunks, answer) dicts:
+        one encoder pass, packed judge requests, bounded concurrency
+        """
+
+        judge_batch_size = (
+            judge_batch_size or settings.JUDGE_BATCH_SIZE
         )
 
-        return {
-            "groundedness": grounding,
-            "judge_score": judge,
-            "hallucinated": hallucinated
-        }
+        max_concurrency = (
+            max_concurrency or settings.JUDGE_MAX_CONCURRENCY
+        )
+
+        details = self.grounding.score_many([
+            (
+                item["answer"],
+                item["context_chunks"],
+                item.get("context_ids")
+            )
+            for item in items
+        ])
+
+        decisions = [
+            self._judge_decision(detail["score"])
+            for detail in details
+        ]
+
+        judges = [None] * len(items)
+
+        pending = []
+
+        for i, decision in enumerate(decisions):
+
+            if decision is None:
+                continue
+
+            judges[i] = self._cached_verdict(
+                self._verdict_key(
+                    items[i]["answer"],
+                    items[i]["context_chunks"],
+                    items[i]["question"]
+                )
+            )
+
+            if judges[i] is None:
+                pending.append(i)
+
+        batches = [
+            pending[i:i + judge_batch_size]
+            for i in range(0, len(pending), judge_batch_size)
+        ]
+
+        if batches:
+
+            with ThreadPoolExecutor(
+                max_workers=max_concurrency
+            ) as pool:
+
+                scored = pool.map(
+                    lambda batch: self._judge_batch(
+                        [items[i] for i in batch]
+                    ),
+                    batches
+                )
+
+                for batch, scores in zip(batches, scored):
+                    for i, score in zip(batch, scores):
+                        judges[i] = score
+
+        return [
+            self._verdict(detail, decision, judge)
+            for detail, decision, judge
+            in zip(details, decisions, judges)
+        ]
@@ -0,0 +1,171 @@
+import re
+
+import numpy as np
+
+
+class GroundednessEngine:
+    """
+    Sentence x chunk groundedness scoring
+    (reuses stored retrieval embeddings)
+    """
+
+    SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+    def __init__(self, embedder, vector_store=None):
+
+        self.embedder = embedder
+        self.vector_store = vector_store
+
+    # ----------------------------------
+    # Helpers
+    # ----------------------------------
+
+    @classmethod
+    def split_sentences(cls, text: str) -> list:
+
+        parts = cls.SENTENCE_SPLIT.split(text or "")
+
+        return [p.strip() for p in parts if p.strip()]
+
+    @staticmethod
+    def _normalize(matrix) -> np.ndarray:
+
+        matrix = np.asarray(matrix, dtype=np.float32)
+
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+
+        return matrix / np.maximum(norms, 1e-12)
+
+    def _stored_vectors(self, chunk_ids) -> dict:
+
+        if self.vector_store is None or not chunk_ids:
+            return {}
+
+        wanted = [i for i in chunk_ids if i is not None]
+
+        if not wanted:
+            return {}
+
+        try:
+            return self.vector_store.embeddings(wanted)
+
+        except Exception as e:
+
+            print(f"[GROUNDEDNESS] Stored vector lookup failed: {e}")
+
+            return {}
+
+    # ----------------------------------
+    # Scoring
+    # ----------------------------------
+
+    def score(
+        self,
+        answer: str,
+        context_chunks: list,
+        chunk_ids: list = None
+    ) -> dict:
+        """
+        Per-sentence support (best matching chunk) and overall score
+        """
+
+        return self.score_many(
+            [(answer, context_chunks, chunk_ids)]
+        )[0]
+
+    def score_many(self, items: list) -> list:
+        """
+        Score (answer, context_chunks, chunk_ids) triples with a
+        single encoder pass across every item
+        """
+
+        plans = []
+        texts = []
+        wanted = []
+
+        for answer, context_chunks, chunk_ids in items:
+
+            sentences = self.split_sentences(answer)
+
+            context_chunks = list(context_chunks or [])
+
+            chunk_ids = list(chunk_ids or [])
+            chunk_ids += [None] * (len(context_chunks) - len(chunk_ids))
+
+            plans.append((sentences, context_chunks, chunk_ids))
+
+            wanted += chunk_ids
+
+        stored = self._stored_vectors(wanted)
+
+        # Chunks without a stored vector (e.g. corrupted by chaos)
+        # are encoded in the same batch as the answer sentences
+        offsets = []
+
+        for sentences, context_chunks, chunk_ids in plans:
+
+            if not context_chunks or not sentences:
+                offsets.append(None)
+                continue
+
+            missing = [
+                i for i, chunk_id in enumerate(chunk_ids)
+                if chunk_id not in stored
+            ]
+
+            offsets.append((len(texts), missing))
+
+            texts += sentences
+            texts += [context_chunks[i] for i in missing]
+
+        encoded = self.embedder.encode(texts) if texts else []
+
+        return [
+            self._score_one(plan, offset, encoded, stored)
+            for plan, offset in zip(plans, offsets)
+        ]
+
+    def _score_one(self, plan, offset, encoded, stored) -> dict:
+
+        if offset is None:
+            return {"score": 0.0, "sentences": []}
+
+        sentences, context_chunks, chunk_ids = plan
+
+        start, missing = offset
+
+        n = len(sentences)
+
+        sentence_vecs = self._normalize(encoded[start:start + n])
+
+        chunk_vecs = [None] * len(context_chunks)
+
+        for i, chunk_id in enumerate(chunk_ids):
+            if chunk_id in stored:
+                chunk_vecs[i] = stored[chunk_id]
+
+        for k, i in enumerate(missing):
+            chunk_vecs[i] = encoded[start + n + k]
+
+        chunk_vecs = self._normalize(np.vstack(chunk_vecs))
+
+        # Full sentence x chunk cosine matrix in one product
+        sims = sentence_vecs @ chunk_vecs.T
+
+        best = sims.argmax(axis=1)
+        support = sims[np.arange(n), best]
+
+        return {
+            "score": float(support.mean()),
+            "sentences": [
+                {
+                    "text": sentence,
+                    "support": float(support[i]),
+                    "chunk": int(best[i])
+                }
+                for i, sentence in enumerate(sentences)
+            ]
+        }
@@ -0,0 +1,231 @@
+import queue
+import random
+import threading
+import time
+
+from app.config import settings
+
+from app.observability.metrics import (
+    EVALUATION_LAG,
+    EVALUATION_LATENCY,
+    EVALUATION_QUEUE_DEPTH,
+    EVALUATION_DROPPED,
+)
+
+
+class EvaluationPool:
+    """
+    Background quality evaluation off the request path
+    (bounded queue + worker pool + backpressure)
+    """
+
+    def __init__(
+        self,
+        evaluator,
+        on_result,
+        workers=None,
+        queue_size=None,
+        overflow_policy=None,
+        high_watermark=None,
+        sample_rate=None,
+        before_evaluate=None
+    ):
+
+        self.evaluator = evaluator
+        self.on_result = on_result
+
+        # Optional hook run in the worker first (chaos latency)
+        self.before_evaluate = before_evaluate
+
+        self.workers = workers or settings.EVAL_WORKERS
+
+        self.queue_size = queue_size or settings.EVAL_QUEUE_SIZE
+
+        self.overflow_policy = (
+            overflow_policy or settings.EVAL_OVERFLOW_POLICY
+        )
+
+        self.high_watermark = (
+            settings.EVAL_HIGH_WATERMARK
+            if high_watermark is None else high_watermark
+        )
+
+        self.sample_rate = (
+            settings.EVAL_OVERLOAD_SAMPLE_RATE
+            if sample_rate is None else sample_rate
+        )
+
+        self.queue = queue.Queue(maxsize=self.queue_size)
+
+        self._lock = threading.Lock()
+
+        self.counts = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "dropped": 0
+        }
+
+        self.last_lag = 0.0
+
+        self._threads = []
+
+        self._start()
+
+    # --------------------------------
+    # Lifecycle
+    # --------------------------------
+
+    def _start(self):
+
+        for i in range(self.workers):
+
+            t = threading.Thread(
+                target=self._worker,
+                name=f"eval-worker-{i}",
+                daemon=True
+            )
+
+            t.start()
+
+            self._threads.append(t)
+
+    def join(self):
+        """
+        Block until every queued evaluation has finished
+        """
+
+        self.queue.join()
+
+    # --------------------------------
+    # Backpressure
+    # --------------------------------
+
+    def _admit(self):
+
+        depth = self.queue.qsize()
+
+        if depth >= self.queue_size:
+            return False, "queue_full"
+
+        if self.overflow_policy != "sample":
+            return True, None
+
+        if depth >= self.queue_size * self.high_watermark:
+
+            if random.random() >= self.sample_rate:
+                return False, "sampled_out"
+
+        return True, None
+
+    def _drop(self, reason):
+
+        with self._lock:
+            self.counts["dropped"] += 1
+
+        EVALUATION_DROPPED.labels(reason).inc()
+
+    # --------------------------------
+    # Submission
+    # --------------------------------
+
+    def submit(self, meta=None, **kwargs) -> bool:
+        """
+        Queue an evaluation; kwargs go to evaluator.evaluate.
+        Returns False when the job was shed.
+        """
+
+        admitted, reason = self._admit()
+
+        if not admitted:
+            self._drop(reason)
+            return False
+
+        job = {
+            "kwargs": kwargs,
+            "meta": meta or {},
+            "submitted_at": time.time()
+        }
+
+        try:
+            self.queue.put_nowait(job)
+
+        except queue.Full:
+            self._drop("queue_full")
+            return False
+
+        with self._lock:
+            self.counts["submitted"] += 1
+
+        EVALUATION_QUEUE_DEPTH.set(self.queue.qsize())
+
+        return True
+
+    # --------------------------------
+    # Workers
+    # --------------------------------
+
+    def _worker(self):
+
+        while True:
+
+            job = self.queue.get()
+
+            try:
+                self._run(job)
+
+            finally:
+
+                self.queue.task_done()
+
+                EVALUATION_QUEUE_DEPTH.set(self.queue.qsize())
+
+    def _run(self, job):
+
+        try:
+
+            if self.before_evaluate is not None:
+                self.before_evaluate(job["meta"])
+
+            start = time.perf_counter()
+
+            quality = self.evaluator.evaluate(
+                **job["kwargs"]
+            )
+
+            EVALUATION_LATENCY.observe(time.perf_counter() - start)
+
+            self.on_result(quality, job["meta"])
+
+        except Exception as e:
+
+            with self._lock:
+                self.counts["failed"] += 1
+
+            print(f"[EVAL ERROR] {e}")
+
+            return
+
+        lag = time.time() - job["submitted_at"]
+
+        EVALUATION_LAG.observe(lag)
+
+        with self._lock:
+            self.counts["completed"] += 1
+            self.last_lag = lag
+
+    # --------------------------------
+    # Status
+    # --------------------------------
+
+    def stats(self) -> dict:
+
+        with self._lock:
+
+            return {
+                **self.counts,
+                "pending": self.queue.qsize(),
+                "capacity": self.queue_size,
+                "workers": self.workers,
+                "last_lag_seconds": self.last_lag
+            }
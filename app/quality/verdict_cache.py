@@ -0,0 +1,176 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from app.observability.metrics import JUDGE_CACHE_REQUESTS
+
+
+class VerdictCache:
+    """
+    Persistent, bounded LLM-judge verdict cache
+    (SQLite, TTL + oldest-first eviction)
+    """
+
+    def __init__(self, path, ttl=86400, max_size=50000):
+
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+
+        self.db.execute("PRAGMA journal_mode=WAL")
+
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY,"
+            " score REAL NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS verdicts_created"
+            " ON verdicts (created_at)"
+        )
+
+        self.db.commit()
+
+        self.size = self._count()
+
+    # ----------------------------------
+    # Keys
+    # ----------------------------------
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+
+        return " ".join((text or "").split())
+
+    def key(
+        self,
+        question: str,
+        context_chunks: list,
+        answer: str,
+        model: str
+    ) -> str:
+
+        parts = [
+            model,
+            self._normalize(question),
+            "\x1f".join(self._normalize(c) for c in context_chunks),
+            self._normalize(answer)
+        ]
+
+        return hashlib.sha256(
+            "\x1e".join(parts).encode()
+        ).hexdigest()
+
+    # ----------------------------------
+    # Access
+    # ----------------------------------
+
+    def get(self, key: str):
+
+        with self._lock:
+
+            row = self.db.execute(
+                "SELECT score, created_at FROM verdicts WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row and time.time() - row[1] > self.ttl:
+
+                self.db.execute(
+                    "DELETE FROM verdicts WHERE key = ?",
+                    (key,)
+                )
+
+                self.db.commit()
+
+                row = None
+
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        JUDGE_CACHE_REQUESTS.labels("hit" if row else "miss").inc()
+
+        return row[0] if row else None
+
+    def set(self, key: str, score: float):
+
+        with self._lock:
+
+            inserted = self.db.execute(
+                "INSERT OR IGNORE INTO verdicts"
+                " (key, score, created_at) VALUES (?, ?, ?)",
+                (key, score, time.time())
+            ).rowcount
+
+            if inserted:
+                self.size += 1
+
+            else:
+                self.db.execute(
+                    "UPDATE verdicts SET score = ?, created_at = ?"
+                    " WHERE key = ?",
+                    (score, time.time(), key)
+                )
+
+            if self.size > self.max_size:
+                self._evict()
+
+            self.db.commit()
+
+    def _count(self) -> int:
+
+        return self.db.execute(
+            "SELECT COUNT(*) FROM verdicts"
+        ).fetchone()[0]
+
+    def _evict(self):
+
+        # Drop expired rows first, then the oldest overflow
+        self.db.execute(
+            "DELETE FROM verdicts WHERE created_at < ?",
+            (time.time() - self.ttl,)
+        )
+
+        self.db.execute(
+            "DELETE FROM verdicts WHERE key IN ("
+            " SELECT key FROM verdicts"
+            " ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_size,)
+        )
+
+        self.size = self._count()
+
+    # ----------------------------------
+    # Status
+    # ----------------------------------
+
+    def stats(self) -> dict:
+
+        with self._lock:
+
+            total = self.hits + self.misses
+
+            return {
+                "size": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
@@ -0,0 +1,166 @@
+import glob
+import os
+import threading
+import time
+
+import yaml
+
+from app.config import settings
+
+from app.observability.metrics import (
+    CONFIG_RELOAD_LATENCY,
+    CONFIG_RELOADS,
+)
+
+
+class ConfigWatcher:
+    """
+    Polls config files for changes, validates them and swaps the
+    parsed config into the running component (apply_config)
+    """
+
+    def __init__(
+        self,
+        targets: dict,
+        pattern="policies/*.yaml",
+        interval=None
+    ):
+
+        # path -> component exposing apply_config(config)
+        self.targets = {
+            os.path.normpath(path): component
+            for path, component in targets.items()
+        }
+
+        self.pattern = pattern
+
+        self.interval = interval or settings.CONFIG_RELOAD_INTERVAL
+
+        self.versions = {
+            path: self._version(path) for path in self.targets
+        }
+
+        self.last_results = {}
+
+        self._lock = threading.Lock()
+
+        self._stop = threading.Event()
+
+        self._thread = None
+
+    # --------------------------------
+    # Lifecycle
+    # --------------------------------
+
+    def start(self):
+
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._loop,
+            name="config-watcher",
+            daemon=True
+        )
+
+        self._thread.start()
+
+    def stop(self):
+
+        self._stop.set()
+
+    def _loop(self):
+
+        while not self._stop.wait(self.interval):
+
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[RELOAD] Watch failed: {e}")
+
+    # --------------------------------
+    # Change Detection
+    # --------------------------------
+
+    @staticmethod
+    def _version(path):
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> list:
+        """
+        Reload every watched file whose mtime / size changed
+        """
+
+        changed = []
+
+        for path in sorted(glob.glob(self.pattern)):
+
+            path = os.path.normpath(path)
+
+            if path not in self.targets:
+                continue
+
+            if self._version(path) != self.versions.get(path):
+                changed.append(path)
+
+        return [self.reload(path) for path in changed]
+
+    # --------------------------------
+    # Reload
+    # --------------------------------
+
+    def reload(self, path) -> dict:
+
+        path = os.path.normpath(path)
+
+        name = os.path.basename(path)
+
+        component = self.targets[path]
+
+        start = time.perf_counter()
+
+        with self._lock:
+
+            version = self._version(path)
+
+            try:
+
+                with open(path, "r") as f:
+                    config = yaml.safe_load(f) or {}
+
+                # Validates first; nothing is swapped on failure
+                component.apply_config(config)
+
+                result = {"config": name, "status": "reloaded"}
+
+            except Exception as e:
+
+                print(f"[RELOAD] {name} rejected: {e}")
+
+                result = {"config": name, "status": "failed", "error": str(e)}
+
+            # Also remember rejected versions so a bad file is
+            # reported once, not on every poll
+            self.versions[path] = version
+
+        duration = time.perf_counter() - start
+
+        CONFIG_RELOAD_LATENCY.labels(name).observe(duration)
+        CONFIG_RELOADS.labels(name, result["status"]).inc()
+
+        result["duration_seconds"] = duration
+        result["at"] = time.time()
+
+        self.last_results[name] = result
+
+        return result
+
+    def reload_all(self) -> list:
+
+        return [self.reload(path) for path in sorted(self.targets)]
@@ -1,7 +1,6 @@
 from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 
-from app.config import settings
+from app.retrieval.vector_store import load_embedder
 
 
 class ReplayComparator:
@@ -12,9 +11,7 @@ class ReplayComparator:
 
     def __init__(self):
 
-        self.embedder = SentenceTransformer(
-            settings.EMBEDDING_MODEL
-        )
+        self.embedder = load_embedder()
 
     def similarity(self, a: str, b: str) -> float:
 
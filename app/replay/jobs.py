@@ -0,0 +1,415 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+from app.config import settings
+
+
+class ReplayJob:
+    """
+    One background replay. Results go to <id>.ndjson in input order;
+    the <id>.json checkpoint records how much of the input and of the
+    results file is complete, so the job can resume after a restart.
+    """
+
+    FIELDS = (
+        "id", "status", "input_path", "input_end", "workers", "rate",
+        "created_at", "started_at", "finished_at", "error",
+        "input_offset", "processed", "degraded", "results_bytes"
+    )
+
+    def __init__(self, job_id, input_path, workers, rate):
+
+        self.id = job_id
+        self.status = "pending"
+
+        self.input_path = input_path
+
+        # The log keeps growing; a job replays it as it was at creation
+        self.input_end = (
+            os.path.getsize(input_path)
+            if os.path.exists(input_path) else 0
+        )
+
+        self.workers = workers
+        self.rate = rate
+
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        self.error = None
+
+        # Checkpoint
+        self.input_offset = 0
+        self.processed = 0
+        self.degraded = 0
+        self.results_bytes = 0
+
+        self.stop = threading.Event()
+
+    @classmethod
+    def from_dict(cls, data: dict):
+
+        job = cls.__new__(cls)
+
+        for field in cls.FIELDS:
+            setattr(job, field, data.get(field))
+
+        job.stop = threading.Event()
+
+        return job
+
+    def to_dict(self) -> dict:
+
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def progress(self) -> dict:
+
+        elapsed = (
+            (self.finished_at or time.time()) - self.started_at
+            if self.started_at else 0.0
+        )
+
+        return {
+            **self.to_dict(),
+            "progress": (
+                self.input_offset / self.input_end
+                if self.input_end else 1.0
+            ),
+            "degraded_rate": (
+                self.degraded / self.processed if self.processed else 0.0
+            ),
+            "queries_per_second": (
+                self.processed / elapsed if elapsed else 0.0
+            )
+        }
+
+
+class ReplayJobManager:
+    """
+    Runs ReplayRunner as background jobs with checkpoint / resume
+    """
+
+    def __init__(self, runner, directory=None, checkpoint_every=None):
+
+        self.runner = runner
+
+        self.directory = directory or settings.REPLAY_JOBS_DIR
+
+        self.checkpoint_every = (
+            checkpoint_every or settings.REPLAY_CHECKPOINT_EVERY
+        )
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.jobs = {}
+
+        self._lock = threading.Lock()
+
+        self._recover()
+
+    # --------------------------------
+    # Persistence
+    # --------------------------------
+
+    def _path(self, job, suffix):
+
+        return os.path.join(self.directory, f"{job.id}{suffix}")
+
+    def _save(self, job):
+
+        path = self._path(job, ".json")
+
+        with open(path + ".tmp", "w") as f:
+            json.dump(job.to_dict(), f)
+
+        os.replace(path + ".tmp", path)
+
+    def _recover(self):
+        """
+        Load checkpoints; jobs that were running when the process
+        died become resumable
+        """
+
+        for name in os.listdir(self.directory):
+
+            if not name.endswith(".json"):
+                continue
+
+            try:
+
+                with open(os.path.join(self.directory, name)) as f:
+                    job = ReplayJob.from_dict(json.load(f))
+
+            except (OSError, ValueError) as e:
+
+                print(f"[REPLAY] Skipping checkpoint {name}: {e}")
+
+                continue
+
+            if job.status in ("pending", "running"):
+                job.status = "interrupted"
+
+            self.jobs[job.id] = job
+
+    # --------------------------------
+    # Control
+    # --------------------------------
+
+    def start(self, workers=None, rate=None) -> dict:
+
+        with self._lock:
+
+            self._check_idle()
+
+            job = ReplayJob(
+                uuid.uuid4().hex[:12],
+                self.runner.path,
+                workers or self.runner.workers,
+                self.runner.rate if rate is None else rate
+            )
+
+            self.jobs[job.id] = job
+
+            self._save(job)
+
+            self._launch(job)
+
+        print(f"[REPLAY] Job {job.id} started")
+
+        return job.progress()
+
+    def resume(self, job_id) -> dict:
+
+        with self._lock:
+
+            job = self.jobs[job_id]
+
+            if job.status == "completed":
+                raise RuntimeError(f"Replay job {job_id} already completed")
+
+            self._check_idle()
+
+            job.stop = threading.Event()
+
+            self._launch(job)
+
+        print(
+            f"[REPLAY] Job {job.id} resumed at entry {job.processed}"
+        )
+
+        return job.progress()
+
+    def cancel(self, job_id) -> dict:
+        """
+        Stop after in-flight queries; the job stays resumable
+        """
+
+        job = self.jobs[job_id]
+
+        job.stop.set()
+
+        return job.progress()
+
+    def _check_idle(self):
+
+        # One job at a time: replay shares Ollama connections
+        # with live traffic
+        for job in self.jobs.values():
+
+            if job.status in ("pending", "running"):
+                raise RuntimeError(f"Replay job {job.id} is already running")
+
+    def _launch(self, job):
+
+        job.status = "running"
+
+        threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"replay-{job.id}",
+            daemon=True
+        ).start()
+
+    # --------------------------------
+    # Queries
+    # --------------------------------
+
+    def get(self, job_id):
+
+        job = self.jobs.get(job_id)
+
+        return job.progress() if job is not None else None
+
+    def list(self) -> list:
+
+        return [
+            job.progress()
+            for job in sorted(
+                self.jobs.values(),
+                key=lambda j: j.created_at,
+                reverse=True
+            )
+        ]
+
+    def results(self, job_id, chunk_size=65536):
+        """
+        NDJSON results written so far, streamed in chunks
+        """
+
+        job = self.jobs[job_id]
+
+        # Only whole lines: results_bytes moves after each flush
+        remaining = job.results_bytes
+
+        path = self._path(job, ".ndjson")
+
+        if not remaining or not os.path.exists(path):
+            return
+
+        with open(path, "rb") as f:
+
+            while remaining > 0:
+
+                chunk = f.read(min(chunk_size, remaining))
+
+                if not chunk:
+                    return
+
+                remaining -= len(chunk)
+
+                yield chunk
+
+    # --------------------------------
+    # Execution
+    # --------------------------------
+
+    def _entries(self, job, ends):
+        """
+        Input from the checkpointed offset, parsed lazily;
+        ends[index] = byte offset just past that entry
+        """
+
+        if job.input_offset >= job.input_end:
+            return
+
+        index = 0
+
+        with open(job.input_path, "rb") as f:
+
+            f.seek(job.input_offset)
+
+            offset = job.input_offset
+
+            for line in f:
+
+                if offset >= job.input_end:
+                    return
+
+                offset += len(line)
+
+                if not line.strip():
+                    continue
+
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = {"query": None}
+
+                ends[index] = offset
+
+                index += 1
+
+                yield entry
+
+    def _run(self, job):
+
+        job.started_at = time.time()
+        job.finished_at = None
+        job.error = None
+
+        self._save(job)
+
+        ends = {}
+
+        state = {"saved": job.processed}
+
+        write_lock = threading.Lock()
+
+        path = self._path(job, ".ndjson")
+
+        # Drop anything written past the last checkpoint
+        with open(path, "ab") as f:
+            f.truncate(job.results_bytes)
+
+        results = open(path, "ab")
+
+        def on_result(index, result):
+
+            # Delivered in input order by the runner
+            data = (json.dumps(result, default=str) + "\n").encode()
+
+            with write_lock:
+
+                results.write(data)
+                results.flush()
+
+                job.input_offset = ends.pop(index)
+                job.processed += 1
+
+                if result.get("comparison", {}).get("degraded"):
+                    job.degraded += 1
+
+                job.results_bytes += len(data)
+
+                if job.processed - state["saved"] >= self.checkpoint_every:
+
+                    os.fsync(results.fileno())
+
+                    self._save(job)
+
+                    state["saved"] = job.processed
+
+        try:
+
+            self.runner._execute(
+                self._entries(job, ends),
+                job.workers,
+                job.rate,
+                on_result,
+                stop=job.stop
+            )
+
+            if job.stop.is_set():
+
+                job.status = "cancelled"
+
+            else:
+
+                job.status = "completed"
+
+                job.input_offset = job.input_end
+
+        except Exception as e:
+
+            print(f"[REPLAY] Job {job.id} failed: {e}")
+
+            job.status = "failed"
+            job.error = str(e)
+
+        finally:
+
+            results.close()
+
+            job.finished_at = time.time()
+
+            with write_lock:
+                self._save(job)
+
+        print(
+            f"[REPLAY] Job {job.id} {job.status} "
+            f"({job.processed} queries)"
+        )
@@ -1,141 +1,266 @@
 import json
+import math
+import threading
+import time
 import traceback
 
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.chaos.fault_injector import FaultInjector
+from app.fallback.router import FallbackRouter
 from app.replay.comparator import ReplayComparator
 
 
+class ReplaySandbox:
+    """
+    Private injector / routers / caches for one replay run
+    (live chaos and routing state is never touched)
+    """
+
+    def __init__(self, chaos_config_path):
+
+        # Separate routers: the chaos leg must not be answered
+        # from the baseline leg's cache, and its failures must
+        # not trip the baseline's circuit breakers. Nothing here
+        # emits to the live Prometheus series.
+        self.baseline_router = FallbackRouter(metrics=False)
+        self.chaos_router = FallbackRouter(metrics=False)
+
+        self.injector = FaultInjector(chaos_config_path, metrics=False)
+
+        self.injector.enabled = True
+
+
 class ReplayRunner:
     """
-    Replays shadow traffic under isolated conditions
+    Replays shadow traffic in a sandbox on a bounded worker pool
     (best-effort, never crashes)
     """
 
     def __init__(
         self,
-        client,
-        chaos_engine,
-        router,
-        path="data/shadow_logs.jsonl"
+        pipeline,
+        chaos_config_path,
+        path="data/shadow_logs.jsonl",
+        workers=None,
+        rate=None
     ):
 
-        self.client = client
-        self.chaos = chaos_engine
-        self.router = router
+        # pipeline(query, router, injector=None) -> answer
+        self.pipeline = pipeline
+
+        self.chaos_config_path = chaos_config_path
         self.path = path
 
+        self.workers = workers or settings.REPLAY_WORKERS
+
+        self.rate = settings.REPLAY_RATE if rate is None else rate
+
         self.comparator = ReplayComparator()
 
     # --------------------------------
 
-    def _load(self):
+    def options(self, workers=None, rate=None):
+        """
+        Resolve per-run overrides; ValueError if out of range
+        """
 
-        with open(self.path) as f:
+        workers = self.workers if workers is None else workers
+        rate = self.rate if rate is None else rate
 
-            return [
-                json.loads(line)
-                for line in f
-            ]
+        if not 1 <= workers <= settings.REPLAY_MAX_WORKERS:
+            raise ValueError(
+                "workers must be between 1 and "
+                f"{settings.REPLAY_MAX_WORKERS}"
+            )
 
-    # --------------------------------
+        if not math.isfinite(rate) or rate < 0:
+            raise ValueError("rate must be >= 0 (0 = unlimited)")
 
-    def _snapshot(self):
+        return workers, rate
 
-        return {
-            "chaos": self.chaos.enabled,
-            "cache_only": self.router.force_cache_only,
-            "primary_disabled": self.router.primary_disabled
-        }
+    # --------------------------------
 
-    def _restore(self, snap):
+    def _load(self):
+        """
+        Shadow log entries, read lazily
+        """
 
-        self.chaos.enabled = snap["chaos"]
+        with open(self.path) as f:
 
-        self.router.force_cache_only = snap["cache_only"]
+            for line in f:
 
-        self.router.primary_disabled = snap["primary_disabled"]
+                if line.strip():
+                    yield json.loads(line)
 
     # --------------------------------
 
-    def _safe_call(self, query):
+    def _safe_call(self, query, router, injector=None):
 
         try:
-            return self.client(query), None
+            return self.pipeline(query, router, injector), None
 
         except Exception as e:
 
             return None, str(e)
 
+    def _replay_one(self, sandbox, entry) -> dict:
+
+        query = entry["query"]
+
+        # --------------------
+        # Baseline
+        # --------------------
+
+        base, base_err = self._safe_call(
+            query,
+            sandbox.baseline_router
+        )
+
+        # --------------------
+        # Chaos
+        # --------------------
+
+        chaos, chaos_err = self._safe_call(
+            query,
+            sandbox.chaos_router,
+            sandbox.injector
+        )
+
+        # --------------------
+        # Compare
+        # --------------------
+
+        if base and chaos:
+
+            diff = self.comparator.compare(
+                base,
+                chaos
+            )
+
+        else:
+
+            diff = {
+                "similarity": 0.0,
+                "degraded": True,
+                "error": base_err or chaos_err
+            }
+
+        return {
+            "query": query,
+            "baseline": base,
+            "chaos": chaos,
+            "comparison": diff,
+            "baseline_error": base_err,
+            "chaos_error": chaos_err
+        }
+
     # --------------------------------
 
-    def run(self):
+    def _execute(self, entries, workers, rate, on_result, stop=None):
+        """
+        Replay entries on `workers` threads at most `rate` queries/s
+        (0 = unlimited); on_result(index, result) in input order.
+        Setting `stop` ends the run once in-flight queries finish.
+        """
 
-        logs = self._load()
+        sandbox = ReplaySandbox(self.chaos_config_path)
 
-        results = []
+        # A slot is held from submission until the result is
+        # delivered in order, so a slow entry bounds both queued
+        # work and the results waiting behind it
+        slots = threading.BoundedSemaphore(workers * 2)
 
-        snapshot = self._snapshot()
+        pending = {}
 
-        try:
+        state = {"next": 0}
 
-            # Isolate replay
-            self.chaos.enabled = False
-            self.router.force_cache_only = False
-            self.router.primary_disabled = False
+        order_lock = threading.Lock()
 
-            for entry in logs:
+        def deliver(index, result):
 
-                query = entry["query"]
+            with order_lock:
 
-                # --------------------
-                # Baseline
-                # --------------------
+                pending[index] = result
 
-                base, base_err = self._safe_call(query)
+                while state["next"] in pending:
 
-                # --------------------
-                # Chaos
-                # --------------------
+                    index = state["next"]
 
-                self.chaos.enabled = True
+                    state["next"] += 1
 
-                chaos, chaos_err = self._safe_call(query)
+                    try:
+                        on_result(index, pending.pop(index))
+                    finally:
+                        slots.release()
 
-                self.chaos.enabled = False
+        interval = 1.0 / rate if rate else 0.0
 
-                # --------------------
-                # Compare
-                # --------------------
+        next_at = time.monotonic()
 
-                if base and chaos:
+        def task(index, entry):
 
-                    diff = self.comparator.compare(
-                        base,
-                        chaos
-                    )
+            try:
 
-                else:
+                result = self._replay_one(sandbox, entry)
 
-                    diff = {
+            except Exception as e:
+
+                traceback.print_exc()
+
+                result = {
+                    "query": entry.get("query"),
+                    "comparison": {
                         "similarity": 0.0,
                         "degraded": True,
-                        "error": base_err or chaos_err
+                        "error": str(e)
                     }
+                }
 
-                results.append({
-                    "query": query,
-                    "baseline": base,
-                    "chaos": chaos,
-                    "comparison": diff,
-                    "baseline_error": base_err,
-                    "chaos_error": chaos_err
-                })
+            deliver(index, result)
 
-        except Exception:
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="replay"
+        ) as pool:
 
-            traceback.print_exc()
+            for index, entry in enumerate(entries):
+
+                if stop is not None and stop.is_set():
+                    break
+
+                if interval:
+
+                    now = time.monotonic()
 
-        finally:
+                    if now < next_at:
+                        time.sleep(next_at - now)
 
-            self._restore(snapshot)
+                    next_at = max(now, next_at) + interval
+
+                slots.acquire()
+
+                pool.submit(task, index, entry)
+
+    # --------------------------------
+
+    def run(self, workers=None, rate=None):
+
+        results = {}
+
+        try:
+
+            self._execute(
+                self._load(),
+                workers or self.workers,
+                self.rate if rate is None else rate,
+                results.__setitem__
+            )
+
+        except Exception:
+
+            traceback.print_exc()
 
-        return results
+        # Input order, whatever order the workers finished in
+        return [results[i] for i in sorted(results)]
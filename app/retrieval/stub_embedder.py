@@ -0,0 +1,36 @@
+import re
+import zlib
+
+import numpy as np
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-words hashing embedder; a drop-in for
+    SentenceTransformer.encode in offline benchmarks and CI
+    """
+
+    def __init__(self, dimensions=384):
+
+        self.dimensions = dimensions
+
+    def _vector(self, text):
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+
+        for token in re.findall(r"\w+", text.lower()):
+            vector[zlib.crc32(token.encode()) % self.dimensions] += 1.0
+
+        norm = np.linalg.norm(vector)
+
+        return vector / norm if norm else vector
+
+    def encode(self, texts, **kwargs):
+
+        if isinstance(texts, str):
+            return self._vector(texts)
+
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+
+        return np.stack([self._vector(t) for t in texts])
@@ -1,10 +1,27 @@
 import os
+import re
 from typing import List
 
 import chromadb
-from sentence_transformers import SentenceTransformer
 
 from app.config import settings
+from app.retrieval.stub_embedder import HashingEmbedder
+
+
+def load_embedder():
+    """
+    Sentence encoder for the configured EMBEDDING_BACKEND
+    """
+
+    if settings.EMBEDDING_BACKEND == "stub":
+        return HashingEmbedder()
+
+    # Imported lazily: loading torch is slow
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(
+        settings.EMBEDDING_MODEL
+    )
 
 
 class VectorStore:
@@ -19,9 +36,7 @@ class VectorStore:
             name="documents"
         )
 
-        self.embedder = SentenceTransformer(
-            settings.EMBEDDING_MODEL
-        )
+        self.embedder = load_embedder()
 
         self._bootstrap()
 
@@ -59,7 +74,10 @@ class VectorStore:
 
         # Persistence is automatic in new Chroma versions
 
-    def query(self, text: str, top_k: int = 3) -> List[str]:
+    def search(self, text: str, top_k: int = 3) -> dict:
+        """
+        Top-k documents together with their chunk IDs
+        """
 
         embedding = self.embedder.encode([text]).tolist()
 
@@ -68,6 +86,62 @@ class VectorStore:
             n_results=top_k
         )
 
-        documents = results.get("documents", [[]])[0]
+        return {
+            "ids": results.get("ids", [[]])[0],
+            "documents": results.get("documents", [[]])[0]
+        }
+
+    def search_reranked(
+        self,
+        text: str,
+        top_k: int = 3,
+        candidates: int = 3
+    ) -> dict:
+        """
+        Over-fetch top_k * candidates and keep the documents sharing
+        the most query terms (vector rank breaks ties)
+        """
+
+        results = self.search(text, top_k * candidates)
+
+        terms = set(re.findall(r"\w+", text.lower()))
 
-        return documents
+        order = sorted(
+            range(len(results["documents"])),
+            key=lambda i: (
+                -len(terms & set(
+                    re.findall(r"\w+", results["documents"][i].lower())
+                )),
+                i
+            )
+        )[:top_k]
+
+        return {
+            "ids": [results["ids"][i] for i in order],
+            "documents": [results["documents"][i] for i in order]
+        }
+
+    def query(self, text: str, top_k: int = 3) -> List[str]:
+
+        return self.search(text, top_k)["documents"]
+
+    def embeddings(self, ids: List[str]) -> dict:
+        """
+        Stored chunk vectors by ID (no re-encoding)
+        """
+
+        if not ids:
+            return {}
+
+        results = self.collection.get(
+            ids=list(ids),
+            include=["embeddings"]
+        )
+
+        return {
+            chunk_id: vector
+            for chunk_id, vector in zip(
+                results.get("ids", []),
+                results.get("embeddings", [])
+            )
+        }
@@ -1,5 +1,10 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class QueryRequest(BaseModel):
     query: str
+
+    # Seeds per-request chaos; reuse it to reproduce a run
+    request_id: Optional[str] = None
@@ -6,3 +6,4 @@ class QueryResponse(BaseModel):
     answer: str
     retrieved_chunks: List[str] = []
     model_used: Optional[str] = None
+    request_id: Optional[str] = None
@@ -0,0 +1,68 @@
+"""
+SLO recording/evaluation cost as history grows.
+
+    python -m benchmarks.bench_slo_store --requests 2000000
+
+Requests are spread over the 30-day availability window; record and
+evaluate() latency should stay flat as the recorded count grows.
+"""
+
+import argparse
+import random
+import time
+
+from app.governance.slo import SLOEvaluator
+
+
+def _evaluate_cost(slo, rounds=50):
+
+    start = time.perf_counter()
+
+    for _ in range(rounds):
+        slo.evaluate()
+
+    return (time.perf_counter() - start) / rounds
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--requests", type=int, default=2_000_000)
+    parser.add_argument("--checkpoints", type=int, default=5)
+
+    args = parser.parse_args(argv)
+
+    slo = SLOEvaluator(persist=False)
+
+    now = time.time()
+    span = 30 * 86400
+
+    step = args.requests // args.checkpoints
+
+    recorded = 0
+
+    print(f"{'recorded':>12} {'record_us':>10} {'evaluate_ms':>12}")
+
+    for _ in range(args.checkpoints):
+
+        stamps = [now - random.random() * span for _ in range(step)]
+
+        start = time.perf_counter()
+
+        for ts in stamps:
+            slo.record_request(success=random.random() > 0.01, ts=ts)
+            slo.record_latency(random.random() * 4, ts=ts)
+
+        record_us = (time.perf_counter() - start) / step * 1e6
+
+        recorded += step
+
+        print(
+            f"{recorded:>12} {record_us:>10.2f} "
+            f"{_evaluate_cost(slo) * 1000:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
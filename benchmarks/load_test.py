@@ -0,0 +1,526 @@
+"""
+End-to-end load test for /query with a per-stage latency breakdown.
+
+    # Against a running deployment
+    python -m benchmarks.load_test --url http://localhost:8000 --rate 20
+
+    # Self-contained: stub Ollama + in-process API, no GPU / model download
+    python -m benchmarks.load_test --spawn --rate 20 --duration 60
+
+    # Closed loop: fixed number of clients, each waiting for its answer
+    python -m benchmarks.load_test --spawn --concurrency 8
+
+Open-loop mode sends on a fixed (or Poisson) schedule regardless of how
+fast the server answers, and measures latency from the *intended* send
+time, so queueing behind a slow server is not hidden (no coordinated
+omission). Closed-loop mode measures the capacity of N clients.
+
+Retrieval / generation come from the Server-Timing header of each
+response; evaluation and governance run in the background and are read
+as histogram deltas from /metrics over the run.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from prometheus_client.parser import text_string_to_metric_families
+
+
+QUERIES = [
+    "Explain chaos engineering",
+    "What is a circuit breaker?",
+    "How does fallback routing work?",
+    "What is an error budget?",
+    "Why inject latency into retrieval?",
+]
+
+# Background stages scraped from /metrics
+BACKGROUND = {
+    "evaluation": "llm_evaluation_seconds",
+    "governance": "governance_evaluation_seconds",
+}
+
+
+# ----------------------------------
+# Statistics
+# ----------------------------------
+
+def percentile(values, q):
+
+    if not values:
+        return None
+
+    values = sorted(values)
+
+    index = min(len(values) - 1, max(0, round(q * (len(values) - 1))))
+
+    return values[index]
+
+
+def summarize(values) -> dict:
+    """
+    Seconds -> p50/p95/p99 in milliseconds
+    """
+
+    return {
+        "count": len(values),
+        **{
+            name: (
+                None if percentile(values, q) is None
+                else round(percentile(values, q) * 1000, 1)
+            )
+            for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        }
+    }
+
+
+def parse_server_timing(header) -> dict:
+    """
+    "retrieval;dur=12.3, generation;dur=80" -> {name: seconds}
+    """
+
+    timings = {}
+
+    for entry in (header or "").split(","):
+
+        name, _, params = entry.strip().partition(";")
+
+        for param in params.split(";"):
+
+            key, _, value = param.strip().partition("=")
+
+            if key == "dur" and name:
+                timings[name] = float(value) / 1000
+
+    return timings
+
+
+# ----------------------------------
+# /metrics Histograms
+# ----------------------------------
+
+def scrape(url) -> dict:
+    """
+    metric name -> {upper bound: cumulative count}
+    """
+
+    text = requests.get(f"{url}/metrics", timeout=10).text
+
+    wanted = set(BACKGROUND.values())
+
+    histograms = {}
+
+    for family in text_string_to_metric_families(text):
+
+        if family.name not in wanted:
+            continue
+
+        buckets = histograms.setdefault(family.name, {})
+
+        for sample in family.samples:
+
+            if sample.name.endswith("_bucket"):
+                bound = float(sample.labels["le"])
+                buckets[bound] = buckets.get(bound, 0) + sample.value
+
+    return histograms
+
+
+def histogram_quantile(q, buckets: dict):
+    """
+    Prometheus-style quantile estimate from cumulative buckets
+    """
+
+    bounds = sorted(buckets)
+
+    if not bounds or not buckets[bounds[-1]]:
+        return None
+
+    rank = q * buckets[bounds[-1]]
+
+    lower, below = 0.0, 0.0
+
+    for bound in bounds:
+
+        count = buckets[bound]
+
+        if count >= rank:
+
+            if bound == float("inf"):
+                return lower
+
+            if count == below:
+                return bound
+
+            return lower + (bound - lower) * (rank - below) / (count - below)
+
+        lower, below = bound, count
+
+    return lower
+
+
+def background_stages(before: dict, after: dict) -> dict:
+
+    stages = {}
+
+    for stage, metric in BACKGROUND.items():
+
+        start = before.get(metric, {})
+        end = after.get(metric, {})
+
+        delta = {
+            bound: count - start.get(bound, 0)
+            for bound, count in end.items()
+        }
+
+        total = delta.get(float("inf"), 0)
+
+        stages[stage] = {"count": int(total)}
+
+        for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+
+            value = histogram_quantile(q, delta)
+
+            stages[stage][name] = (
+                None if value is None else round(value * 1000, 1)
+            )
+
+    return stages
+
+
+# ----------------------------------
+# Load Generation
+# ----------------------------------
+
+class LoadRunner:
+    """
+    Sends /query traffic and collects per-request outcomes
+    """
+
+    def __init__(self, url, timeout=60):
+
+        self.url = url
+        self.timeout = timeout
+
+        self.results = []
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _session(self):
+
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+
+        return self._local.session
+
+    def send(self, intended=None):
+        """
+        One request; latency counts from the intended send time
+        """
+
+        start = time.perf_counter()
+
+        intended = start if intended is None else intended
+
+        result = {"outcome": "error", "stages": {}}
+
+        try:
+
+            response = self._session().post(
+                f"{self.url}/query",
+                json={"query": random.choice(QUERIES)},
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                result["outcome"] = response.headers.get("X-Outcome", "ok")
+
+            result["stages"] = parse_server_timing(
+                response.headers.get("Server-Timing")
+            )
+
+        except requests.RequestException:
+            pass
+
+        end = time.perf_counter()
+
+        result["latency"] = end - intended
+        result["service_time"] = end - start
+
+        with self._lock:
+            self.results.append(result)
+
+    def open_loop(self, rate, duration, poisson=False, max_workers=256):
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+
+        start = time.perf_counter()
+
+        at = start
+
+        while at - start < duration:
+
+            delay = at - time.perf_counter()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            pool.submit(self.send, at)
+
+            at += random.expovariate(rate) if poisson else 1.0 / rate
+
+        pool.shutdown(wait=True)
+
+    def closed_loop(self, concurrency, duration):
+
+        deadline = time.perf_counter() + duration
+
+        def client():
+            while time.perf_counter() < deadline:
+                self.send()
+
+        threads = [
+            threading.Thread(target=client, daemon=True)
+            for _ in range(concurrency)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+    def report(self, elapsed) -> dict:
+
+        results = self.results
+        total = len(results) or 1
+
+        outcomes = {}
+
+        for result in results:
+            outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+
+        stages = {}
+
+        for name in ("retrieval", "generation", "total"):
+
+            stages[name] = summarize([
+                r["stages"][name] for r in results if name in r["stages"]
+            ])
+
+        return {
+            "requests": len(results),
+            "elapsed_seconds": round(elapsed, 2),
+            "throughput_rps": round(len(results) / elapsed, 2),
+            "error_rate": outcomes.get("error", 0) / total,
+            "fallback_rate": outcomes.get("fallback", 0) / total,
+            "outcomes": outcomes,
+            "latency": summarize([r["latency"] for r in results]),
+            "service_time": summarize([r["service_time"] for r in results]),
+            "stages": stages,
+        }
+
+
+# ----------------------------------
+# In-process Stack
+# ----------------------------------
+
+def _free_port():
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn(profiles, chaos=True, seed=None):
+    """
+    Start the stub Ollama server and the API in this process;
+    returns (api url, stop callback). Everything the API writes
+    goes to a temporary directory removed on stop.
+    """
+
+    from app.models.stub_server import StubOllamaServer, load_profiles
+
+    stub = StubOllamaServer(load_profiles(profiles), seed=seed).start()
+
+    data = tempfile.mkdtemp(prefix="load_test_")
+
+    # Settings are read at import time
+    os.environ.update({
+        "OLLAMA_BASE_URL": stub.url,
+        "EMBEDDING_BACKEND": "stub",
+        "ENABLE_CHAOS": "true" if chaos else "false",
+        "SHADOW_LOG_PATH": os.path.join(data, "shadow_logs.jsonl"),
+        "INCIDENT_DB_PATH": os.path.join(data, "incidents.db"),
+        "JUDGE_CACHE_PATH": os.path.join(data, "judge_cache.db"),
+        "SLO_DB_PATH": os.path.join(data, "slo_timeseries.db"),
+        "REPLAY_JOBS_DIR": os.path.join(data, "replay_jobs"),
+        "CHROMA_PATH": os.path.join(data, "chroma_db"),
+    })
+
+    import uvicorn
+
+    from app.main import app
+
+    port = _free_port()
+
+    server = uvicorn.Server(uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=port,
+        log_level="warning"
+    ))
+
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    url = f"http://127.0.0.1:{port}"
+
+    deadline = time.time() + 60
+
+    while not server.started:
+
+        if time.time() > deadline or not thread.is_alive():
+            raise RuntimeError("API failed to start")
+
+        time.sleep(0.1)
+
+    print(f"[LOAD] Stub Ollama at {stub.url}, API at {url}, data in {data}")
+
+    def stop():
+        server.should_exit = True
+        thread.join(timeout=10)
+        stub.stop()
+        shutil.rmtree(data, ignore_errors=True)
+
+    return url, stop
+
+
+# ----------------------------------
+# CLI
+# ----------------------------------
+
+def _print(report):
+
+    print(
+        f"\n{report['requests']} requests in "
+        f"{report['elapsed_seconds']}s "
+        f"({report['throughput_rps']} req/s), "
+        f"errors {report['error_rate']:.2%}, "
+        f"fallbacks {report['fallback_rate']:.2%}\n"
+    )
+
+    print(f"{'stage':<14} {'count':>7} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9}")
+
+    rows = {
+        "latency": report["latency"],
+        **report["stages"],
+        **report.get("background", {}),
+    }
+
+    for name, s in rows.items():
+
+        print(
+            f"{name:<14} {s['count']:>7} "
+            + " ".join(
+                f"{'-' if s[q] is None else s[q]:>9}"
+                for q in ("p50", "p95", "p99")
+            )
+        )
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser()
+
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url")
+    target.add_argument("--spawn", action="store_true")
+
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rate", type=float, help="open loop, requests/s")
+    mode.add_argument("--concurrency", type=int, help="closed loop clients")
+
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--poisson", action="store_true")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--profiles", default="benchmarks/stub_profiles.yaml")
+    parser.add_argument("--no-chaos", action="store_true")
+    parser.add_argument("--output")
+
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    stop = None
+
+    url = args.url.rstrip("/") if args.url else None
+
+    if args.spawn:
+        url, stop = spawn(args.profiles, not args.no_chaos, args.seed)
+
+    runner = LoadRunner(url, args.timeout)
+
+    try:
+
+        before = scrape(url)
+
+        start = time.perf_counter()
+
+        if args.concurrency:
+            runner.closed_loop(args.concurrency, args.duration)
+        else:
+            runner.open_loop(args.rate or 10.0, args.duration, args.poisson)
+
+        elapsed = time.perf_counter() - start
+
+        # Let queued background evaluations drain
+        time.sleep(1)
+
+        report = runner.report(elapsed)
+
+        report["background"] = background_stages(before, scrape(url))
+
+        report["config"] = {
+            "mode": "closed" if args.concurrency else "open",
+            "rate": None if args.concurrency else (args.rate or 10.0),
+            "concurrency": args.concurrency,
+            "poisson": args.poisson,
+            "duration": args.duration,
+            "chaos": not args.no_chaos,
+            "target": "spawn" if args.spawn else url,
+        }
+
+    finally:
+
+        if stop is not None:
+            stop()
+
+    _print(report)
+
+    if args.output:
+
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n[LOAD] Report written to {args.output}")
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+Microbenchmarks for the request-path data structures, with
+regression thresholds against committed baselines.
+
+    python -m benchmarks.micro                  # compare to baselines
+    python -m benchmarks.micro --only cache     # subset (substring match)
+    python -m benchmarks.micro --update         # rewrite baselines
+
+Each benchmark runs at a realistic size (full response cache, 30 days
+of SLO history) and reports the best per-operation time over several
+rounds. The process exits non-zero when any benchmark is slower than
+its baseline by more than the threshold (baselines.json "threshold",
+overridable with --threshold). Baselines are machine specific:
+regenerate them with --update on the machine that runs the check.
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import time
+
+from app.config import settings
+from app.observability import context as request_context
+
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+DEFAULT_THRESHOLD = 0.5
+
+DAY = 86400
+
+LABELS = [
+    {"endpoint": "query", "model": model, "profile": "normal",
+     "cache_hit": cache_hit, "fault": fault}
+    for model in ("primary", "secondary", "cache")
+    for cache_hit in ("true", "false")
+    for fault in ("none", "inject_latency")
+]
+
+
+# ----------------------------------
+# Benchmarks
+# ----------------------------------
+#
+# Each factory does its (untimed) setup and returns the operation
+# to time.
+
+def _response_cache():
+
+    from app.fallback.cache import ResponseCache
+
+    cache = ResponseCache(ttl=3600, max_size=settings.CACHE_MAX_SIZE)
+
+    for i in range(cache.max_size):
+        cache.set(f"key-{i}", f"answer {i}")
+
+    return cache
+
+
+def bench_cache_get():
+
+    cache = _response_cache()
+
+    keys = list(cache.cache)
+
+    state = {"i": 0}
+
+    def op():
+        state["i"] = (state["i"] + 1) % len(keys)
+        cache.get(keys[state["i"]])
+
+    return op
+
+
+def bench_cache_set_full():
+
+    cache = _response_cache()
+
+    # Every set evicts the oldest entry
+    state = {"i": cache.max_size}
+
+    def op():
+        state["i"] += 1
+        cache.set(f"key-{state['i']}", "answer")
+
+    return op
+
+
+def bench_circuit_breaker():
+
+    from app.fallback.circuit_breaker import CircuitBreaker
+
+    breaker = CircuitBreaker()
+
+    def op():
+        if breaker.can_execute():
+            breaker.register_trial()
+            breaker.record_success()
+
+    return op
+
+
+def bench_hash_prompt():
+
+    from app.fallback.router import FallbackRouter
+
+    router = FallbackRouter()
+
+    # Prompt with a full context window
+    prompt = "word " * (settings.CONTEXT_CHARS // 5)
+
+    return lambda: router._hash_prompt(prompt)
+
+
+@functools.lru_cache(maxsize=None)
+def _slo_history(requests, shared=True):
+    """
+    Evaluator holding `requests` spread over 30 days; read-only
+    benchmarks share one, writers pass shared=False
+    """
+
+    from app.governance.slo import SLOEvaluator
+
+    slo = SLOEvaluator(persist=False)
+
+    rng = random.Random(0)
+
+    now = time.time()
+
+    for _ in range(requests):
+
+        ts = now - rng.random() * 30 * DAY
+        labels = rng.choice(LABELS)
+
+        slo.record_request(success=rng.random() > 0.0005, ts=ts, labels=labels)
+        slo.record_latency(0.2 + rng.random(), ts=ts, labels=labels)
+        slo.record_groundedness(0.8 + rng.random() * 0.2, ts=ts, labels=labels)
+
+    return slo
+
+
+def bench_slo_record(history):
+
+    slo = _slo_history(history, shared=False)
+
+    labels = LABELS[0]
+
+    def op():
+        slo.record_request(success=True, labels=labels)
+        slo.record_latency(0.5, labels=labels)
+
+    return op
+
+
+def bench_slo_evaluate(history):
+
+    slo = _slo_history(history)
+
+    return slo.evaluate
+
+
+def bench_slo_evaluate_filtered(history):
+
+    slo = _slo_history(history)
+
+    return lambda: slo.evaluate(labels={"model": "primary"})
+
+
+def bench_policy_evaluate(history):
+
+    from app.chaos.fault_injector import FaultInjector
+    from app.fallback.router import FallbackRouter
+    from app.policy.actions import PolicyActions
+    from app.policy.engine import PolicyEngine
+
+    engine = PolicyEngine(PolicyActions(
+        FaultInjector(settings.CHAOS_CONFIG_PATH),
+        FallbackRouter()
+    ))
+
+    slo_state = _slo_history(history).evaluate()
+
+    # Settle any rules the snapshot fires; time the steady state
+    engine.evaluate(slo_state)
+
+    return lambda: engine.evaluate(slo_state)
+
+
+def bench_fault_hooks():
+
+    from app.chaos.fault_injector import FaultInjector
+
+    injector = FaultInjector(settings.CHAOS_CONFIG_PATH)
+
+    injector.enabled = True
+
+    # Seeded so every run injects the same faults
+    injector.start_run(seed=0)
+
+    chunks = ["Circuit breakers prevent cascading failures."] * 3
+
+    def op():
+
+        request_context.begin_request("query")
+
+        injector.begin_request()
+
+        injector.stage_delay("retrieval")
+        injector.after_retrieval(chunks)
+        injector.before_llm("prompt")
+
+        try:
+            injector.after_llm("answer")
+        except RuntimeError:
+            pass
+
+    return op
+
+
+def benchmarks(history) -> dict:
+
+    return {
+        "cache_get": bench_cache_get,
+        "cache_set_full": bench_cache_set_full,
+        "circuit_breaker": bench_circuit_breaker,
+        "hash_prompt": bench_hash_prompt,
+        "slo_record": lambda: bench_slo_record(history),
+        "slo_evaluate": lambda: bench_slo_evaluate(history),
+        "slo_evaluate_filtered": lambda: bench_slo_evaluate_filtered(history),
+        "policy_evaluate": lambda: bench_policy_evaluate(history),
+        "fault_hooks": bench_fault_hooks,
+    }
+
+
+# ----------------------------------
+# Timing
+# ----------------------------------
+
+def measure(op, min_time=0.05, rounds=5) -> float:
+    """
+    Best per-call time (ns) over several calibrated rounds
+    """
+
+    # Warm up and calibrate a round to ~min_time
+    number = 1
+
+    while True:
+
+        start = time.perf_counter()
+
+        for _ in range(number):
+            op()
+
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= min_time:
+            break
+
+        factor = 2 if elapsed * 10 < min_time else 1.5
+
+        number = max(number + 1, int(number * factor))
+
+    best = elapsed / number
+
+    for _ in range(rounds - 1):
+
+        start = time.perf_counter()
+
+        for _ in range(number):
+            op()
+
+        best = min(best, (time.perf_counter() - start) / number)
+
+    return best * 1e9
+
+
+# ----------------------------------
+# Baselines
+# ----------------------------------
+
+def load_baselines(path) -> dict:
+
+    if not os.path.exists(path):
+        return {"threshold": DEFAULT_THRESHOLD, "benchmarks": {}}
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare(results: dict, baselines: dict, threshold: float) -> list:
+    """
+    (name, ns, baseline ns, ratio, status) per benchmark
+    """
+
+    rows = []
+
+    for name, ns in results.items():
+
+        baseline = baselines.get(name, {}).get("ns_per_op")
+
+        if not baseline:
+            rows.append((name, ns, None, None, "new"))
+            continue
+
+        ratio = ns / baseline
+
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+
+        rows.append((name, ns, baseline, ratio, status))
+
+    return rows
+
+
+# ----------------------------------
+# CLI
+# ----------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--only", action="append", default=[])
+    parser.add_argument("--history", type=int, default=200_000,
+                        help="requests in the 30-day SLO history")
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--update", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    stored = load_baselines(args.baselines)
+
+    threshold = (
+        args.threshold if args.threshold is not None
+        else stored.get("threshold", DEFAULT_THRESHOLD)
+    )
+
+    selected = {
+        name: factory
+        for name, factory in benchmarks(args.history).items()
+        if not args.only or any(part in name for part in args.only)
+    }
+
+    results = {}
+
+    for name, factory in selected.items():
+        results[name] = measure(factory(), args.min_time, args.rounds)
+
+    rows = compare(results, stored.get("benchmarks", {}), threshold)
+
+    print(f"\n{'benchmark':<24} {'ns/op':>12} {'baseline':>12} {'ratio':>7}")
+
+    for name, ns, baseline, ratio, status in rows:
+
+        print(
+            f"{name:<24} {ns:>12.0f} "
+            f"{'-' if baseline is None else f'{baseline:.0f}':>12} "
+            f"{'-' if ratio is None else f'{ratio:.2f}':>7}  {status}"
+        )
+
+    if args.update:
+
+        stored.setdefault("threshold", threshold)
+
+        stored.setdefault("benchmarks", {}).update({
+            name: {"ns_per_op": round(ns, 1)}
+            for name, ns in results.items()
+        })
+
+        with open(args.baselines, "w") as f:
+            json.dump(stored, f, indent=2)
+            f.write("\n")
+
+        print(f"\n[MICRO] Baselines written to {args.baselines}")
+
+        return 0
+
+    regressions = [row[0] for row in rows if row[4] == "REGRESSION"]
+
+    if regressions:
+
+        print(
+            f"\n[MICRO] {len(regressions)} regression(s) beyond "
+            f"{threshold:.0%}: {', '.join(regressions)}"
+        )
+
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
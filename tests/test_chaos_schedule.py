@@ -0,0 +1,128 @@
+import pytest
+
+from app.config import settings
+from app.chaos.fault_injector import FaultInjector
+from app.chaos.schedule import Timeline
+from app.observability import context as request_context
+
+
+def _injector(tmp_path, timeline=""):
+
+    path = tmp_path / "chaos_config.yaml"
+
+    path.write_text(
+        "enabled: true\n"
+        "faults:\n"
+        "  kill_model: {enabled: true, probability: 0.5}\n"
+        "  corrupt_context: {enabled: true, probability: 0.5}\n"
+        "  inject_latency:\n"
+        "    enabled: true\n"
+        "    probability: 0.5\n"
+        "    distribution: {type: uniform, min_ms: 1, max_ms: 100}\n"
+        + timeline
+    )
+
+    return FaultInjector(str(path))
+
+
+def _run(injector, requests=50):
+
+    outcomes = []
+
+    for i in range(requests):
+
+        request_context.begin_request("test")
+
+        # Default (generated) request IDs, as the API uses
+        injector.begin_request()
+
+        delay = injector.stage_delay("retrieval")
+
+        chunks = injector.after_retrieval(["a", "b", "c", "d"])
+
+        try:
+            injector.after_llm("ok")
+            crashed = False
+        except RuntimeError:
+            crashed = True
+
+        outcomes.append((round(delay, 6), tuple(chunks), crashed))
+
+    return outcomes
+
+
+def test_seeded_runs_are_reproducible(tmp_path):
+
+    injector = _injector(tmp_path)
+
+    injector.start_run(seed=42)
+    first = _run(injector)
+
+    injector.start_run(seed=42)
+    assert _run(injector) == first
+
+    injector.start_run(seed=7)
+    assert _run(injector) != first
+
+
+def test_recorded_run_replays_exactly(tmp_path):
+
+    injector = _injector(tmp_path)
+
+    injector.start_run(record=True)
+    recorded = _run(injector)
+
+    injector.start_run(replay=injector.recording())
+    assert _run(injector) == recorded
+
+
+def test_timeline_windows():
+
+    timeline = Timeline([
+        {"fault": "kill_model", "probability": 0.3,
+         "start": "60s", "end": "2m"}
+    ])
+
+    assert timeline.probability("kill_model", 30) is None
+    assert timeline.probability("kill_model", 90) == 0.3
+    assert timeline.probability("kill_model", 120) is None
+
+    with pytest.raises(ValueError):
+        Timeline([{"fault": "kill_model", "start": "2m", "end": "1m"}])
+
+
+def test_resource_faults_fire_on_their_stage(tmp_path):
+
+    path = tmp_path / "chaos_config.yaml"
+
+    path.write_text(
+        "enabled: true\n"
+        "faults:\n"
+        "  cpu_burn: {enabled: true, probability: 1.0, duration_ms: 20}\n"
+        "  memory_pressure:\n"
+        "    {enabled: true, probability: 1.0, size_mb: 1, hold_ms: 10}\n"
+        "  slow_tokens:\n"
+        "    {enabled: true, probability: 1.0, tokens_per_second: 50}\n"
+    )
+
+    injector = FaultInjector(str(path))
+
+    request_context.begin_request("test")
+
+    injector.resource_faults("retrieval")
+
+    assert request_context.labels()["fault"] == "cpu_burn+memory_pressure"
+    assert request_context.get("token_delay") is None
+
+    injector.resource_faults("llm")
+
+    assert request_context.get("token_delay") == 0.02
+
+
+def test_enable_chaos_false_blocks_every_fault(tmp_path, monkeypatch):
+
+    injector = _injector(tmp_path)
+
+    monkeypatch.setattr(settings, "ENABLE_CHAOS", False)
+
+    assert set(_run(injector)) == {(0.0, ("a", "b", "c", "d"), False)}
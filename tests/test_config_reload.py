@@ -0,0 +1,67 @@
+import os
+
+from app.chaos.fault_injector import FaultInjector
+from app.reload.watcher import ConfigWatcher
+
+
+def _write(path, probability, mtime):
+
+    path.write_text(
+        "enabled: true\n"
+        "faults:\n"
+        "  kill_model:\n"
+        "    enabled: true\n"
+        f"    probability: {probability}\n"
+    )
+
+    os.utime(path, (mtime, mtime))
+
+
+def test_changed_config_is_validated_and_swapped(tmp_path):
+
+    path = tmp_path / "chaos_config.yaml"
+
+    _write(path, 0.1, 1000)
+
+    injector = FaultInjector(str(path))
+
+    watcher = ConfigWatcher(
+        {str(path): injector},
+        pattern=str(tmp_path / "*.yaml")
+    )
+
+    assert watcher.check() == []
+
+    _write(path, 0.5, 2000)
+
+    [result] = watcher.check()
+
+    assert result["status"] == "reloaded"
+    assert injector.faults["kill_model"]["probability"] == 0.5
+
+    # Invalid file: rejected once, running config untouched
+    _write(path, 7, 3000)
+
+    [result] = watcher.check()
+
+    assert result["status"] == "failed"
+    assert injector.faults["kill_model"]["probability"] == 0.5
+    assert watcher.check() == []
+
+
+def test_runtime_chaos_toggle_survives_reload(tmp_path):
+
+    path = tmp_path / "chaos_config.yaml"
+
+    _write(path, 0.1, 1000)
+
+    injector = FaultInjector(str(path))
+
+    injector.enabled = False
+
+    _write(path, 0.2, 2000)
+
+    injector.reload()
+
+    assert injector.enabled is False
+    assert injector.faults["kill_model"]["probability"] == 0.2
@@ -0,0 +1,69 @@
+import threading
+
+from app.quality.pool import EvaluationPool
+
+
+class FakeEvaluator:
+
+    def __init__(self, gate=None):
+        self.gate = gate
+
+    def evaluate(self, answer, context_chunks, question):
+
+        if self.gate:
+            self.gate.wait()
+
+        return {
+            "groundedness": 0.9,
+            "judge_score": 1.0,
+            "hallucinated": False
+        }
+
+
+def test_results_are_recorded_in_background():
+
+    results = []
+
+    pool = EvaluationPool(
+        FakeEvaluator(),
+        lambda quality, meta: results.append((quality, meta)),
+        workers=2,
+        queue_size=8
+    )
+
+    for i in range(5):
+        assert pool.submit(
+            meta={"i": i},
+            answer="a",
+            context_chunks=["c"],
+            question="q"
+        )
+
+    pool.join()
+
+    assert len(results) == 5
+    assert pool.stats()["completed"] == 5
+
+
+def test_full_queue_sheds_work():
+
+    gate = threading.Event()
+
+    pool = EvaluationPool(
+        FakeEvaluator(gate),
+        lambda quality, meta: None,
+        workers=1,
+        queue_size=2,
+        overflow_policy="drop"
+    )
+
+    accepted = [
+        pool.submit(answer="a", context_chunks=[], question="q")
+        for _ in range(10)
+    ]
+
+    gate.set()
+    pool.join()
+
+    assert not all(accepted)
+    assert pool.stats()["dropped"] == accepted.count(False)
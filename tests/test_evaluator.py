@@ -0,0 +1,237 @@
+import json
+
+from app.config import settings
+from app.quality import cli
+from app.quality import evaluator as evaluator_module
+from app.quality.evaluator import QualityEvaluator
+
+
+class FixedGrounding:
+
+    def __init__(self, score):
+        self.value = score
+
+    def score(self, answer, context_chunks, context_ids=None):
+        return {"score": self.value, "sentences": []}
+
+
+class FakeJudge:
+
+    def __init__(self, batch_reply, single_reply="0.7"):
+        self.batch_reply = batch_reply
+        self.single_reply = single_reply
+        self.prompts = []
+
+    def generate(self, model, prompt, options=None):
+
+        self.prompts.append(prompt)
+
+        if "JSON array" in prompt:
+            return self.batch_reply
+
+        return self.single_reply
+
+
+def _evaluator(monkeypatch, reply, **kwargs):
+
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "stub")
+    monkeypatch.setattr(settings, "JUDGE_CACHE_ENABLED", False)
+
+    evaluator = QualityEvaluator(**kwargs)
+
+    evaluator.judge_llm = FakeJudge(reply)
+
+    return evaluator
+
+
+def _items(n):
+
+    return [
+        {
+            "question": f"question {i}",
+            "context_chunks": [f"context {i}"],
+            "answer": f"answer {i}"
+        }
+        for i in range(n)
+    ]
+
+
+def test_parse_scores_ignores_item_numbers():
+
+    parse = QualityEvaluator._parse_scores
+
+    assert parse("[0.9, 0.2, 1]", 3) == [0.9, 0.2, 1.0]
+    assert parse("1. 0.8\n2. 0.3\n3. .5", 3) == [0.8, 0.3, 0.5]
+    assert parse("Item 1: 0.9, Item 2: 0.25.", 2) == [0.9, 0.25]
+
+    # Unmatchable or another scale: judge one by one
+    assert parse("1 0 1", 3) is None
+    assert parse("[7, 3]", 2) is None
+    assert parse("no idea", 1) is None
+
+
+def test_batch_judges_with_one_request(monkeypatch):
+
+    evaluator = _evaluator(monkeypatch, "[0.9, 0.1, 0.4]", judge_mode="always")
+
+    results = evaluator.evaluate_many(_items(3), judge_batch_size=8)
+
+    assert [r["judge_score"] for r in results] == [0.9, 0.1, 0.4]
+    assert len(evaluator.judge_llm.prompts) == 1
+
+
+def test_malformed_batch_falls_back_to_per_item(monkeypatch):
+
+    evaluator = _evaluator(monkeypatch, "Sorry, I cannot.", judge_mode="always")
+
+    results = evaluator.evaluate_many(_items(3), judge_batch_size=8)
+
+    assert [r["judge_score"] for r in results] == [0.7, 0.7, 0.7]
+    assert len(evaluator.judge_llm.prompts) == 4
+
+
+def test_wrong_score_count_falls_back_to_per_item(monkeypatch):
+
+    evaluator = _evaluator(monkeypatch, "[0.9, 0.1]", judge_mode="always")
+
+    results = evaluator.evaluate_many(_items(3), judge_batch_size=8)
+
+    assert [r["judge_score"] for r in results] == [0.7, 0.7, 0.7]
+
+
+def test_cli_streams_one_line_per_input(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "stub")
+    monkeypatch.setattr(settings, "JUDGE_CACHE_ENABLED", False)
+
+    monkeypatch.setattr(
+        evaluator_module,
+        "OllamaClient",
+        lambda: FakeJudge("[0.8, 0.6]")
+    )
+
+    src = tmp_path / "audit.jsonl"
+    dst = tmp_path / "scores.jsonl"
+
+    src.write_text(
+        json.dumps({"id": "a", "question": "q", "context": "c", "answer": "x"})
+        + "\n\n"
+        + json.dumps({"question": "q", "context": ["c"], "answer": "y"})
+        + "\n"
+    )
+
+    cli.main([str(src), "-o", str(dst), "--judge-mode", "always"])
+
+    rows = [json.loads(line) for line in dst.read_text().splitlines()]
+
+    assert [r["index"] for r in rows] == [0, 1]
+    assert rows[0]["id"] == "a"
+    assert [r["judge_score"] for r in rows] == [0.8, 0.6]
+    assert "sentence_support" not in rows[0]
+
+
+def _tiered(monkeypatch, grounding, reply, sample_rate=0.0):
+
+    evaluator = _evaluator(
+        monkeypatch,
+        None,
+        judge_mode="tiered",
+        band=(0.3, 0.6),
+        sample_rate=sample_rate
+    )
+
+    evaluator.grounding = FixedGrounding(grounding)
+    evaluator.judge_llm.single_reply = reply
+
+    return evaluator
+
+
+def test_tiered_skips_judge_outside_band(monkeypatch):
+
+    evaluator = _tiered(monkeypatch, 0.1, "0.9")
+
+    result = evaluator.evaluate("a", ["c"], "q")
+
+    # Confident cheap verdict stands on its own
+    assert result["judge_decision"] == "skipped"
+    assert result["judge_score"] is None
+    assert result["hallucinated"]
+    assert evaluator.judge_llm.prompts == []
+
+    stats = evaluator.judge_stats()
+
+    assert stats["skip_rate"] == 1.0
+    assert stats["agreement_rate"] is None
+
+
+def test_tiered_escalates_inside_band(monkeypatch):
+
+    # Cheap tier says grounded enough, judge says unsupported:
+    # not a hallucination (both must agree), counted as disagreement
+    evaluator = _tiered(monkeypatch, 0.5, "0.2")
+
+    result = evaluator.evaluate("a", ["c"], "q")
+
+    assert result["judge_decision"] == "uncertain"
+    assert result["judge_score"] == 0.2
+    assert not result["hallucinated"]
+
+    # Both below threshold: hallucination, tiers agree
+    evaluator.grounding = FixedGrounding(0.35)
+
+    assert evaluator.evaluate("a", ["c"], "q")["hallucinated"]
+
+    stats = evaluator.judge_stats()
+
+    assert stats["judged"] == 2
+    assert stats["agreement_rate"] == 0.5
+    assert abs(stats["mean_abs_error"] - 0.225) < 1e-9
+
+
+def test_tiered_samples_confident_verdicts(monkeypatch):
+
+    evaluator = _tiered(monkeypatch, 0.9, "0.9", sample_rate=1.0)
+
+    result = evaluator.evaluate("a", ["c"], "q")
+
+    assert result["judge_decision"] == "sampled"
+
+    stats = evaluator.judge_stats()
+
+    assert stats["sampled"] == 1
+    assert stats["agreement_rate"] == 1.0
+
+
+def test_safe_mode_is_not_a_tiering_skip(monkeypatch):
+
+    evaluator = _tiered(monkeypatch, 0.5, "0.9")
+
+    result = evaluator.evaluate("a", ["c"], "q", judge=False)
+
+    assert result["judge_decision"] == "disabled"
+    assert evaluator.judge_llm.prompts == []
+
+    evaluator.grounding = FixedGrounding(0.1)
+
+    evaluator.evaluate("a", ["c"], "q")
+
+    stats = evaluator.judge_stats()
+
+    assert stats["disabled"] == 1
+    assert stats["skip_rate"] == 1.0
+
+
+def test_judge_failure_is_left_out_of_agreement(monkeypatch):
+
+    evaluator = _tiered(monkeypatch, 0.5, "no score here")
+
+    result = evaluator.evaluate("a", ["c"], "q")
+
+    assert result["judge_failed"]
+    assert result["judge_score"] == QualityEvaluator.JUDGE_FALLBACK
+
+    stats = evaluator.judge_stats()
+
+    assert stats["failed"] == 1
+    assert stats["agreement_rate"] is None
+    assert stats["mean_abs_error"] is None
@@ -0,0 +1,163 @@
+import time
+
+from app.governance.scheduler import GovernanceScheduler
+
+
+class FakeSLO:
+
+    def __init__(self):
+        self.ticks = 0
+        self.fail = False
+
+    def maybe_sync(self):
+        pass
+
+    def evaluate(self):
+
+        if self.fail:
+            raise RuntimeError("store unavailable")
+
+        self.ticks += 1
+
+        return {"availability": {"ok": True}, "tick": self.ticks}
+
+
+class FakePolicies:
+
+    def evaluate(self, slo_state):
+        return ["guard"]
+
+    def active(self):
+        return ["guard"]
+
+
+class FakeIncidents:
+
+    def __init__(self):
+        self.observed = []
+
+    def observe(self, slo_state, applied, active):
+        self.observed.append((applied, active))
+
+
+def _scheduler(**kwargs):
+
+    return GovernanceScheduler(
+        FakeSLO(),
+        FakePolicies(),
+        FakeIncidents(),
+        **kwargs
+    )
+
+
+def _wait(condition, timeout=2.0):
+
+    deadline = time.time() + timeout
+
+    while not condition():
+
+        assert time.time() < deadline
+
+        time.sleep(0.005)
+
+
+def test_tick_publishes_snapshot():
+
+    scheduler = _scheduler(interval=60, min_interval=0)
+
+    snapshot = scheduler.tick()
+
+    assert scheduler.snapshot is snapshot
+    assert snapshot["slo"]["tick"] == 1
+    assert snapshot["applied_policies"] == ["guard"]
+    assert snapshot["active_policies"] == ["guard"]
+    assert snapshot["trigger"] == "manual"
+    assert scheduler.incidents.observed == [(["guard"], ["guard"])]
+
+    # A failed evaluation keeps the last good snapshot
+    scheduler.slo.fail = True
+
+    assert scheduler.tick() is snapshot
+
+
+def test_failure_wakes_loop_before_interval():
+
+    scheduler = _scheduler(interval=60, min_interval=0, wake_after=1000)
+
+    scheduler.start()
+
+    try:
+
+        scheduler.notify()
+
+        time.sleep(0.05)
+
+        # Ordinary traffic below wake_after waits for the interval
+        assert scheduler.snapshot["evaluated_at"] is None
+
+        scheduler.notify(failure=True)
+
+        _wait(lambda: scheduler.snapshot["trigger"] == "change")
+
+    finally:
+        scheduler.stop()
+
+
+def test_traffic_burst_wakes_loop():
+
+    scheduler = _scheduler(interval=60, min_interval=0, wake_after=5)
+
+    scheduler.start()
+
+    try:
+
+        for _ in range(5):
+            scheduler.notify()
+
+        _wait(lambda: scheduler.slo.ticks == 1)
+
+    finally:
+        scheduler.stop()
+
+
+def test_min_interval_rate_limits_change_ticks():
+
+    scheduler = _scheduler(interval=60, min_interval=0.3)
+
+    scheduler.start()
+
+    try:
+
+        scheduler.notify(failure=True)
+
+        _wait(lambda: scheduler.slo.ticks == 1)
+
+        scheduler.notify(failure=True)
+
+        time.sleep(0.1)
+
+        assert scheduler.slo.ticks == 1
+
+        _wait(lambda: scheduler.slo.ticks == 2)
+
+    finally:
+        scheduler.stop()
+
+
+def test_stop_ends_the_loop():
+
+    scheduler = _scheduler(interval=60, min_interval=0)
+
+    scheduler.start()
+
+    scheduler.stop()
+
+    scheduler._thread.join(timeout=1)
+
+    assert not scheduler._thread.is_alive()
+
+    scheduler.notify(failure=True)
+
+    time.sleep(0.05)
+
+    assert scheduler.slo.ticks == 0
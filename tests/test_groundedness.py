@@ -0,0 +1,55 @@
+import numpy as np
+
+from app.quality.groundedness import GroundednessEngine
+
+
+VOCAB = ["chaos", "latency", "cache", "model"]
+
+
+class FakeEmbedder:
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+
+        self.calls.append(list(texts))
+
+        return np.array([
+            [t.lower().count(w) + 0.01 for w in VOCAB]
+            for t in texts
+        ])
+
+
+class FakeStore:
+
+    def embeddings(self, ids):
+        return {"doc_0": [1.0, 0.0, 0.0, 0.0]}
+
+
+def test_per_sentence_support_uses_stored_vectors():
+
+    embedder = FakeEmbedder()
+    engine = GroundednessEngine(embedder, FakeStore())
+
+    result = engine.score(
+        "Chaos is injected. The cache answers.",
+        ["chaos chaos", "cache layer"],
+        ["doc_0", None]
+    )
+
+    # Sentences plus the one chunk without a stored vector,
+    # encoded in a single batch
+    assert embedder.calls == [
+        ["Chaos is injected.", "The cache answers.", "cache layer"]
+    ]
+
+    assert [s["chunk"] for s in result["sentences"]] == [0, 1]
+    assert result["score"] > 0.9
+
+
+def test_empty_context_scores_zero():
+
+    engine = GroundednessEngine(FakeEmbedder())
+
+    assert engine.score("Anything.", [])["score"] == 0.0
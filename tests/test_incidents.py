@@ -0,0 +1,145 @@
+import time
+
+import pytest
+
+from app.incidents.manager import IncidentManager
+from app.incidents.store import IncidentStore
+
+
+class FakeLLM:
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, model, prompt, options=None):
+        self.calls += 1
+        return "RCA"
+
+
+def test_one_incident_per_degradation_with_single_postmortem(tmp_path):
+
+    manager = IncidentManager(str(tmp_path / "incidents.db"), reopen_window=60)
+
+    manager.llm = manager.postmortems.llm = FakeLLM()
+    manager.postmortems.min_interval = 0
+    manager.postmortems.poll_seconds = 0.01
+
+    state = {"latency_ok": False}
+
+    manager.observe(state, ["high_latency"], ["high_latency"], now=0)
+
+    for t in range(1, 20):
+        manager.observe(state, [], ["high_latency"], now=t)
+
+    manager.observe(state, ["guard"], ["high_latency", "guard"], now=20)
+
+    incident = manager.observe({"latency_ok": True}, [], [], now=30)
+
+    assert len(manager.list()["incidents"]) == 1
+    assert incident["status"] == "closed"
+    assert incident["updates"] == 20
+    assert incident["policies"] == ["guard", "high_latency"]
+
+    deadline = time.time() + 5
+
+    while (
+        manager.get(incident["id"])["postmortem_status"] == "pending"
+        and time.time() < deadline
+    ):
+        time.sleep(0.01)
+
+    assert manager.get(incident["id"])["postmortem"] == "RCA"
+    assert manager.llm.calls == 1
+
+    manager.postmortems.stop()
+
+
+def test_flapping_incident_is_reopened(tmp_path):
+
+    manager = IncidentManager(
+        str(tmp_path / "incidents.db"),
+        reopen_window=60,
+        postmortems=False
+    )
+
+    manager.observe({}, ["a"], ["a"], now=0)
+    manager.observe({}, [], [], now=10)
+    manager.observe({}, ["a"], ["a"], now=30)
+
+    page = manager.list()["incidents"]
+
+    assert len(page) == 1
+    assert page[0]["status"] == "open"
+
+    manager.observe({}, [], [], now=40)
+    manager.observe({}, ["a"], ["a"], now=200)
+
+    assert len(manager.list()["incidents"]) == 2
+
+
+def test_open_incident_survives_restart(tmp_path):
+
+    path = str(tmp_path / "incidents.db")
+
+    before = IncidentManager(path, postmortems=False)
+
+    before.observe({}, ["a"], ["a"], now=0)
+
+    # Restart: same db, fresh process state
+    after = IncidentManager(path, postmortems=False)
+
+    assert after.open["id"] == before.open["id"]
+
+    after.observe({}, ["a"], ["a"], now=10)
+
+    closed = after.observe({}, [], [], now=20)
+
+    page = after.list()["incidents"]
+
+    assert len(page) == 1
+    assert page[0]["status"] == "closed"
+    assert closed["updates"] == 1
+    assert closed["duration_seconds"] == 20
+
+
+def test_store_pagination_filters_and_retention(tmp_path):
+
+    store = IncidentStore(str(tmp_path / "incidents.db"))
+
+    for i in range(5):
+
+        store.save({
+            "id": f"inc-{i}",
+            "status": "closed" if i < 4 else "open",
+            "opened_at": float(i * 100),
+            "closed_at": float(i * 100 + 50) if i < 4 else None,
+            "policies": ["guard"] if i % 2 else ["latency"],
+            "slo_state": {"availability": 0.9},
+            "postmortem": "long text"
+        })
+
+    first = store.list(limit=2)
+
+    assert [i["id"] for i in first["incidents"]] == ["inc-4", "inc-3"]
+    assert "postmortem" not in first["incidents"][0]
+
+    second = store.list(limit=2, cursor=first["next_cursor"])
+
+    assert [i["id"] for i in second["incidents"]] == ["inc-2", "inc-1"]
+
+    for cursor in ("garbage", "abc:inc-1", "300.0:", ":inc-1"):
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            store.list(cursor=cursor)
+
+    guard = store.list(policy="guard")["incidents"]
+
+    assert [i["id"] for i in guard] == ["inc-3", "inc-1"]
+
+    store.compact(now=400, compact_after=100, retention=300)
+
+    remaining = {i["id"] for i in store.list()["incidents"]}
+
+    assert remaining == {"inc-1", "inc-2", "inc-3", "inc-4"}
+    assert store.get("inc-1")["slo_state"] is None
+    assert store.get("inc-3")["slo_state"] == {"availability": 0.9}
@@ -0,0 +1,53 @@
+import random
+import statistics
+
+import pytest
+
+from app.chaos import distributions
+
+
+def test_distributions_sample_in_range():
+
+    rng = random.Random(7)
+
+    assert distributions.sample_ms(
+        {"type": "constant", "delay_ms": 250}, rng
+    ) == 250
+
+    uniform = [
+        distributions.sample_ms(
+            {"type": "uniform", "min_ms": 100, "max_ms": 200}, rng
+        )
+        for _ in range(500)
+    ]
+
+    assert 100 <= min(uniform) and max(uniform) <= 200
+
+    lognormal = [
+        distributions.sample_ms(
+            {"type": "lognormal", "median_ms": 800, "sigma": 0.5}, rng
+        )
+        for _ in range(2000)
+    ]
+
+    assert 700 < statistics.median(lognormal) < 900
+
+    pareto = [
+        distributions.sample_ms(
+            {"type": "pareto", "scale_ms": 200, "alpha": 1.5,
+             "cap_ms": 5000},
+            rng
+        )
+        for _ in range(2000)
+    ]
+
+    assert min(pareto) >= 200 and max(pareto) <= 5000
+
+
+def test_invalid_distribution_rejected():
+
+    with pytest.raises(ValueError):
+        distributions.validate({"type": "gamma"})
+
+    with pytest.raises(ValueError):
+        distributions.validate({"type": "uniform", "min_ms": 5, "max_ms": 1})
@@ -0,0 +1,41 @@
+import json
+
+from benchmarks import micro
+
+
+def test_compare_flags_regressions_beyond_threshold():
+
+    rows = micro.compare(
+        {"fast": 100.0, "slow": 300.0, "added": 50.0},
+        {"fast": {"ns_per_op": 100.0}, "slow": {"ns_per_op": 100.0}},
+        threshold=1.0
+    )
+
+    status = {row[0]: row[4] for row in rows}
+
+    assert status == {"fast": "ok", "slow": "REGRESSION", "added": "new"}
+
+
+def test_main_exits_nonzero_on_regression(tmp_path):
+
+    path = tmp_path / "baselines.json"
+
+    args = [
+        "--baselines", str(path),
+        "--only", "circuit_breaker",
+        "--min-time", "0.001",
+        "--rounds", "1",
+    ]
+
+    assert micro.main(args + ["--update"]) == 0
+
+    baselines = json.loads(path.read_text())
+
+    assert "circuit_breaker" in baselines["benchmarks"]
+
+    # An impossibly fast baseline must fail the check
+    baselines["benchmarks"]["circuit_breaker"]["ns_per_op"] = 0.001
+
+    path.write_text(json.dumps(baselines))
+
+    assert micro.main(args) == 1
@@ -0,0 +1,151 @@
+from app.policy.engine import PolicyEngine
+from app.policy.remediation import RemediationManager
+from app.policy.rules import CompiledRule, compile_condition
+
+
+def test_expressions_and_combinators():
+
+    state = {
+        "availability": 0.98,
+        "latency_ok": False,
+        "latency_ms": {"p95": 3500}
+    }
+
+    assert compile_condition("latency_ms.p95 > 3000")(state)
+    assert compile_condition({"latency_ok": False})(state)
+    assert compile_condition({"any": ["availability >= 0.99", {"latency_ok": False}]})(state)
+    assert not compile_condition({"not": "availability < 0.99"})(state)
+    assert not compile_condition("missing.path > 1")(state)
+
+
+def test_duration_hysteresis_and_cooldown():
+
+    rule = CompiledRule({
+        "name": "latency",
+        "condition": "p95 > 3000",
+        "clear_condition": "p95 < 2500",
+        "for": "1m",
+        "cooldown": "5m"
+    })
+
+    assert rule.step({"p95": 4000}, now=0) is None
+    assert rule.step({"p95": 4000}, now=61) == "fired"
+    assert rule.step({"p95": 4000}, now=62) is None
+
+    # Inside the hysteresis band: stays active
+    assert rule.step({"p95": 2800}, now=70) is None
+    assert rule.step({"p95": 2000}, now=80) == "cleared"
+
+    # Breaches again but still cooling down
+    assert rule.step({"p95": 4000}, now=100) is None
+    assert rule.step({"p95": 4000}, now=400) == "fired"
+
+
+def test_actions_run_only_on_transitions(tmp_path):
+
+    path = tmp_path / "rules.yaml"
+
+    path.write_text(
+        "policies:\n"
+        "  - name: guard\n"
+        "    condition: {latency_ok: false}\n"
+        "    actions: [prefer_cache]\n"
+        "    on_clear: [normal_mode]\n"
+    )
+
+    calls = []
+
+    class Actions:
+        def prefer_cache(self):
+            calls.append("prefer_cache")
+
+        def normal_mode(self):
+            calls.append("normal_mode")
+
+    engine = PolicyEngine(Actions(), str(path))
+
+    for _ in range(5):
+        engine.evaluate({"latency_ok": False})
+
+    engine.evaluate({"latency_ok": True})
+
+    assert calls == ["prefer_cache", "normal_mode"]
+    assert engine.active() == []
+
+
+def test_remediation_ttl_probe_and_revert():
+
+    calls = []
+
+    class Actions:
+        def disable_primary_model(self):
+            calls.append("disable")
+
+        def probe_primary_model(self, fraction):
+            calls.append(fraction)
+
+        def enable_primary_model(self):
+            calls.append("enable")
+
+    manager = RemediationManager(Actions(), {
+        "probe": {"steps": [0.1, 0.5, 1.0], "interval": 60},
+        "actions": {
+            "disable_primary_model": {
+                "revert": "enable_primary_model",
+                "ttl": 300,
+                "probe": "probe_primary_model"
+            }
+        }
+    })
+
+    manager.apply("disable_primary_model", "instability", now=0)
+
+    # Owning policy still active at expiry: extended, not reverted
+    manager.tick(now=300, active_policies=["instability"])
+    assert calls == ["disable"]
+
+    manager.tick(now=600)
+    manager.tick(now=630)
+    manager.tick(now=660)
+    assert manager.status()[0]["traffic"] == 0.5
+
+    manager.tick(now=720)
+
+    assert calls == ["disable", 0.1, 0.5, "enable"]
+    assert manager.status() == []
+
+
+def test_remediation_extension_capped_by_max_ttl():
+
+    calls = []
+
+    class Actions:
+        def increase_fallback(self):
+            calls.append("increase")
+
+        def normal_fallback(self):
+            calls.append("normal")
+
+    manager = RemediationManager(Actions(), {
+        "actions": {
+            "increase_fallback": {
+                "revert": "normal_fallback",
+                "ttl": 300,
+                "max_ttl": 900
+            }
+        }
+    })
+
+    manager.apply("increase_fallback", "instability", now=0)
+
+    # Policy never clears: extended twice, then reverted at max_ttl
+    for now in (300, 600):
+        manager.tick(now=now, active_policies=["instability"])
+        assert calls == ["increase"]
+
+    assert manager.status()[0]["expires_at"] == 900
+
+    manager.tick(now=900, active_policies=["instability"])
+
+    assert calls == ["increase", "normal"]
+    assert manager.status() == []
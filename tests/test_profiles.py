@@ -0,0 +1,33 @@
+from app.config import settings
+from app.models import profiles
+
+
+def test_safe_mode_sheds_generation_cost(monkeypatch):
+
+    monkeypatch.setattr(settings, "DEGRADED_MODE", False)
+
+    normal = profiles.current()
+
+    monkeypatch.setattr(settings, "DEGRADED_MODE", True)
+
+    safe = profiles.current()
+
+    assert safe.name == "safe"
+    assert safe.options()["num_predict"] < normal.options()["num_predict"]
+    assert safe.options()["temperature"] <= normal.options()["temperature"]
+    assert safe.context_chars < normal.context_chars
+    assert not safe.judge
+
+
+def test_trim_context_respects_budget():
+
+    profile = profiles.GenerationProfile(
+        "test", num_predict=64, temperature=0.1,
+        top_k=3, context_chars=25
+    )
+
+    assert profile.trim_context(["a" * 10, "b" * 10, "c" * 10]) == [
+        "a" * 10, "b" * 10
+    ]
+
+    assert profile.trim_context(["x" * 40]) == ["x" * 25]
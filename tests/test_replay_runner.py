@@ -0,0 +1,181 @@
+import json
+import threading
+import time
+
+import pytest
+
+from app.config import settings
+from app.observability.metrics import CHAOS_EVENTS
+from app.replay.runner import ReplayRunner
+
+
+def _runner(tmp_path, monkeypatch, pipeline, queries):
+
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "stub")
+
+    chaos = tmp_path / "chaos_config.yaml"
+
+    # Disabled in the file: the sandbox enables its own copy
+    chaos.write_text(
+        "enabled: false\n"
+        "faults:\n"
+        "  kill_model: {enabled: true, probability: 1.0}\n"
+    )
+
+    logs = tmp_path / "shadow_logs.jsonl"
+
+    logs.write_text(
+        "".join(json.dumps({"query": q}) + "\n" for q in queries)
+    )
+
+    return ReplayRunner(pipeline, str(chaos), str(logs), workers=4)
+
+
+def test_replay_runs_concurrently_in_a_sandbox(tmp_path, monkeypatch):
+
+    running = {"now": 0, "max": 0}
+    routers = set()
+    lock = threading.Lock()
+
+    def pipeline(query, router, injector=None):
+
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            routers.add(id(router))
+
+        time.sleep(0.02)
+
+        with lock:
+            running["now"] -= 1
+
+        answer = f"answer to {query}"
+
+        if injector is not None:
+            answer = injector.after_llm(answer)
+
+        return answer
+
+    queries = [f"query {i}" for i in range(12)]
+
+    results = _runner(tmp_path, monkeypatch, pipeline, queries).run()
+
+    # Input order is kept whatever order workers finish in
+    assert [r["query"] for r in results] == queries
+
+    assert running["max"] > 1
+
+    # Baseline and chaos legs get their own routers
+    assert len(routers) == 2
+
+    for result in results:
+        assert result["baseline"] == f"answer to {result['query']}"
+        assert result["chaos_error"] == "Injected model crash"
+        assert result["comparison"]["degraded"]
+
+
+def test_replay_rate_limit(tmp_path, monkeypatch):
+
+    runner = _runner(
+        tmp_path,
+        monkeypatch,
+        lambda query, router, injector=None: "ok",
+        ["a", "b", "c", "d", "e"]
+    )
+
+    start = time.monotonic()
+
+    results = runner.run(rate=50)
+
+    # 5 queries at 50/s: the last starts ~80ms in
+    assert time.monotonic() - start >= 0.075
+
+    assert len(results) == 5
+
+
+def test_replay_sandbox_keeps_live_metrics_clean(tmp_path, monkeypatch):
+
+    def pipeline(query, router, injector=None):
+
+        if injector is not None:
+            injector.after_llm("answer")
+
+        return "answer"
+
+    live = CHAOS_EVENTS.labels("kill_model")
+
+    before = live._value.get()
+
+    results = _runner(tmp_path, monkeypatch, pipeline, ["a", "b"]).run()
+
+    assert all(r["chaos_error"] == "Injected model crash" for r in results)
+
+    assert live._value.get() == before
+
+
+def test_slow_head_entry_bounds_buffered_results(tmp_path, monkeypatch):
+
+    head = threading.Event()
+    started = set()
+    lock = threading.Lock()
+
+    def pipeline(query, router, injector=None):
+
+        with lock:
+            started.add(query)
+
+        if query == "query 0":
+            head.wait()
+
+        return f"answer to {query}"
+
+    queries = [f"query {i}" for i in range(200)]
+
+    runner = _runner(tmp_path, monkeypatch, pipeline, queries)
+
+    delivered = []
+
+    thread = threading.Thread(
+        target=runner._execute,
+        args=(
+            runner._load(),
+            2,
+            0,
+            lambda index, result: delivered.append(index)
+        ),
+        daemon=True
+    )
+
+    thread.start()
+
+    try:
+
+        time.sleep(0.2)
+
+        # Nothing delivered yet, and no more than the 2 * workers
+        # slots worth of entries started behind the blocked head
+        assert delivered == []
+        assert len(started) <= 4
+
+    finally:
+        head.set()
+
+    thread.join(timeout=10)
+
+    assert delivered == list(range(200))
+
+
+def test_replay_options_reject_out_of_range(tmp_path, monkeypatch):
+
+    runner = _runner(tmp_path, monkeypatch, lambda *a, **k: "ok", [])
+
+    monkeypatch.setattr(settings, "REPLAY_MAX_WORKERS", 8)
+
+    assert runner.options() == (4, runner.rate)
+    assert runner.options(8, 0) == (8, 0)
+
+    for workers, rate in ((0, None), (-1, None), (9, None),
+                          (None, -1.0), (None, float("nan"))):
+
+        with pytest.raises(ValueError):
+            runner.options(workers, rate)
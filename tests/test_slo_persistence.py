@@ -0,0 +1,65 @@
+import time
+
+import yaml
+
+from app.governance.slo import SLOEvaluator
+
+
+def _config(tmp_path):
+
+    with open("policies/slo_config.yaml") as f:
+        config = yaml.safe_load(f)
+
+    config["persistence"]["path"] = str(tmp_path / "slo.db")
+    config["persistence"]["flush_seconds"] = 3600
+
+    path = tmp_path / "slo_config.yaml"
+
+    path.write_text(yaml.safe_dump(config))
+
+    return str(path)
+
+
+def test_workers_share_and_survive_restart(tmp_path):
+
+    config = _config(tmp_path)
+
+    a = SLOEvaluator(config)
+    b = SLOEvaluator(config)
+
+    for _ in range(10):
+        a.record_request(success=True)
+        a.record_latency(0.2)
+
+    b.record_request(success=False)
+
+    a.sync()
+    b.sync()
+
+    assert b.availability_slo() == 10 / 11
+
+    restarted = SLOEvaluator(config)
+
+    assert restarted.availability_slo() == 10 / 11
+    assert restarted.latency_percentiles()["p50"] is not None
+
+
+def test_rollup_keeps_totals(tmp_path):
+
+    config = _config(tmp_path)
+
+    slo = SLOEvaluator(config)
+
+    old = time.time() - 10 * 86400
+
+    for minute in range(120):
+        slo.record_request(success=minute % 10 != 0, ts=old + minute * 60)
+
+    slo.sync()
+
+    slo.timeseries.rollup(time.time())
+
+    resolutions = {r for r, _, _ in slo.timeseries.rows(0)}
+
+    assert resolutions == {3600}
+    assert SLOEvaluator(config).availability_slo() == 108 / 120
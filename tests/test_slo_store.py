@@ -0,0 +1,206 @@
+from app.governance.dimensions import LabeledStore
+from app.governance.error_budget import ErrorBudgetEngine
+from app.governance.sketch import DDSketch
+from app.governance.slo import SLOEvaluator
+from app.governance.store import BucketStore
+
+
+def test_window_sums_only_recent_buckets():
+
+    store = BucketStore(retention_seconds=600, bucket_seconds=60)
+
+    now = 10_000 * 60 + 45
+
+    store.add("requests", 5, ts=now - 30)
+    store.add("requests", 3, ts=now - 300)
+    store.add("failures", 1, ts=now - 300)
+
+    assert store.window(60, now=now)["requests"] == 5
+    assert store.window(600, now=now)["requests"] == 8
+    assert store.window(600, now=now)["failures"] == 1
+
+
+def test_ring_reuses_slots_of_expired_buckets():
+
+    store = BucketStore(retention_seconds=600, bucket_seconds=60)
+
+    store.add("requests", 7, ts=0)
+
+    # Same slot, eleven buckets later
+    store.add("requests", 1, ts=660)
+
+    assert store.size == 11
+    assert store.window(600, now=660)["requests"] == 1
+
+
+def test_sketch_quantiles_have_bounded_relative_error():
+
+    sketch = DDSketch(relative_accuracy=0.01)
+
+    values = [i / 1000 for i in range(1, 10001)]
+
+    for v in values:
+        sketch.add(v)
+
+    for q in (0.5, 0.95, 0.99, 0.999):
+
+        exact = values[int(q * (len(values) - 1))]
+
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+
+
+def test_sketches_merge_across_workers():
+
+    a, b = DDSketch(), DDSketch()
+
+    for i in range(1, 101):
+        (a if i % 2 else b).add(i)
+
+    merged = a.copy().merge(DDSketch.from_dict(b.to_dict()))
+
+    assert merged.count == 100
+    assert abs(merged.quantile(0.5) - 50) <= 1
+
+
+def test_rolling_burn_rates_match_full_window_scan():
+
+    store = BucketStore(retention_seconds=3600, bucket_seconds=60)
+
+    engine = ErrorBudgetEngine(
+        store,
+        {"availability": {"target": 0.99, "window_days": 1}},
+        {"windows": {"5m": "5m"}, "alerts": []}
+    )
+
+    start = engine.windows["5m"].head * 60
+
+    for minute in range(20):
+
+        ts = start + minute * 60
+
+        amounts = {"requests": 10, "failures": minute % 3}
+
+        engine.observe(amounts, ts)
+        store.add_many(amounts, ts)
+
+        report = engine.evaluate(now=ts)
+
+        scan = store.window(300, now=ts)
+
+        expected = scan["failures"] / scan["requests"] / 0.01
+
+        assert abs(
+            report["availability"]["burn_rates"]["5m"] - expected
+        ) < 1e-9
+
+
+def test_rebuild_moves_window_head():
+
+    store = BucketStore(retention_seconds=3600, bucket_seconds=60)
+
+    engine = ErrorBudgetEngine(
+        store,
+        {"availability": {"target": 0.99, "window_days": 1}},
+        {"windows": {"5m": "5m"}, "alerts": []}
+    )
+
+    window = engine.windows["5m"]
+
+    start = (window.head + 1) * 60
+
+    # Flushed straight into the store, as a sync does
+    for minute in range(10):
+        store.add("requests", 1, ts=start + minute * 60)
+
+    engine.rebuild(now=start + 9 * 60 + 30)
+
+    assert window.get("requests") == 5
+
+    # Two buckets later: only the two oldest rebuilt buckets expire
+    now = start + 11 * 60
+
+    engine.evaluate(now=now)
+
+    assert window.get("requests") == store.window(300, now=now)["requests"]
+
+
+def test_labeled_series_filter_by_any_label():
+
+    dims = LabeledStore(retention_seconds=3600, bucket_seconds=60)
+
+    dims.add_many(
+        {"model": "primary", "fault": "none"},
+        {"requests": 4}
+    )
+    dims.add_many(
+        {"model": "secondary", "fault": "kill_model+corrupt_context"},
+        {"requests": 2, "failures": 1}
+    )
+
+    assert dims.window(600, {"model": "secondary"})["failures"] == 1
+    assert dims.window(600, {"fault": "kill_model"})["requests"] == 2
+    assert dims.window(600, {})["requests"] == 6
+    assert dims.labels()["fault"] == ["corrupt_context", "kill_model", "none"]
+
+
+def test_fault_combinations_do_not_exhaust_series():
+
+    dims = LabeledStore(
+        retention_seconds=3600, bucket_seconds=60, max_series=64
+    )
+
+    faults = [f"f{i}" for i in range(7)]
+
+    # 128 distinct label sets, 64 of them for the secondary model
+    for model in ("primary", "secondary"):
+        for mask in range(64):
+
+            fault = "+".join(
+                f for bit, f in enumerate(faults) if mask >> bit & 1
+            ) or "none"
+
+            dims.add_many({"model": model, "fault": fault}, {"requests": 1})
+
+    assert dims.window(600, {"model": "secondary"})["requests"] == 64
+    assert dims.window(600, {})["requests"] == 128
+    assert dims.window(600, {"model": "primary", "fault": "f0"})["requests"] == 32
+    assert dims.overflowed(600, {"model": "secondary"}) == 0
+
+
+def test_overflowed_samples_are_reported():
+
+    dims = LabeledStore(
+        retention_seconds=3600, bucket_seconds=60, max_series=2
+    )
+
+    for model in ("a", "b", "c", "d"):
+        dims.add_many({"model": model}, {"requests": 1})
+
+    assert dims.window(600, {"model": "c"})["requests"] == 0
+    assert dims.overflowed(600, {"model": "c"}) == 2
+    assert dims.window(600, {})["requests"] == 4
+    assert dims.labels() == {"model": ["a", "b"]}
+
+
+def test_hallucination_rate_counts_evaluated_answers_only():
+
+    slo = SLOEvaluator(persist=False)
+
+    # 100 requests, only 10 evaluated (rest shed / sampled out)
+    for _ in range(100):
+        slo.record_request(success=True)
+
+    for i in range(10):
+
+        slo.record_groundedness(0.2 if i < 2 else 0.9)
+
+        if i < 2:
+            slo.record_hallucination()
+
+    assert slo.hallucination_rate() == 0.2
+
+    budget = slo.evaluate()["error_budget"]["hallucination_rate"]
+
+    max_rate = slo.config["slo"]["hallucination_rate"]["max_rate"]
+
+    assert abs(budget["burn_rates"]["5m"] - 0.2 / max_rate) < 1e-9
@@ -0,0 +1,59 @@
+import pytest
+
+from app.models.ollama_client import OllamaClient
+from app.models.stub_server import StubOllamaServer
+from app.observability import context as request_context
+
+
+FAST = {"type": "constant", "delay_ms": 1}
+
+
+@pytest.fixture
+def server():
+
+    server = StubOllamaServer({
+        "default": {
+            "latency": FAST,
+            "tokens_per_second": 10000,
+            "tokens": 8,
+            "cold_load_ms": 0
+        },
+        "models": {"broken": {"error_rate": 1.0}}
+    }, seed=1).start()
+
+    yield server
+
+    server.stop()
+
+
+def _client(server):
+
+    client = OllamaClient()
+
+    client.base_url = server.url
+
+    return client
+
+
+def test_generate_and_stream(server):
+
+    client = _client(server)
+
+    answer = client.generate("llama3", "hi", options={"num_predict": 3})
+
+    assert len(answer.split()) == 3
+
+    request_context.begin_request("test")
+    request_context.set_label("token_delay", 0.001)
+
+    streamed = client.generate("llama3", "hi")
+
+    assert len(streamed.split()) == 8
+
+
+def test_error_rate(server):
+
+    with pytest.raises(RuntimeError):
+        _client(server).generate("broken", "hi")
+
+    assert server.stub.counts["errors"] == 1
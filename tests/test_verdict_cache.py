@@ -0,0 +1,32 @@
+from app.quality.verdict_cache import VerdictCache
+
+
+def test_key_ignores_whitespace_but_not_model(tmp_path):
+
+    cache = VerdictCache(str(tmp_path / "v.db"))
+
+    a = cache.key("What  is it?", ["ctx one"], "Answer.", "llama3")
+    b = cache.key(" What is it? ", ["ctx   one"], "Answer.\n", "llama3")
+    c = cache.key("What is it?", ["ctx one"], "Answer.", "mistral")
+
+    assert a == b
+    assert a != c
+
+
+def test_persistence_ttl_and_eviction(tmp_path):
+
+    path = str(tmp_path / "v.db")
+
+    cache = VerdictCache(path, max_size=2)
+
+    for i in range(3):
+        cache.set(f"k{i}", i / 10)
+
+    assert cache.get("k0") is None
+    assert cache.get("k2") == 0.2
+
+    reopened = VerdictCache(path, ttl=0)
+
+    assert reopened.size == 2
+    assert reopened.get("k1") is None
+    assert reopened.stats()["misses"] == 1